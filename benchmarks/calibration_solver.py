@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+# Compare the dense kron least squares against the block solver.
+# Run from the repository root: python -m benchmarks.calibration_solver
+
+import timeit
+import numpy as np
+from scipy.linalg import lstsq
+
+from src.managers.calibrationSolver import (
+    buildPlatformForces,
+    solvePlatformCalibration,
+)
+
+
+def denseSolve(sensor_values: np.ndarray, forces: np.ndarray) -> tuple:
+    M = len(sensor_values)
+    Zf = np.zeros((6 * M, 72))
+    for i in range(M):
+        Zf[i * 6 : i * 6 + 6, :] = np.kron(np.eye(6), sensor_values[i].T)
+    x = lstsq(Zf, forces.reshape(-1, 1))[0]
+    std_devs = np.sqrt(np.diag(25 * np.linalg.inv(np.dot(Zf.T, Zf))))
+    return x, std_devs
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for M in [20, 100, 500, 2000]:
+        sensor_values = rng.normal(0, 1, (M, 12))
+        forces = buildPlatformForces(
+            rng.normal(0, 1, (M, 3)), [1, 1, 1], rng.uniform(-0.3, 0.3, (M, 3))
+        )
+        number = 20
+        dense_s = (
+            timeit.timeit(lambda: denseSolve(sensor_values, forces), number=number)
+            / number
+        )
+        block_s = (
+            timeit.timeit(
+                lambda: solvePlatformCalibration(sensor_values, forces), number=number
+            )
+            / number
+        )
+        error = np.abs(
+            denseSolve(sensor_values, forces)[0]
+            - solvePlatformCalibration(sensor_values, forces)[0]
+        ).max()
+        print(
+            f"M={M:5d} dense {dense_s * 1000:8.3f} ms"
+            + f" | block {block_s * 1000:8.3f} ms"
+            + f" | x{dense_s / block_s:6.1f} | max diff {error:.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
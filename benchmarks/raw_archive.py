@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+# Compare the raw CSV output against the compressed raw archive.
+# Run from the repository root: python -m benchmarks.raw_archive
+
+import os
+import timeit
+import tempfile
+import numpy as np
+import pandas as pd
+
+from src.managers.rawArchive import RawArchive, writeArchive, getCodecs
+
+DATASET = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "files", "full_dataset_RAW.csv"
+)
+
+
+def timed(function) -> float:
+    # Best of 5, the dataset is small
+    return min(timeit.repeat(function, number=1, repeat=5))
+
+
+def main() -> None:
+    df = pd.read_csv(DATASET)
+    timestamps = df.pop("timestamp").to_numpy(np.int64)
+    # Throughput is given in MB of float64 values
+    data_mb = (timestamps.nbytes + df.to_numpy().nbytes) / (1024 * 1024)
+    print(f"{len(df)} rows x {len(df.columns)} columns, {data_mb:.1f} MB of values")
+    with tempfile.TemporaryDirectory() as folder:
+        # CSV as saved by the app, with values formatted to 0.000000e+00
+        csv_path = os.path.join(folder, "Test_RAW.csv")
+        df_csv = df.map("{:.6e}".format)
+        df_csv.insert(0, "timestamp", timestamps)
+        write_s = timed(lambda: df_csv.to_csv(csv_path, index=False))
+        read_s = timed(lambda: pd.read_csv(csv_path))
+        csv_size = os.path.getsize(csv_path)
+        print(
+            f"{'csv':>12} {csv_size / (1024 * 1024):7.2f} MB | ratio {1:5.2f}"
+            + f" | write {data_mb / write_s:7.1f} MB/s"
+            + f" | read {data_mb / read_s:7.1f} MB/s"
+        )
+        dtypes = {column: np.float32 for column in df.columns}
+        # One tenth of the session from the middle, chunks of 5 s at 10 ms
+        start_ms = int(timestamps[len(timestamps) // 2])
+        end_ms = int(timestamps[len(timestamps) // 2 + len(timestamps) // 10])
+        for codec in getCodecs():
+            for float_type, column_dtypes in [("f8", None), ("f4", dtypes)]:
+                path = os.path.join(folder, f"Test_RAW_{codec}.fpz")
+                write_s = timed(
+                    lambda: writeArchive(
+                        path, timestamps, df, column_dtypes, codec, chunk_rows=500
+                    )
+                )
+                archive = RawArchive(path)
+                read_s = timed(archive.read)
+                range_s = timed(lambda: archive.read(None, start_ms, end_ms))
+                size = os.path.getsize(path)
+                print(
+                    f"{codec + ' ' + float_type:>12} {size / (1024 * 1024):7.2f} MB"
+                    + f" | ratio {csv_size / size:5.2f}"
+                    + f" | write {data_mb / write_s:7.1f} MB/s"
+                    + f" | read {data_mb / read_s:7.1f} MB/s"
+                    + f" | 10% range {range_s * 1000:7.1f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import sys
+import argparse
 from src.qtUIs.mainWindow import MainMenu
+from src.managers.profileManager import profiler
 from PySide6 import QtWidgets, QtGui
 
 
@@ -23,7 +25,34 @@ def palette() -> QtGui.QPalette:
     return dark_palette
 
 
+def parseArgs() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Force platform reader")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time every pipeline stage and save a _PROFILE report with the test files.",
+    )
+    parser.add_argument(
+        "--profile-cprofile",
+        action="store_true",
+        help="Also capture cProfile stats (implies --profile).",
+    )
+    parser.add_argument(
+        "--profile-tracemalloc",
+        action="store_true",
+        help="Also capture tracemalloc memory peaks (implies --profile).",
+    )
+    args, _ = parser.parse_known_args()
+    return args
+
+
 def main():
+    args = parseArgs()
+    if args.profile or args.profile_cprofile or args.profile_tracemalloc:
+        profiler.enable(
+            use_cprofile=args.profile_cprofile,
+            use_tracemalloc=args.profile_tracemalloc,
+        )
     app = QtWidgets.QApplication(sys.argv)
     app.setStyleSheet(open("src/qtUIs/style.qss").read())
     app.setStyle("Fusion")
@@ -9,16 +9,36 @@ class ConfigPaths(Enum):
     TEST_FOLDER_PATH = "settings.test.folder_path"
     TEST_SAVE_RAW = "settings.test.results.save_raw"
     TEST_SAVE_CALIB = "settings.test.results.save_calib"
+    TEST_SAVE_DIAGNOSTICS = "settings.test.results.save_diagnostics"
+    TEST_SAVE_SESSION = "settings.test.results.save_session"
+    TEST_SAVE_ARCHIVE = "settings.test.results.save_archive"
+    TEST_SAVE_ARROW = "settings.test.results.save_arrow"
+    TEST_SHARE_ARROW = "settings.test.results.share_arrow"
+    TEST_ARCHIVE_CODEC = "settings.test.results.archive_codec"
+    TEST_ARCHIVE_LEVEL = "settings.test.results.archive_level"
 
     RECORD_INTERVAL_MS = "settings.recording.data_interval_ms"
     RECORD_TARE_AMOUNT = "settings.recording.tare_data_amount"
+    RECORD_KEEP_CONNECTIONS = "settings.recording.keep_connections"
+    RECORD_CONNECTION_TIMEOUT_MS = "settings.recording.connection_timeout_ms"
+    RECORD_DATA_CACHE_MB = "settings.recording.data_cache_mb"
+    RECORD_COMPACT_STORAGE = "settings.recording.compact_storage"
 
     CALIBRATION_INTERVAL_MS = "settings.calibration.data_interval_ms"
     CALIBRATION_DATA_AMOUNT = "settings.calibration.data_amount"
+    CALIBRATION_SAVE_RAW = "settings.calibration.save_raw_values"
+    CALIBRATION_CONVERGENCE = "settings.calibration.convergence.enabled"
+    CALIBRATION_SEM_THRESHOLD = "settings.calibration.convergence.sem_threshold"
+    CALIBRATION_MAX_TIME_MS = "settings.calibration.convergence.max_time_ms"
+    CALIBRATION_MIN_SAMPLES = "settings.calibration.convergence.min_samples"
+    CALIBRATION_HISTORY_PATH = "settings.calibration.history.file_path"
+    CALIBRATION_DRIFT_THRESHOLD = "settings.calibration.history.drift_threshold"
+    CALIBRATION_DRIFT_DAYS = "settings.calibration.history.drift_days"
 
     # Sensors
     SENSOR_GROUPS_SECTION = "sensor_groups"
     SENSORS_SECTION = "sensors"
+    SENSORS_CALIBRATION_SECTION = "sensors_calibration"
     CALIBRATION_LOADCELL_SENSOR = "sensors_calibration.phidget_loadcell_reference"
     CALIBRATION_PLATFORM_TRIAXIAL = "sensors_calibration.platform_reference_triaxial"
 
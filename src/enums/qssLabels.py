@@ -23,4 +23,5 @@ class QssLabels(Enum):
     SENSOR_GROUP_OK = "sensor_group_ok"
     SENSOR_IGNORED = "sensor_ignored"
     SENSOR_ERROR = "sensor_error"
+    SENSOR_WARN = "sensor_warn"
     SENSOR_OK = "sensor_ok"
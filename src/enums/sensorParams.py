@@ -30,3 +30,4 @@ class SGParams(Enum):
     TYPE = "type"
     READ = "read"
     SENSOR_LIST = "sensor_list"
+    CALIBRATION_MATRIX = "calibration_matrix"
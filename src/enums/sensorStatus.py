@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, auto
 from src.enums.qssLabels import QssLabels
 from src.enums.uiResources import IconPaths
 
@@ -7,6 +7,14 @@ class SStatus(Enum):
     IGNORED = (IconPaths.STATUS_OFF, QssLabels.SENSOR_IGNORED)
     AVAILABLE = (IconPaths.STATUS_OK, QssLabels.SENSOR_OK)
     NOT_FOUND = (IconPaths.STATUS_ERROR, QssLabels.SENSOR_ERROR)
+    # Available sensor whose channel has been unplugged during the test
+    DETACHED = (IconPaths.STATUS_WARN, QssLabels.SENSOR_WARN)
+
+
+# Driver connection state. WARM channels stay attached between tests.
+class SConnState(Enum):
+    COLD = auto()
+    WARM = auto()
 
 
 class SGStatus(Enum):
@@ -99,6 +99,9 @@ class Camera:
     def setRead(self, read: bool) -> None:
         self.params[CParams.READ.value] = read
 
+    def setStatus(self, status: CStatus) -> None:
+        self.status = status
+
     def getID(self) -> str:
         return self.id
 
@@ -111,6 +114,9 @@ class Camera:
     def getStatus(self) -> CStatus:
         return self.status
 
+    def getConnectionParams(self) -> dict:
+        return self.params[CParams.CONNECTION_SECTION.value]
+
     def getProperties(self) -> str:
         text = " - "
         for property in self.params[CParams.PROPERTIES_SECTION.value]:
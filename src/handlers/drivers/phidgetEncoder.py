@@ -12,7 +12,12 @@ class PhidgetEncoder:
         self.handler.setDeviceSerialNumber(serial)
         self.handler.setChannel(channel)
         self.handler.setOnPositionChangeHandler(self.onPositionChange)
+        self.handler.setOnAttachHandler(self.onAttach)
+        self.handler.setOnDetachHandler(self.onDetach)
         self.mutex = threading.Lock()
+        self.callback_count: int = 0
+        self.attached: bool = False
+        self.interval_ms: int = 8
         self.value: float = 0
 
     def onPositionChange(
@@ -20,9 +25,32 @@ class PhidgetEncoder:
     ):
         self.mutex.acquire()
         self.value += positionChange
+        self.callback_count += 1
         self.mutex.release()
 
+    def onAttach(self, handler: Encoder):
+        # Open channels are reattached by Phidget22, but lose their data interval
+        try:
+            handler.setDataInterval(self.interval_ms)
+        except PhidgetException:
+            pass
+        self.mutex.acquire()
+        self.attached = True
+        self.mutex.release()
+        logger.info(
+            f"Attached serial {handler.getDeviceSerialNumber()}, channel {handler.getChannel()}"
+        )
+
+    def onDetach(self, handler: Encoder):
+        self.mutex.acquire()
+        self.attached = False
+        self.mutex.release()
+        logger.warning(
+            f"Detached serial {handler.getDeviceSerialNumber()}, channel {handler.getChannel()}"
+        )
+
     def connect(self, wait_ms: int = 2000, interval_ms: int = 8) -> bool:
+        self.interval_ms = interval_ms
         try:
             self.handler.openWaitForAttachment(wait_ms)
             self.handler.setDataInterval(interval_ms)
@@ -31,9 +59,15 @@ class PhidgetEncoder:
                 f"Could not connect to serial {self.handler.getDeviceSerialNumber()}, channel {self.handler.getChannel()}"
             )
             return False
+        self.mutex.acquire()
+        self.attached = True
+        self.mutex.release()
         return True
 
     def disconnect(self) -> None:
+        self.mutex.acquire()
+        self.attached = False
+        self.mutex.release()
         try:
             self.handler.close()
         except PhidgetException:
@@ -41,6 +75,18 @@ class PhidgetEncoder:
                 f"Could not disconnect serial {self.handler.getDeviceSerialNumber()}, channel {self.handler.getChannel()}"
             )
 
+    def isAttached(self) -> bool:
+        self.mutex.acquire()
+        attached = self.attached
+        self.mutex.release()
+        return attached
+
+    def getCallbackCount(self) -> int:
+        self.mutex.acquire()
+        count = self.callback_count
+        self.mutex.release()
+        return count
+
     def getValue(self):
         self.mutex.acquire()
         value = self.value
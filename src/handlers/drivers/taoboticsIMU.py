@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
 
 from loguru import logger
-from mrpt.pymrpt import mrpt
+
+# MRPT is built apart from the requirements, only needed to read IMUs
+try:
+    from mrpt.pymrpt import mrpt
+except ImportError:
+    mrpt = None
 
 
 class TaoboticsIMU:
@@ -12,6 +17,8 @@ class TaoboticsIMU:
         self.setHandler()
 
     def setHandler(self):
+        if mrpt is None:
+            raise ImportError("MRPT is needed to read Taobotics IMUs")
         if hasattr(self, "handler"):
             del self.handler
         self.handler = mrpt.hwdrivers.CTaoboticsIMU()
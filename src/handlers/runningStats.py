@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+import math
+
+
+# Welford online mean and variance, with O(1) memory.
+# NaN and None values (detached or not yet received samples) are ignored.
+class RunningStats:
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.mean: float = 0
+        self.m2: float = 0
+
+    def clear(self) -> None:
+        self.count = 0
+        self.mean = 0
+        self.m2 = 0
+
+    def add(self, value: float) -> None:
+        if value is None or math.isnan(value):
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    # Getters
+
+    def getCount(self) -> int:
+        return self.count
+
+    def getMean(self) -> float:
+        if self.count == 0:
+            return math.nan
+        return self.mean
+
+    def getVariance(self) -> float:
+        # Population variance, as np.var and np.std defaults
+        if self.count == 0:
+            return math.nan
+        return self.m2 / self.count
+
+    def getStd(self) -> float:
+        return math.sqrt(self.getVariance())
+
+    def getSem(self) -> float:
+        # Standard error of the mean
+        if self.count < 2:
+            return math.inf
+        return math.sqrt(self.m2 / (self.count - 1) / self.count)
@@ -1,9 +1,17 @@
 # -*- coding: utf-8 -*-
 
+import time
+import threading
+import numpy as np
+from loguru import logger
 from src.enums.sensorParams import SParams
 from src.enums.sensorTypes import STypes
-from src.enums.sensorStatus import SStatus
-from typing import Protocol
+from src.enums.sensorStatus import SStatus, SConnState
+from src.handlers.sensorStats import SensorStats
+from src.handlers.sensorSpec import SensorSpec
+from src.handlers.runningStats import RunningStats
+from src.handlers.valueBuffer import ValueBuffer, buildValueBuffer
+from typing import Callable, Protocol
 
 
 class Driver(Protocol):
@@ -15,18 +23,42 @@ class Driver(Protocol):
 
     def getValue(self): ...
 
+    # Optional, only for drivers with attach and detach events
+    def isAttached(self) -> bool: ...
+
 
 class Sensor:
+    # Bumped on every sensor status change, so groups can invalidate their indexes
+    status_epoch: int = 0
+    status_epoch_lock = threading.Lock()
+
     def __init__(self) -> None:
         self.id: str
         self.params: dict
+        self.spec: SensorSpec
+        # Returns the version of the config the params belong to, None if unmanaged
+        self.config_version: Callable[[], int] = None
         self.status: SStatus = SStatus.IGNORED
+        self.connection: SConnState = SConnState.COLD
+        self.keep_warm: bool = False
         self.driver: Driver
-        self.values: list = []
+        # Registered values in the storage dtype of the sensor type
+        self.values: ValueBuffer = ValueBuffer()
+        self.compact_storage: bool = True
+        self.last_value = None
+        self.stats: SensorStats = SensorStats()
+        # Optional online mean and variance of the registered values
+        self.running_stats: RunningStats = None
+        self.retain_values: bool = True
+        self.attached: bool = True
+        # Detached periods while recording, as [start_ms, end_ms] timestamps
+        self.gaps: list[list[int]] = []
 
     def setup(self, id: str, params: dict, driver: Driver):
         self.id = id
         self.params = params
+        self.spec = self.buildSpec()
+        self.values = buildValueBuffer(self.spec.type, self.compact_storage)
         self.driver = driver(
             self.params[SParams.CONNECTION_SECTION.value][SParams.SERIAL.value],
             self.params[SParams.CONNECTION_SECTION.value].get(
@@ -34,20 +66,76 @@ class Sensor:
             ),
         )
 
+    @property
+    def status(self) -> SStatus:
+        return self._status
+
+    @status.setter
+    def status(self, status: SStatus) -> None:
+        changed = getattr(self, "_status", None) is not status
+        self._status = status
+        # Bumped after the new status, so indexes built meanwhile are rebuilt
+        if changed:
+            with Sensor.status_epoch_lock:
+                Sensor.status_epoch += 1
+
+    def updateParams(self, params: dict) -> None:
+        # Only for params with the same type and connection, the driver is kept
+        self.params = params
+        self.spec = self.buildSpec()
+
+    def buildSpec(self) -> SensorSpec:
+        if self.config_version is None:
+            return SensorSpec(self.params)
+        return SensorSpec(self.params, self.config_version())
+
+    def getSpec(self) -> SensorSpec:
+        # Config changes made outside the sensor setters edit the params in place
+        if (
+            self.config_version is not None
+            and self.spec.version != self.config_version()
+        ):
+            self.spec = self.buildSpec()
+        return self.spec
+
     def connect(self, check: bool = False) -> bool:
-        if not self.params[SParams.READ.value]:
+        if not self.getSpec().read:
+            self.release()
             self.status = SStatus.IGNORED
             return False
         if not check and self.status is not SStatus.AVAILABLE:
             return False
+        # Unplugged warm channels are opened again, so checks ask the driver
+        if (
+            check
+            and self.connection is SConnState.WARM
+            and not self.updateAttachState()
+        ):
+            self.release()
+        # Warm channels are still attached, no need to open them again
+        if self.connection is SConnState.WARM:
+            self.status = SStatus.AVAILABLE
+            self.stats.startCallbacks(self.getCallbackCount())
+            return True
         self.status = SStatus.NOT_FOUND
         if self.driver.connect():
             self.status = SStatus.AVAILABLE
+            self.connection = SConnState.WARM
+            self.stats.startCallbacks(self.getCallbackCount())
             return True
         return False
 
     def disconnect(self) -> None:
+        self.stats.registerCallbacks(self.getCallbackCount())
+        if self.keep_warm:
+            return
+        self.release()
+
+    def release(self) -> None:
+        if self.connection is SConnState.COLD:
+            return
         self.driver.disconnect()
+        self.connection = SConnState.COLD
 
     def checkConnection(self) -> bool:
         connected = self.connect(check=True)
@@ -55,59 +143,152 @@ class Sensor:
             self.disconnect()
         return connected
 
+    def updateAttachState(self) -> bool:
+        attached = not self.isDetached()
+        if attached == self.attached:
+            return attached
+        self.attached = attached
+        timestamp = round(time.time() * 1000)
+        if not attached:
+            logger.warning(f"Sensor {self.getName()} detached, recording a gap")
+            self.gaps.append([timestamp, None])
+        elif self.gaps and self.gaps[-1][1] is None:
+            self.gaps[-1][1] = timestamp
+            logger.info(f"Sensor {self.getName()} reattached")
+        return attached
+
     def registerValue(self) -> None:
         if self.status is not SStatus.AVAILABLE:
             return
-        self.values.append(self.driver.getValue())
+        # Keep the values aligned with the test times while the channel is detached
+        if not self.updateAttachState():
+            if self.retain_values:
+                self.values.appendMissing()
+            return
+        start = time.perf_counter()
+        value = self.driver.getValue()
+        latency = time.perf_counter() - start
+        self.stats.registerRead(
+            latency, self.last_value is not None and value == self.last_value
+        )
+        self.last_value = value
+        if self.running_stats is not None:
+            self.running_stats.add(value)
+        if self.retain_values:
+            self.values.append(value)
 
     # Setters and getters methods
 
     def setRead(self, read: bool) -> None:
         self.params[SParams.READ.value] = read
+        self.spec.read = read
+
+    def setStatus(self, status: SStatus) -> None:
+        self.status = status
+
+    def setTrackStats(self, track: bool) -> None:
+        self.running_stats = RunningStats() if track else None
+
+    def setRetainValues(self, retain: bool) -> None:
+        self.retain_values = retain
+
+    def setCompactStorage(self, compact: bool) -> None:
+        # Float64 buffers for every type if not compact. Registered values are lost.
+        if compact == self.compact_storage:
+            return
+        self.compact_storage = compact
+        if hasattr(self, "spec"):
+            self.values = buildValueBuffer(self.getType(), compact)
+
+    def setConfigVersion(self, config_version: Callable[[], int]) -> None:
+        self.config_version = config_version
+        if hasattr(self, "spec"):
+            self.spec = self.buildSpec()
+
+    def setKeepWarm(self, keep_warm: bool) -> None:
+        self.keep_warm = keep_warm
+        if not keep_warm:
+            self.release()
 
     def setSlope(self, slope: float) -> None:
         self.params[SParams.CALIBRATION_SECTION.value][SParams.SLOPE.value] = slope
+        self.spec.slope = slope
 
     def setIntercept(self, intercept: float) -> None:
         self.params[SParams.CALIBRATION_SECTION.value][
             SParams.INTERCEPT.value
         ] = intercept
+        self.spec.intercept = intercept
 
     def clearValues(self) -> None:
         self.values.clear()
+        self.last_value = None
+        self.stats.clear(self.getCallbackCount())
+        if self.running_stats is not None:
+            self.running_stats.clear()
+        self.gaps.clear()
+        self.attached = not self.isDetached()
 
     def getID(self) -> str:
         return self.id
 
     def getName(self) -> str:
-        return self.params[SParams.NAME.value]
+        return self.getSpec().name
 
     def getType(self) -> STypes:
-        return STypes[self.params[SParams.TYPE.value]]
+        return self.getSpec().type
 
     def getRead(self) -> bool:
-        return self.params[SParams.READ.value]
+        return self.getSpec().read
 
     def getStatus(self) -> SStatus:
         return self.status
 
+    def getLiveStatus(self) -> SStatus:
+        if self.status is SStatus.AVAILABLE and self.isDetached():
+            return SStatus.DETACHED
+        return self.status
+
+    def isDetached(self) -> bool:
+        # Only open channels of event driven drivers (Phidget handlers) can detach
+        if self.connection is SConnState.COLD:
+            return False
+        if not hasattr(self.driver, "isAttached"):
+            return False
+        return not self.driver.isAttached()
+
+    def getConnectionState(self) -> SConnState:
+        return self.connection
+
+    def isWarm(self) -> bool:
+        return self.connection is SConnState.WARM
+
+    def getConnectionParams(self) -> dict:
+        return self.params[SParams.CONNECTION_SECTION.value]
+
     def getProperties(self) -> str:
-        text = " - "
-        for property in self.params[SParams.PROPERTIES_SECTION.value]:
-            text = (
-                text + self.params[SParams.PROPERTIES_SECTION.value][property] + " - "
-            )
-        return text
+        return self.getSpec().properties_text
 
     def getSlope(self) -> float:
-        return self.params[SParams.CALIBRATION_SECTION.value].get(
-            SParams.SLOPE.value, 1
-        )
+        return self.getSpec().slope
 
     def getIntercept(self) -> float:
-        return self.params[SParams.CALIBRATION_SECTION.value].get(
-            SParams.INTERCEPT.value, 0
-        )
+        return self.getSpec().intercept
+
+    def getValues(self) -> np.ndarray:
+        return self.values.getValues()
+
+    def getCallbackCount(self) -> int:
+        # Only event driven drivers (Phidget handlers) count their callbacks
+        if not hasattr(self.driver, "getCallbackCount"):
+            return 0
+        return self.driver.getCallbackCount()
+
+    def getStats(self) -> SensorStats:
+        return self.stats
+
+    def getRunningStats(self) -> RunningStats:
+        return self.running_stats
 
-    def getValues(self) -> list:
-        return self.values
+    def getGaps(self) -> list[list[int]]:
+        return self.gaps
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import concurrent.futures
+import numpy as np
 
 from src.enums.sensorStatus import SStatus, SGStatus
 from src.enums.sensorTypes import SGTypes, STypes
@@ -16,9 +17,15 @@ class SensorGroup:
         self.status: SGStatus = SGStatus.IGNORED
         self.active: bool = False
         self.sensors: dict[str, Sensor] = {}
+        # Platform calibration matrix (6 x 12), None if not calibrated
+        self.calibration_matrix: np.ndarray = None
+        # (only_available, sensor_type) -> filtered sensors, valid for index_epoch
+        self.index_cache: dict[tuple[bool, STypes], dict[str, Sensor]] = {}
+        self.index_epoch: int = -1
 
     def addSensor(self, sensor: Sensor):
         self.sensors[sensor.id] = sensor
+        self.index_cache.clear()
 
     def checkConnections(self) -> bool:
         if not self.read:
@@ -30,6 +37,12 @@ class SensorGroup:
             results = list(
                 executor.map(lambda sensor: sensor.checkConnection(), sensors_list)
             )
+        return self.updateStatus(results)
+
+    def updateStatus(self, results: list[bool]) -> bool:
+        if not self.read:
+            self.status = SGStatus.IGNORED
+            return False
         self.status = SGStatus.ERROR
         if all(results):
             self.status = SGStatus.OK
@@ -38,8 +51,12 @@ class SensorGroup:
         return self.status != SGStatus.ERROR
 
     def start(self) -> None:
+        sensors_list = list(self.sensors.values())
+        # Warm sensors are already attached, only cold ones need threaded opens
+        if all(sensor.isWarm() for sensor in sensors_list if sensor.getRead()):
+            self.active = any([sensor.connect() for sensor in sensors_list])
+            return
         with concurrent.futures.ThreadPoolExecutor() as executor:
-            sensors_list = list(self.sensors.values())
             results = list(executor.map(lambda sensor: sensor.connect(), sensors_list))
             self.active = any(results)
 
@@ -50,11 +67,21 @@ class SensorGroup:
         [sensor.disconnect() for sensor in list(self.sensors.values())]
         self.active = False
 
+    def release(self) -> None:
+        [sensor.release() for sensor in list(self.sensors.values())]
+        self.active = False
+
     # Setters and getters
 
     def setRead(self, read: bool) -> None:
         self.read = read
 
+    def setCalibrationMatrix(self, matrix: np.ndarray) -> None:
+        self.calibration_matrix = matrix
+
+    def setKeepWarm(self, keep_warm: bool) -> None:
+        [sensor.setKeepWarm(keep_warm) for sensor in self.sensors.values()]
+
     def clearValues(self) -> None:
         [sensor.clearValues() for sensor in self.sensors.values()]
 
@@ -73,17 +100,44 @@ class SensorGroup:
     def getRead(self) -> bool:
         return self.read
 
+    def getCalibrationMatrix(self) -> np.ndarray:
+        return self.calibration_matrix
+
     def getStatus(self) -> SGStatus:
         return self.status
 
+    def getLiveStatus(self) -> SGStatus:
+        if self.status is not SGStatus.OK:
+            return self.status
+        if any(sensor.isDetached() for sensor in self.sensors.values()):
+            return SGStatus.WARNING
+        return self.status
+
+    def getGaps(self) -> dict[str, list[list[int]]]:
+        return {
+            sensor_id: sensor.getGaps()
+            for sensor_id, sensor in self.sensors.items()
+            if sensor.getGaps()
+        }
+
     def isActive(self) -> bool:
         return self.active
 
+    def isWarm(self) -> bool:
+        read_sensors = [sensor for sensor in self.sensors.values() if sensor.getRead()]
+        return bool(read_sensors) and all(sensor.isWarm() for sensor in read_sensors)
+
     def getSensors(
         self, only_available: bool = False, sensor_type: STypes = None
     ) -> dict[str, Sensor]:
         if not only_available and sensor_type is None:
             return self.sensors
+        if self.index_epoch != Sensor.status_epoch:
+            self.index_cache.clear()
+            self.index_epoch = Sensor.status_epoch
+        index_key = (only_available, sensor_type)
+        if index_key in self.index_cache:
+            return self.index_cache[index_key]
         group_dict = {}
         for sensor_id, sensor in self.sensors.items():
             if only_available and sensor.getStatus() != SStatus.AVAILABLE:
@@ -91,4 +145,5 @@ class SensorGroup:
             if sensor_type is not None and sensor.getType() != sensor_type:
                 continue
             group_dict[sensor_id] = sensor
+        self.index_cache[index_key] = group_dict
         return group_dict
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+from src.enums.sensorParams import SParams
+from src.enums.sensorTypes import STypes
+
+
+# Resolved view of a sensor config section, read by the hot sensor getters.
+# Built for a config version, rebuilt from the params dict when it changes.
+class SensorSpec:
+    __slots__ = (
+        "version",
+        "name",
+        "type",
+        "read",
+        "slope",
+        "intercept",
+        "properties_text",
+    )
+
+    def __init__(self, params: dict, version: int = 0) -> None:
+        self.version: int = version
+        calibration: dict = params.get(SParams.CALIBRATION_SECTION.value) or {}
+        self.name: str = params[SParams.NAME.value]
+        self.type: STypes = STypes[params[SParams.TYPE.value]]
+        self.read: bool = params[SParams.READ.value]
+        self.slope: float = calibration.get(SParams.SLOPE.value, 1)
+        self.intercept: float = calibration.get(SParams.INTERCEPT.value, 0)
+        self.properties_text: str = " - "
+        for value in (params.get(SParams.PROPERTIES_SECTION.value) or {}).values():
+            self.properties_text = self.properties_text + value + " - "
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import time
+from bisect import bisect_left
+
+# Latency histogram bucket upper limits (in microseconds).
+# The last bucket collects every read slower than the previous limit.
+LATENCY_BUCKETS_US: list[float] = [10, 50, 100, 500, 1000, 5000, 10000, float("inf")]
+
+
+class SensorStats:
+    def __init__(self) -> None:
+        self.reads: int = 0
+        self.stale_reads: int = 0
+        self.latency_total_s: float = 0
+        self.latency_max_s: float = 0
+        self.latency_histogram: list[int] = [0] * len(LATENCY_BUCKETS_US)
+        self.start_time: float = time.perf_counter()
+        self.start_callbacks: int = 0
+        self.last_time: float = self.start_time
+        self.last_callbacks: int = 0
+
+    def clear(self, callback_count: int = 0) -> None:
+        self.reads = 0
+        self.stale_reads = 0
+        self.latency_total_s = 0
+        self.latency_max_s = 0
+        self.latency_histogram = [0] * len(LATENCY_BUCKETS_US)
+        self.startCallbacks(callback_count)
+
+    def startCallbacks(self, callback_count: int) -> None:
+        self.start_time = time.perf_counter()
+        self.start_callbacks = callback_count
+        self.last_time = self.start_time
+        self.last_callbacks = callback_count
+
+    def registerRead(self, latency_s: float, stale: bool) -> None:
+        self.reads += 1
+        if stale:
+            self.stale_reads += 1
+        self.latency_total_s += latency_s
+        if latency_s > self.latency_max_s:
+            self.latency_max_s = latency_s
+        self.latency_histogram[bisect_left(LATENCY_BUCKETS_US, latency_s * 1e6)] += 1
+
+    def registerCallbacks(self, callback_count: int) -> None:
+        self.last_time = time.perf_counter()
+        self.last_callbacks = callback_count
+
+    # Getters
+
+    def getReads(self) -> int:
+        return self.reads
+
+    def getStaleReads(self) -> int:
+        return self.stale_reads
+
+    def getMeanLatencyMs(self) -> float:
+        if self.reads == 0:
+            return 0
+        return self.latency_total_s / self.reads * 1000
+
+    def getMaxLatencyMs(self) -> float:
+        return self.latency_max_s * 1000
+
+    def getStaleRatio(self) -> float:
+        if self.reads == 0:
+            return 0
+        return self.stale_reads / self.reads
+
+    def getCallbackRate(self) -> float:
+        elapsed = self.last_time - self.start_time
+        if elapsed <= 0:
+            return 0
+        return (self.last_callbacks - self.start_callbacks) / elapsed
+
+    def getLatencyHistogram(self) -> dict[str, int]:
+        histogram = {}
+        for limit, count in zip(LATENCY_BUCKETS_US, self.latency_histogram):
+            label = f"lat_le_{int(limit)}us" if limit != float("inf") else "lat_inf"
+            histogram[label] = count
+        return histogram
+
+    def getSummary(self) -> dict:
+        summary = {
+            "reads": self.reads,
+            "stale_reads": self.stale_reads,
+            "stale_ratio": round(self.getStaleRatio(), 4),
+            "lat_mean_ms": round(self.getMeanLatencyMs(), 4),
+            "lat_max_ms": round(self.getMaxLatencyMs(), 4),
+            "callback_rate_hz": round(self.getCallbackRate(), 2),
+        }
+        summary.update(self.getLatencyHistogram())
+        return summary
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from src.enums.sensorTypes import STypes
+
+# Compact storage dtype and values per sample of each sensor type.
+# Bridge ratios and IMU values fit in float32, encoder positions are counts.
+STORAGE_FORMATS: dict[STypes, tuple[np.dtype, int]] = {
+    STypes.SENSOR_LOADCELL: (np.dtype(np.float32), 1),
+    STypes.SENSOR_ENCODER: (np.dtype(np.int64), 1),
+    STypes.SENSOR_IMU: (np.dtype(np.float32), 10),
+}
+# Missing (detached) values of integer buffers, as they can not be NaN
+MISSING_INT = np.iinfo(np.int64).min
+
+
+class ValueBuffer:
+    # Growing array of the registered values of a sensor, in its storage dtype.
+    # Missing values are NaN, or MISSING_INT in integer buffers.
+    def __init__(self, dtype=np.float64, width: int = 1, capacity: int = 1024) -> None:
+        self.dtype: np.dtype = np.dtype(dtype)
+        self.width: int = width
+        self.capacity: int = capacity
+        self.missing = MISSING_INT if self.dtype.kind in "iu" else np.nan
+        self.size: int = 0
+        self.data: np.ndarray = self.allocate(capacity)
+
+    def allocate(self, capacity: int) -> np.ndarray:
+        shape = (capacity,) if self.width == 1 else (capacity, self.width)
+        return np.empty(shape, dtype=self.dtype)
+
+    def append(self, value) -> None:
+        if self.size == len(self.data):
+            data = self.allocate(2 * len(self.data))
+            data[: self.size] = self.data
+            self.data = data
+        try:
+            self.data[self.size] = value
+        except (TypeError, ValueError):
+            # Empty IMU lists or NaN encoder positions
+            self.data[self.size] = self.missing
+        self.size += 1
+
+    def appendMissing(self) -> None:
+        self.append(self.missing)
+
+    def clear(self) -> None:
+        # A new array, so values handed out before keep their content
+        self.size = 0
+        self.data = self.allocate(self.capacity)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def getValues(self) -> np.ndarray:
+        return self.data[: self.size]
+
+    def getDType(self) -> np.dtype:
+        return self.dtype
+
+
+def buildValueBuffer(sensor_type: STypes, compact: bool = True) -> ValueBuffer:
+    dtype, width = STORAGE_FORMATS[sensor_type]
+    return ValueBuffer(dtype if compact else np.float64, width)
+
+
+def asFloatValues(values: np.ndarray) -> np.ndarray:
+    # Float values are kept as they are, integer ones are upcast with NaN gaps
+    values = np.asanyarray(values)
+    if values.dtype.kind == "f":
+        return values
+    floats = values.astype(np.float64)
+    if values.dtype.kind in "iu":
+        floats[values == MISSING_INT] = np.nan
+    return floats
+
+
+def asStorageValues(values: np.ndarray, dtype) -> np.ndarray:
+    # Float values in a storage dtype, NaN gaps are MISSING_INT in integer ones
+    dtype = np.dtype(dtype)
+    values = np.asarray(values)
+    if dtype.kind not in "iu" or values.dtype.kind in "iu":
+        return values.astype(dtype, copy=False)
+    missing = np.isnan(values)
+    stored = np.where(missing, 0, np.round(values)).astype(dtype)
+    stored[missing] = MISSING_INT
+    return stored
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import json
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+from loguru import logger
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Arrow IPC (Feather v2) files, uncompressed so they can be memory-mapped
+ARROW_EXTENSION = ".arrow"
+# Shared memory blocks are named <prefix><test name>
+SHARED_PREFIX = "force_platform_"
+METADATA_KEY = b"force_platform"
+TIMESTAMP_COLUMN = "timestamp"
+# Signal kinds, kept in the metadata of each field
+RAW = "raw"
+CALIBRATED = "calibrated"
+DERIVED = "derived"
+
+
+def isArrowAvailable() -> bool:
+    return pa is not None
+
+
+def buildSessionTable(
+    timestamps: np.ndarray,
+    signals: dict[str, dict[str, np.ndarray]],
+    metadata: dict = None,
+) -> "pa.Table":
+    # Signals by kind and column name. Raw columns get a _RAW suffix, as in CSVs.
+    # Values are not copied, NaNs are kept as NaN values (not nulls).
+    if pa is None:
+        raise ImportError("pyarrow is needed to build Arrow tables")
+    arrays = [pa.array(np.asarray(timestamps, dtype=np.int64))]
+    fields = [pa.field(TIMESTAMP_COLUMN, pa.int64())]
+    for kind, columns in signals.items():
+        for column, values in columns.items():
+            array = pa.array(np.ascontiguousarray(values))
+            name = column + "_RAW" if kind == RAW else column
+            fields.append(pa.field(name, array.type, metadata={"kind": kind}))
+            arrays.append(array)
+    schema = pa.schema(fields, metadata={METADATA_KEY: json.dumps(metadata or {})})
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def getSessionMetadata(table: "pa.Table") -> dict:
+    return json.loads(table.schema.metadata.get(METADATA_KEY, b"{}"))
+
+
+def writeArrowFile(file_path: str, table: "pa.Table") -> None:
+    with pa.OSFile(file_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def readArrowFile(file_path: str) -> "pa.Table":
+    # Memory-mapped, columns are read from the file when accessed
+    return pa.ipc.open_file(pa.memory_map(file_path, "r")).read_all()
+
+
+def writeStream(table: "pa.Table", sink) -> None:
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+class SharedTable:
+    # Arrow IPC stream in a named shared memory block, so other processes can map
+    # the session with openSharedTable without copies or parsing.
+    # Streams are read from the start, as blocks can be rounded up to pages.
+    # The block exists until close is called.
+    def __init__(self, name: str, table: "pa.Table") -> None:
+        if pa is None:
+            raise ImportError("pyarrow is needed to share Arrow tables")
+        sink = pa.MockOutputStream()
+        writeStream(table, sink)
+        self.memory: shared_memory.SharedMemory = createSharedMemory(name, sink.size())
+        writeStream(table, pa.FixedSizeBufferWriter(pa.py_buffer(self.memory.buf)))
+
+    def getName(self) -> str:
+        return self.memory.name
+
+    def getSize(self) -> int:
+        return self.memory.size
+
+    def close(self) -> None:
+        self.memory.close()
+        self.memory.unlink()
+
+
+def createSharedMemory(name: str, size: int) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+    except FileExistsError:
+        # Left by a closed app, replaced by the new session
+        logger.warning(f"Replacing shared session {name}")
+        old_memory = shared_memory.SharedMemory(name=name)
+        old_memory.close()
+        old_memory.unlink()
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+
+def openSharedTable(name: str) -> tuple["pa.Table", shared_memory.SharedMemory]:
+    # For analysis processes. The table is a view of the shared memory block,
+    # so close the block only after dropping the table.
+    if pa is None:
+        raise ImportError("pyarrow is needed to open shared Arrow tables")
+    # Not tracked, otherwise the block is unlinked when this process exits
+    if sys.version_info >= (3, 13):
+        memory = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        memory = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(memory._name, "shared_memory")
+    table = pa.ipc.open_stream(pa.py_buffer(memory.buf)).read_all()
+    return (table, memory)
+
+
+def getSharedName(test_name: str) -> str:
+    return SHARED_PREFIX + "".join(
+        char if char.isalnum() or char in "_-" else "_" for char in test_name
+    )
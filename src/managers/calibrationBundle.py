@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+import os
+import zipfile
+import concurrent.futures
+import numpy as np
+from loguru import logger
+
+
+class CalibrationBundleWriter:
+    # Writes named arrays as .npy entries of a single zip bundle (readable with np.load)
+    # from a background worker. Every write updates the zip index, so the bundle
+    # stays readable after each measurement. Existing bundles are appended.
+    def __init__(self, file_path: str) -> None:
+        self.file_path: str = file_path
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="calibration_bundle"
+        )
+        self.futures: list[concurrent.futures.Future] = []
+        self.entries: set[str] = set()
+        if os.path.exists(file_path):
+            with zipfile.ZipFile(file_path) as bundle:
+                self.entries = {name.removesuffix(".npy") for name in bundle.namelist()}
+
+    def write(self, arrays: dict[str, np.ndarray]) -> bool:
+        # Arrays are copied, so callers can reuse their buffers right away
+        duplicated = self.entries.intersection(arrays)
+        if duplicated:
+            logger.error(f"Calibration bundle entries already written: {duplicated}")
+            return False
+        arrays = {name: np.array(array) for name, array in arrays.items()}
+        self.entries.update(arrays)
+        self.futures = [future for future in self.futures if not future.done()]
+        self.futures.append(self.executor.submit(self.writeEntries, arrays))
+        return True
+
+    def writeEntries(self, arrays: dict[str, np.ndarray]) -> None:
+        try:
+            with zipfile.ZipFile(
+                self.file_path, "a", compression=zipfile.ZIP_DEFLATED
+            ) as bundle:
+                for name, array in arrays.items():
+                    with bundle.open(name + ".npy", "w") as file:
+                        np.lib.format.write_array(file, array, allow_pickle=False)
+        except Exception as e:
+            logger.error(f"Could not write calibration bundle {self.file_path}: {e}")
+
+    def flush(self) -> None:
+        concurrent.futures.wait(self.futures)
+        self.futures.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self.executor.shutdown(wait=True)
+        if os.path.exists(self.file_path):
+            file_size = os.path.getsize(self.file_path) / (1024 * 1024)
+            logger.info(
+                f"Calibration bundle saved in {self.file_path} ({file_size:.2f} MB)"
+            )
+
+    def getFilePath(self) -> str:
+        return self.file_path
+
+    def getEntries(self) -> set[str]:
+        return self.entries
+
+
+def loadCalibrationBundle(file_path: str) -> dict[str, np.ndarray]:
+    with np.load(file_path, allow_pickle=False) as bundle:
+        return {name: bundle[name] for name in bundle.files}
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+import sqlite3
+import contextlib
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from loguru import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sensor_calibrations (
+    id INTEGER PRIMARY KEY,
+    sensor_id TEXT NOT NULL,
+    sensor_name TEXT,
+    timestamp REAL NOT NULL,
+    slope REAL NOT NULL,
+    intercept REAL NOT NULL,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS sensor_calibrations_lookup
+    ON sensor_calibrations (sensor_id, timestamp);
+CREATE TABLE IF NOT EXISTS platform_calibrations (
+    id INTEGER PRIMARY KEY,
+    group_id TEXT NOT NULL,
+    group_name TEXT,
+    timestamp REAL NOT NULL,
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    calibration_matrix BLOB NOT NULL,
+    std_dev_matrix BLOB,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS platform_calibrations_lookup
+    ON platform_calibrations (group_id, timestamp);
+"""
+
+
+class CalibrationHistory:
+    # Indexed store of every saved calibration: sensor slopes and intercepts,
+    # and platform calibration matrices, by id and date.
+    def __init__(self, file_path: str) -> None:
+        self.file_path: str = file_path
+        with self.connect() as connection:
+            connection.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def connect(self):
+        connection = sqlite3.connect(self.file_path)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    # Calibration records
+
+    def addSensorCalibration(
+        self,
+        sensor_id: str,
+        slope: float,
+        intercept: float,
+        sensor_name: str = "",
+        timestamp: datetime = None,
+        source: str = "",
+    ) -> None:
+        timestamp = timestamp or datetime.now()
+        with self.connect() as connection:
+            connection.execute(
+                "INSERT INTO sensor_calibrations "
+                + "(sensor_id, sensor_name, timestamp, slope, intercept, source) "
+                + "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    sensor_id,
+                    sensor_name,
+                    timestamp.timestamp(),
+                    float(slope),
+                    float(intercept),
+                    source,
+                ),
+            )
+
+    def addPlatformCalibration(
+        self,
+        group_id: str,
+        calibration_matrix: np.ndarray,
+        std_dev_matrix: np.ndarray = None,
+        group_name: str = "",
+        timestamp: datetime = None,
+        source: str = "",
+    ) -> None:
+        timestamp = timestamp or datetime.now()
+        matrix = np.ascontiguousarray(calibration_matrix, dtype=np.float64)
+        std_devs = None
+        if std_dev_matrix is not None:
+            std_devs = np.ascontiguousarray(std_dev_matrix, dtype=np.float64)
+            std_devs = std_devs.reshape(matrix.shape).tobytes()
+        with self.connect() as connection:
+            connection.execute(
+                "INSERT INTO platform_calibrations "
+                + "(group_id, group_name, timestamp, rows, cols, "
+                + "calibration_matrix, std_dev_matrix, source) "
+                + "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    group_id,
+                    group_name,
+                    timestamp.timestamp(),
+                    matrix.shape[0],
+                    matrix.shape[1],
+                    matrix.tobytes(),
+                    std_devs,
+                    source,
+                ),
+            )
+
+    # Queries
+
+    def getSensorHistory(
+        self, sensor_id: str, since: datetime = None, until: datetime = None
+    ) -> pd.DataFrame:
+        query, params = self.timeRangeQuery(
+            "SELECT timestamp, slope, intercept, source FROM sensor_calibrations "
+            + "WHERE sensor_id = ?",
+            [sensor_id],
+            since,
+            until,
+        )
+        with self.connect() as connection:
+            rows = connection.execute(query + " ORDER BY timestamp", params).fetchall()
+        history = pd.DataFrame(
+            rows, columns=["timestamp", "slope", "intercept", "source"]
+        )
+        history["timestamp"] = pd.to_datetime(
+            [datetime.fromtimestamp(timestamp) for timestamp in history["timestamp"]]
+        )
+        return history
+
+    def getPlatformHistory(
+        self, group_id: str, since: datetime = None, until: datetime = None
+    ) -> list[tuple[datetime, np.ndarray, np.ndarray]]:
+        query, params = self.timeRangeQuery(
+            "SELECT timestamp, rows, cols, calibration_matrix, std_dev_matrix "
+            + "FROM platform_calibrations WHERE group_id = ?",
+            [group_id],
+            since,
+            until,
+        )
+        with self.connect() as connection:
+            rows = connection.execute(query + " ORDER BY timestamp", params).fetchall()
+        history = []
+        for timestamp, n_rows, n_cols, matrix, std_devs in rows:
+            shape = (n_rows, n_cols)
+            history.append(
+                (
+                    datetime.fromtimestamp(timestamp),
+                    np.frombuffer(matrix, dtype=np.float64).reshape(shape),
+                    (
+                        None
+                        if std_devs is None
+                        else np.frombuffer(std_devs, dtype=np.float64).reshape(shape)
+                    ),
+                )
+            )
+        return history
+
+    def timeRangeQuery(
+        self, query: str, params: list, since: datetime, until: datetime
+    ) -> tuple[str, list]:
+        if since is not None:
+            query += " AND timestamp >= ?"
+            params.append(since.timestamp())
+        if until is not None:
+            query += " AND timestamp <= ?"
+            params.append(until.timestamp())
+        return (query, params)
+
+    # Drift analysis
+
+    def getSensorDrift(
+        self, sensor_id: str, slope: float, since: datetime = None
+    ) -> float:
+        # Largest relative change of the slope from the recorded slopes
+        with self.connect() as connection:
+            query, params = self.timeRangeQuery(
+                "SELECT MIN(slope), MAX(slope) FROM sensor_calibrations "
+                + "WHERE sensor_id = ?",
+                [sensor_id],
+                since,
+                None,
+            )
+            min_slope, max_slope = connection.execute(query, params).fetchone()
+        if min_slope is None:
+            return None
+        return max(
+            relativeDifference(slope, min_slope), relativeDifference(slope, max_slope)
+        )
+
+    def getPlatformDrift(
+        self, group_id: str, calibration_matrix: np.ndarray, since: datetime = None
+    ) -> float:
+        # Largest relative change of the matrix (Frobenius norm) from the recorded ones
+        history = self.getPlatformHistory(group_id, since)
+        matrix = np.asarray(calibration_matrix, dtype=float)
+        drifts = [
+            np.linalg.norm(matrix - old_matrix) / np.linalg.norm(old_matrix)
+            for _, old_matrix, _ in history
+            if old_matrix.shape == matrix.shape and np.linalg.norm(old_matrix) > 0
+        ]
+        if not drifts:
+            return None
+        return float(max(drifts))
+
+    def getFilePath(self) -> str:
+        return self.file_path
+
+
+def relativeDifference(value: float, reference: float) -> float:
+    if reference == 0:
+        return 0.0 if value == 0 else float("inf")
+    return abs(value - reference) / abs(reference)
+
+
+def openCalibrationHistory(file_path: str) -> CalibrationHistory:
+    try:
+        return CalibrationHistory(file_path)
+    except sqlite3.Error as e:
+        logger.error(f"Could not open calibration history {file_path}: {e}")
+        return None
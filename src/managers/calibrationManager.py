@@ -1,20 +1,46 @@
 # -*- coding: utf-8 -*-
 
 import os
+import multiprocessing
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
 import numpy as np
 import pandas as pd
 from datetime import datetime
-from sklearn.linear_model import LinearRegression
-from scipy.linalg import lstsq
 
 from src.managers.sensorManager import SensorManager
 from src.managers.fileManager import FileManager
+from src.managers.calibrationBundle import (
+    CalibrationBundleWriter,
+    loadCalibrationBundle,
+)
+from src.managers.calibrationSolver import (
+    COVARIANCE_SCALE,
+    IncrementalLeastSquares,
+    buildPlatformForces,
+    getPlatformSensorIndex,
+    solveLeastSquares,
+)
 from src.enums.sensorStatus import SStatus
 from src.handlers import SensorGroup, Sensor
 
 from loguru import logger
 
 
+# Measurements converge when the SEM of every sensor, in calibrated units,
+# is below the threshold with at least min_samples values.
+def sensorsConverged(
+    sensors: list[Sensor], sem_threshold: float, min_samples: int
+) -> bool:
+    for sensor in sensors:
+        stats = sensor.getRunningStats()
+        if stats is None or stats.getCount() < max(min_samples, 2):
+            return False
+        if stats.getSem() * abs(sensor.getSlope()) > sem_threshold:
+            return False
+    return True
+
+
 class SensorCalibrationManager:
     def __init__(self) -> None:
         # Sensors
@@ -23,13 +49,18 @@ class SensorCalibrationManager:
         # Calib params
         self.record_interval_ms: int
         self.record_amount: int
+        self.convergence: bool = False
+        self.sem_threshold: float = 0
+        self.max_time_ms: int = 0
+        self.min_samples: int = 0
         # Calib measurements
         self.measurement_ready: bool = False
         self.use_ref_sensor: bool = False
         self.ref_value: float
         df_cols = ["ref_value", "sensor_mean", "sensor_std", "data_amount"]
         self.measurements_df = pd.DataFrame(columns=df_cols)
-        # Calib results
+        # Calib results, updated with every added or removed measurement
+        self.solver = IncrementalLeastSquares(1, fit_intercept=True)
         self.sensor_slope: float = 1
         self.sensor_intercept: float = 0
         self.calib_score: float = 1
@@ -68,13 +99,25 @@ class SensorCalibrationManager:
             logger.warning("No value provided! Measurement ignored")
             return
         if use_ref_sensor and self.ref_sensor.getStatus() == SStatus.AVAILABLE:
+            self.setMeasurementMode(self.ref_sensor, True)
             self.ref_sensor.clearValues()
             self.ref_sensor.connect()
             self.use_ref_sensor = True
+        self.setMeasurementMode(self.sensor, True)
         self.sensor.clearValues()
         self.sensor.connect()
         self.measurement_ready = True
 
+    def getMeasurementSensors(self) -> list[Sensor]:
+        if self.use_ref_sensor:
+            return [self.sensor, self.ref_sensor]
+        return [self.sensor]
+
+    def setMeasurementMode(self, sensor: Sensor, measuring: bool) -> None:
+        # Only the running mean and std are needed, raw values are not kept
+        sensor.setTrackStats(measuring)
+        sensor.setRetainValues(not measuring)
+
     def registerValue(self) -> None:
         if not self.measurement_ready:
             return
@@ -89,32 +132,45 @@ class SensorCalibrationManager:
             self.ref_sensor.disconnect()
         self.sensor.disconnect()
         self.saveMeasurement()
+        if self.use_ref_sensor:
+            self.setMeasurementMode(self.ref_sensor, False)
+        self.setMeasurementMode(self.sensor, False)
 
     # Data management
 
-    def getCalibratedValues(self, sensor: Sensor) -> list[float]:
-        slope = sensor.getSlope()
-        intercept = sensor.getIntercept()
-        return [value * slope + intercept for value in sensor.getValues()]
+    def getCalibratedMean(self, sensor: Sensor) -> float:
+        # Calibration is linear, so the calibrated mean is the calibrated raw mean
+        return (
+            sensor.getRunningStats().getMean() * sensor.getSlope()
+            + sensor.getIntercept()
+        )
 
     def saveMeasurement(self) -> None:
         if self.use_ref_sensor:
-            ref_values = self.getCalibratedValues(self.ref_sensor)
-            self.ref_value = np.mean(ref_values)
+            self.ref_value = self.getCalibratedMean(self.ref_sensor)
         if not self.ref_value:
             return
-        sensor_values = self.sensor.getValues()
-        sensor_mean = np.mean(sensor_values)
-        sensor_std = np.std(sensor_values)
-        new_measurement = [self.ref_value, sensor_mean, sensor_std, len(sensor_values)]
+        sensor_stats = self.sensor.getRunningStats()
+        new_measurement = [
+            self.ref_value,
+            sensor_stats.getMean(),
+            sensor_stats.getStd(),
+            sensor_stats.getCount(),
+        ]
         self.measurements_df.loc[len(self.measurements_df)] = new_measurement
+        self.solver.add(sensor_stats.getMean(), self.ref_value)
 
     def removeMeasurement(self, index: int) -> None:
-        self.measurements_df.drop(index=index, inplace=True)
+        measurement = self.measurements_df.iloc[index]
+        self.solver.remove(measurement["sensor_mean"], measurement["ref_value"])
+        self.measurements_df.drop(index=self.measurements_df.index[index], inplace=True)
+        self.measurements_df.reset_index(drop=True, inplace=True)
 
     def saveResults(self, sensor_manager: SensorManager) -> None:
-        sensor_manager.setSensorSlope(self.sensor, self.sensor_slope)
-        sensor_manager.setSensorIntercept(self.sensor, self.sensor_intercept)
+        with sensor_manager.configBatch():
+            sensor_manager.setSensorSlope(self.sensor, self.sensor_slope)
+            sensor_manager.setSensorIntercept(self.sensor, self.sensor_intercept)
+        sensor_manager.recordSensorCalibration(self.sensor, "sensor_calibration")
         logger.info(
             f"Saved sensor {self.sensor.getName()} "
             + f"slope: {self.sensor.getSlope():.4f}; intercept: {self.sensor.getIntercept():.4f}"
@@ -122,6 +178,7 @@ class SensorCalibrationManager:
 
     def clearValues(self) -> None:
         self.measurements_df.drop(self.measurements_df.index, inplace=True)
+        self.solver.clear()
         self.sensor_slope: float = 1
         self.sensor_intercept: float = 0
         self.calib_score: float = 1
@@ -136,19 +193,38 @@ class SensorCalibrationManager:
     def getRecordInterval(self) -> int:
         return self.record_interval_ms
 
+    def setConvergence(
+        self,
+        enabled: bool,
+        sem_threshold: float = 0.05,
+        max_time_ms: int = 10000,
+        min_samples: int = 100,
+    ) -> None:
+        self.convergence = enabled
+        self.sem_threshold = sem_threshold
+        self.max_time_ms = max_time_ms
+        self.min_samples = min_samples
+
+    def isConverged(self) -> bool:
+        if not self.convergence or not self.measurement_ready:
+            return False
+        return sensorsConverged(
+            self.getMeasurementSensors(), self.sem_threshold, self.min_samples
+        )
+
     def getRecordDuration(self) -> int:
+        if self.convergence:
+            return self.max_time_ms
         return int(self.record_interval_ms * self.record_amount)
 
     def getLastValues(self) -> list:
         return self.measurements_df.iloc[-1].tolist()
 
     def getResults(self) -> list[float]:
-        features = self.measurements_df["sensor_mean"].to_numpy().reshape(-1, 1)
-        targets = self.measurements_df["ref_value"].to_numpy().reshape(-1, 1)
-        model = LinearRegression().fit(features, targets)
-        self.sensor_slope = float(model.coef_[0])
-        self.sensor_intercept = float(model.intercept_)
-        self.calib_score = model.score(features, targets)
+        coefficients = self.solver.getCoefficients()
+        self.sensor_slope = float(coefficients[0, 0])
+        self.sensor_intercept = float(coefficients[1, 0])
+        self.calib_score = float(self.solver.getScore()[0])
         return [self.sensor_slope, self.sensor_intercept, self.calib_score]
 
     # Plot data arrays
@@ -177,10 +253,15 @@ class PlatformCalibrationManager:
         # Calib params
         self.record_interval_ms: int
         self.record_amount: int
+        self.convergence: bool = False
+        self.sem_threshold: float = 0
+        self.max_time_ms: int = 0
+        self.min_samples: int = 0
         # Calib measurements
         self.measurement_ready: bool = False
         self.use_ref_sensor: bool = False
         self.ref_value: float
+        self.keep_raw_values: bool = True
         self.df_distance_cols = ["l_x", "l_y", "l_z"]
         df_triaxial_cols = ["V_fx", "V_fy", "V_fz"]
         df_platform_cols = [
@@ -209,11 +290,17 @@ class PlatformCalibrationManager:
         self.measurement_std_df = pd.DataFrame(
             columns=self.df_triaxial_cols_std + self.df_platform_cols_std
         )
-        # Calib results
+        # Calib results, updated with every added or removed measurement
+        self.solver = IncrementalLeastSquares(12, 6)
+        self.measurement_forces: list[np.ndarray] = []
         self.calibration_matrix = None
         self.std_dev_matrix = None
-        # File manager
+        # File manager and calibration bundle, with an id per hold and saved results
         self.file_mngr: FileManager
+        self.bundle_writer: CalibrationBundleWriter = None
+        self.hold_ids: list[int] = []
+        self.hold_count: int = 0
+        self.results_count: int = 0
 
     def setup(
         self,
@@ -221,8 +308,10 @@ class PlatformCalibrationManager:
         ref_sensor: list[Sensor],
         record_interval_ms: int = 10,
         record_amount: int = 300,
+        keep_raw_values: bool = True,
     ) -> None:
         self.platform_group = platform_group
+        self.keep_raw_values = keep_raw_values
         self.ref_sensor = ref_sensor
         # TODO Meaning of this check?
         # self.platform_group.checkConnections()
@@ -247,15 +336,39 @@ class PlatformCalibrationManager:
                 f"Could not create folder with name {folder_name} in {self.file_mngr.getFilePath()}"
             )
         self.file_mngr.setFilePath(folder_path)
+        self.closeBundle()
+        self.bundle_writer = CalibrationBundleWriter(
+            os.path.join(folder_path, "calibration_bundle.npz")
+        )
+        self.hold_count = 0
+        self.results_count = 0
+
+    def closeBundle(self) -> None:
+        if self.bundle_writer is not None:
+            self.bundle_writer.close()
+            self.bundle_writer = None
 
     # Calibration measurements
 
+    # Reference and group steps are split, so several platforms can share
+    # the reference reads of a hold
     def startMeasurement(self, distances: list[int]) -> None:
+        self.startRefMeasurement()
+        self.startGroupMeasurement(distances)
+
+    def startRefMeasurement(self) -> None:
+        [self.setMeasurementMode(sensor, True) for sensor in self.ref_sensor]
+        [sensor.clearValues() for sensor in self.ref_sensor]
+        [sensor.connect() for sensor in self.ref_sensor]
+
+    def startGroupMeasurement(self, distances: list[int]) -> None:
         self.measurement_ready = False
+        [
+            self.setMeasurementMode(sensor, True)
+            for sensor in self.platform_group.getSensors().values()
+        ]
         self.platform_group.clearValues()
-        [sensor.clearValues() for sensor in self.ref_sensor]
         self.platform_group.start()
-        [sensor.connect() for sensor in self.ref_sensor]
         self.measurement_ready = True
         logger.debug(f"Starting measurement...")
         self.measurement_distances_df.loc[len(self.measurement_distances_df)] = (
@@ -265,30 +378,52 @@ class PlatformCalibrationManager:
     def registerValue(self) -> None:
         if not self.measurement_ready:
             return
-        self.platform_group.register()
+        self.registerGroupValue()
         [sensor.registerValue() for sensor in self.ref_sensor]
 
+    def registerGroupValue(self) -> None:
+        if not self.measurement_ready:
+            return
+        self.platform_group.register()
+
     def stopMeasurement(self) -> None:
         if not self.measurement_ready:
             return
-        self.platform_group.stop()
         [sensor.disconnect() for sensor in self.ref_sensor]
+        self.stopGroupMeasurement()
+        [self.setMeasurementMode(sensor, False) for sensor in self.ref_sensor]
+
+    def stopGroupMeasurement(self) -> None:
+        # Reference sensors must be stopped, but still measuring
+        if not self.measurement_ready:
+            return
+        self.platform_group.stop()
         self.saveMeasurement()
+        [
+            self.setMeasurementMode(sensor, False)
+            for sensor in self.platform_group.getSensors().values()
+        ]
+
+    def setMeasurementMode(self, sensor: Sensor, measuring: bool) -> None:
+        # Raw values are only kept when they are saved in the calibration folder
+        sensor.setTrackStats(measuring)
+        sensor.setRetainValues(not measuring or self.keep_raw_values)
 
     # Data management
 
+    def getSensors(self) -> list[Sensor]:
+        # Reference sensors first, then platform sensors
+        return self.ref_sensor + list(self.platform_group.getSensors().values())
+
+    def getMeasurementSensors(self) -> list[Sensor]:
+        return self.getSensors()
+
     def saveMeasurement(self) -> None:
-        df_raw: pd.DataFrame = pd.DataFrame()
         new_measurement_means = []
         new_measurement_stds = []
-        for sensor in self.ref_sensor:
-            new_measurement_means.append(np.mean(sensor.getValues()))
-            new_measurement_stds.append(np.std(sensor.getValues()))
-            df_raw[sensor.getName()] = sensor.getValues()
-        for sensor in self.platform_group.getSensors().values():
-            new_measurement_means.append(np.mean(sensor.getValues()))
-            new_measurement_stds.append(np.std(sensor.getValues()))
-            df_raw[sensor.getName()] = sensor.getValues()
+        for sensor in self.getSensors():
+            new_measurement_means.append(sensor.getRunningStats().getMean())
+            new_measurement_stds.append(sensor.getRunningStats().getStd())
         # Save means and stds data into dataframes, moving z axis data to end of list.
         self.measurement_mean_df.loc[len(self.measurement_mean_df)] = (
             new_measurement_means[:3]
@@ -302,59 +437,107 @@ class PlatformCalibrationManager:
         )
         logger.debug(self.measurement_mean_df)
         logger.debug(self.measurement_std_df)
-        # Save raw data in calibration folder
-        file_name = "_".join(
-            self.measurement_distances_df.iloc[-1].astype(str).tolist()
+        self.addSolverMeasurement(len(self.measurement_mean_df) - 1)
+        self.saveBundleHold()
+
+    def saveBundleHold(self) -> None:
+        # Hold entries are written in the background, the next measurement
+        # can start right away
+        hold_id = self.hold_count
+        self.hold_count += 1
+        self.hold_ids.append(hold_id)
+        if self.bundle_writer is None:
+            return
+        hold = f"holds/{hold_id}/"
+        arrays = {
+            hold + "distances": self.measurement_distances_df.iloc[-1].to_numpy(float),
+            hold + "means": self.measurement_mean_df.iloc[-1].to_numpy(float),
+            hold + "stds": self.measurement_std_df.iloc[-1].to_numpy(float),
+            hold + "forces": self.measurement_forces[-1],
+        }
+        if self.keep_raw_values:
+            if "sensor_names" not in self.bundle_writer.getEntries():
+                arrays["sensor_names"] = [
+                    sensor.getName() for sensor in self.getSensors()
+                ]
+            arrays[hold + "raw"] = np.array(
+                [sensor.getValues() for sensor in self.getSensors()], dtype=float
+            ).T
+        self.bundle_writer.write(arrays)
+
+    def addSolverMeasurement(self, index: int) -> None:
+        # Forces are kept with the ref slopes used, so removing gives the same rows
+        forces = buildPlatformForces(
+            self.measurement_mean_df[self.df_triaxial_cols_mean]
+            .iloc[[index]]
+            .to_numpy(float),
+            [sensor.getSlope() for sensor in self.ref_sensor],
+            self.measurement_distances_df[self.df_distance_cols]
+            .iloc[[index]]
+            .to_numpy(float),
+        )[0]
+        self.measurement_forces.append(forces)
+        self.solver.add(
+            self.measurement_mean_df[self.df_platform_cols_mean]
+            .iloc[index]
+            .to_numpy(float),
+            forces,
         )
-        self.file_mngr.setFileName(file_name)
-        self.file_mngr.saveDataToCSV(df_raw)
 
     def removeMeasurement(self, index: int) -> None:
-        self.measurement_distances_df.drop(index=index, inplace=True)
-        self.measurement_mean_df.drop(index=index, inplace=True)
-        self.measurement_std_df.drop(index=index, inplace=True)
+        self.solver.remove(
+            self.measurement_mean_df[self.df_platform_cols_mean]
+            .iloc[index]
+            .to_numpy(float),
+            self.measurement_forces.pop(index),
+        )
+        hold_id = self.hold_ids.pop(index)
+        if self.bundle_writer is not None:
+            self.bundle_writer.write({f"holds/{hold_id}/removed": True})
+        for df in [
+            self.measurement_distances_df,
+            self.measurement_mean_df,
+            self.measurement_std_df,
+        ]:
+            df.drop(index=df.index[index], inplace=True)
+            df.reset_index(drop=True, inplace=True)
 
     def saveResults(self, sensor_manager: SensorManager) -> None:
-        # Make copies to format and save
-        calib_matrix_df = self.calibration_matrix.copy(deep=True)
-        std_matrix_df = self.std_dev_matrix.copy(deep=True)
-        # First save results in csv files
-        self.file_mngr.setFileName("RESULTS_CALIBRATION_MATRIX")
-        self.file_mngr.saveDataToCSV(calib_matrix_df.map("{:.6e}".format))
-        self.file_mngr.setFileName("RESULTS_STDDEV_MATRIX")
-        self.file_mngr.saveDataToCSV(std_matrix_df.map("{:.6e}".format))
-        # Replace platform sensor slope values
-        for sensor in self.platform_group.getSensors().values():
-            name = sensor.getName()
-            index = None
-            map_indexes = {
-                "X_1": [0, 0],
-                "X_2": [0, 1],
-                "X_3": [0, 2],
-                "X_4": [0, 3],
-                "Y_1": [1, 4],
-                "Y_2": [1, 5],
-                "Y_3": [1, 6],
-                "Y_4": [1, 7],
-                "Z_1": [2, 8],
-                "Z_2": [2, 9],
-                "Z_3": [2, 10],
-                "Z_4": [2, 11],
-            }
-            for key in map_indexes:
-                if key in name:
-                    index = map_indexes[key]
-                    break
-            if index is None:
-                logger.error(
-                    f"Sensor {name} has not a valid format! Expected <XYZ>_<1234> in name"
-                )
-                continue
-            new_slope = float(self.calibration_matrix.iat[index[0], index[1]])
-            sensor_manager.setSensorSlope(sensor, abs(new_slope))
-            logger.info(
-                f"Saved sensor {sensor.getName()} slope: {sensor.getSlope():.4f}"
+        # First save results in the calibration bundle
+        if self.bundle_writer is not None:
+            results = f"results/{self.results_count}/"
+            self.bundle_writer.write(
+                {
+                    results + "calibration_matrix": self.calibration_matrix.to_numpy(),
+                    results + "std_dev_matrix": self.std_dev_matrix.to_numpy(),
+                    results + "holds": np.array(self.hold_ids, dtype=int),
+                }
             )
+            self.results_count += 1
+        # Save the full matrix for the platform transform, and the sensor
+        # slopes for single sensor plots
+        with sensor_manager.configBatch():
+            sensor_manager.setGroupCalibrationMatrix(
+                self.platform_group, self.calibration_matrix.to_numpy()
+            )
+            for sensor in self.platform_group.getSensors().values():
+                name = sensor.getName()
+                index = getPlatformSensorIndex(name)
+                if index is None:
+                    logger.error(
+                        f"Sensor {name} has not a valid format! Expected <XYZ>_<1234> in name"
+                    )
+                    continue
+                new_slope = float(self.calibration_matrix.iat[index // 4, index])
+                sensor_manager.setSensorSlope(sensor, abs(new_slope))
+                logger.info(
+                    f"Saved sensor {sensor.getName()} slope: {sensor.getSlope():.4f}"
+                )
+        sensor_manager.recordGroupCalibration(
+            self.platform_group,
+            self.std_dev_matrix.to_numpy(),
+            self.file_mngr.getFilePath(),
+        )
 
     def clearValues(self) -> None:
         self.measurement_distances_df.drop(
@@ -362,6 +545,48 @@ class PlatformCalibrationManager:
         )
         self.measurement_mean_df.drop(self.measurement_mean_df.index, inplace=True)
         self.measurement_std_df.drop(self.measurement_std_df.index, inplace=True)
+        self.measurement_forces.clear()
+        self.hold_ids.clear()
+        self.solver.clear()
+
+    def loadBundle(self, file_path: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+        # Restore the holds of a calibration bundle that were not removed,
+        # and solve them again with the saved platform forces
+        bundle = loadCalibrationBundle(file_path)
+        self.closeBundle()
+        self.clearValues()
+        hold_ids = sorted(
+            {int(name.split("/")[1]) for name in bundle if name.startswith("holds/")}
+        )
+        for hold_id in hold_ids:
+            hold = f"holds/{hold_id}/"
+            if hold + "removed" in bundle:
+                continue
+            self.measurement_distances_df.loc[len(self.measurement_distances_df)] = (
+                bundle[hold + "distances"]
+            )
+            self.measurement_mean_df.loc[len(self.measurement_mean_df)] = bundle[
+                hold + "means"
+            ]
+            self.measurement_std_df.loc[len(self.measurement_std_df)] = bundle[
+                hold + "stds"
+            ]
+            self.measurement_forces.append(bundle[hold + "forces"])
+            self.solver.add(
+                bundle[hold + "means"][len(self.df_triaxial_cols_mean) :],
+                bundle[hold + "forces"],
+            )
+            self.hold_ids.append(hold_id)
+        logger.info(f"Loaded {len(self.hold_ids)} holds from bundle {file_path}")
+        # New holds, removals and results are appended to the loaded bundle
+        self.file_mngr = FileManager()
+        self.file_mngr.setFilePath(os.path.dirname(file_path))
+        self.bundle_writer = CalibrationBundleWriter(file_path)
+        self.hold_count = max(hold_ids, default=-1) + 1
+        self.results_count = len(
+            {name.split("/")[1] for name in bundle if name.startswith("results/")}
+        )
+        return self.getResults()
 
     # Setters and getters
 
@@ -375,9 +600,33 @@ class PlatformCalibrationManager:
     def getRecordInterval(self) -> int:
         return self.record_interval_ms
 
+    def setConvergence(
+        self,
+        enabled: bool,
+        sem_threshold: float = 0.05,
+        max_time_ms: int = 10000,
+        min_samples: int = 100,
+    ) -> None:
+        self.convergence = enabled
+        self.sem_threshold = sem_threshold
+        self.max_time_ms = max_time_ms
+        self.min_samples = min_samples
+
+    def isConverged(self) -> bool:
+        if not self.convergence or not self.measurement_ready:
+            return False
+        return sensorsConverged(
+            self.getMeasurementSensors(), self.sem_threshold, self.min_samples
+        )
+
     def getRecordDuration(self) -> int:
+        if self.convergence:
+            return self.max_time_ms
         return int(self.record_interval_ms * self.record_amount)
 
+    def getPlatformName(self) -> str:
+        return self.platform_group.getName()
+
     def getLastValues(self) -> list[float]:
         distances_last_values = self.measurement_distances_df.iloc[-1].tolist()
         mean_last_values = (
@@ -386,62 +635,182 @@ class PlatformCalibrationManager:
         return distances_last_values + mean_last_values
 
     def getResults(self) -> tuple[pd.DataFrame, pd.DataFrame]:
-        force_ratio_x = self.ref_sensor[0].getSlope()
-        force_ratio_y = self.ref_sensor[1].getSlope()
-        force_ratio_z = self.ref_sensor[2].getSlope()
-        mean_values = self.measurement_mean_df
-        distance_values = self.measurement_distances_df
-
-        M = len(mean_values)
-        Zf = np.zeros((6 * M, 72))
-        f = np.zeros((6 * M, 1))
-        for i in range(M):
-            # Process data for M measurement
-            # Applied force in triaxial sensor
-            fpM = np.array(
-                [
-                    -mean_values.at[i, self.df_triaxial_cols_mean[1]] * force_ratio_y,
-                    -mean_values.at[i, self.df_triaxial_cols_mean[0]] * force_ratio_x,
-                    mean_values.at[i, self.df_triaxial_cols_mean[2]] * force_ratio_z,
-                ]
-            )
-            # Transform force to platform center (fM)
-            delta_x = distance_values.at[i, self.df_distance_cols[0]]
-            delta_y = distance_values.at[i, self.df_distance_cols[1]]
-            delta_z = distance_values.at[i, self.df_distance_cols[2]]
-            delta = np.array(
-                [[0, -delta_z, delta_y], [delta_z, 0, -delta_x], [-delta_y, delta_x, 0]]
-            )
-            fM = np.dot(np.vstack([np.eye(3), delta]), fpM)
-            # Define platform sensor values matrix
-            vfM = np.array(
-                [mean_values.at[i, col] for col in self.df_platform_cols_mean]
-            )
-            # Build A matrix
-            ZfM = np.kron(np.eye(6), vfM.T)
-            # Concatenate M matrixes into general matrixes.
-            row_start = i * 6
-            row_end = row_start + 6
-            Zf[row_start:row_end, :] = ZfM
-            f[row_start:row_end, :] = fM
-        # Apply least squares
-        x, residuals, rank, s = lstsq(Zf, f)
-        # Reshape calibration and deviation matrixes
-        logger.debug(f"X:\n {x}")
-        logger.debug(f"Residuals:\n {residuals}")
-        C = x.reshape(12, 6).T
+        logger.debug(f"Residuals:\n {self.solver.getResidualSumSquares()}")
+        return self.setSolution(*self.solver.solve())
+
+    def getSolverInputs(self) -> tuple[np.ndarray, np.ndarray]:
+        # Platform sensor means (M x 12) and platform forces (M x 6)
+        return self.solver.getArrays()
+
+    def setSolution(
+        self, coefficients: np.ndarray, variances: np.ndarray
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        # Rows are Fx, Fy, Fz, Mx, My, Mz and columns the platform sensors
+        return self.setResults(
+            coefficients.T,
+            np.tile(np.sqrt(COVARIANCE_SCALE * variances), (6, 1)),
+        )
+
+    def setResults(
+        self, C: np.ndarray, std_devs: np.ndarray
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
         logger.debug(f"Calibration matrix:\n {C}")
-        covariance_matrix = 25 * np.linalg.inv(np.dot(Zf.T, Zf))
-        diagonal_covariance = np.diag(covariance_matrix)
-        if np.isnan(diagonal_covariance).any():
+        if np.isnan(std_devs).any():
             logger.error("Covariance matrix diagonal has NaN values!")
-            logger.debug(diagonal_covariance)
-        if np.any(diagonal_covariance < 0):
-            logger.error("Covariance matrix diagonal has negative values!")
-            logger.debug(diagonal_covariance)
-        std_devs = np.sqrt(diagonal_covariance).reshape(12, 6).T
         logger.debug(f"STD_DEVS:\n {std_devs}")
         # Save matrixes in dataframes
         self.calibration_matrix = pd.DataFrame(C)
         self.std_dev_matrix = pd.DataFrame(std_devs)
         return (self.calibration_matrix, self.std_dev_matrix)
+
+
+class MultiPlatformCalibrationManager:
+    # Calibrates several platforms with the same holds. Reference sensors are read
+    # once per tick and every platform matrix is solved in its own process.
+    def __init__(self) -> None:
+        self.calib_mngrs: list[PlatformCalibrationManager] = []
+        self.ref_sensor: list[Sensor] = []
+        self.measurement_ready: bool = False
+        self.executor: concurrent.futures.ProcessPoolExecutor = None
+
+    def setup(
+        self,
+        platform_groups: list[SensorGroup],
+        ref_sensor: list[Sensor],
+        record_interval_ms: int = 10,
+        record_amount: int = 300,
+        keep_raw_values: bool = True,
+    ) -> None:
+        self.ref_sensor = ref_sensor
+        self.calib_mngrs = []
+        for platform_group in platform_groups:
+            calib_mngr = PlatformCalibrationManager()
+            calib_mngr.setup(
+                platform_group,
+                ref_sensor,
+                record_interval_ms,
+                record_amount,
+                keep_raw_values,
+            )
+            self.calib_mngrs.append(calib_mngr)
+
+    def setupFileManager(self) -> None:
+        [calib_mngr.setupFileManager() for calib_mngr in self.calib_mngrs]
+
+    # Calibration measurements
+
+    def startMeasurement(self, distances: list[int]) -> None:
+        self.measurement_ready = False
+        self.calib_mngrs[0].startRefMeasurement()
+        for calib_mngr in self.calib_mngrs:
+            calib_mngr.startGroupMeasurement(distances)
+        self.measurement_ready = True
+
+    def registerValue(self) -> None:
+        if not self.measurement_ready:
+            return
+        [calib_mngr.registerGroupValue() for calib_mngr in self.calib_mngrs]
+        [sensor.registerValue() for sensor in self.ref_sensor]
+
+    def stopMeasurement(self) -> None:
+        if not self.measurement_ready:
+            return
+        [sensor.disconnect() for sensor in self.ref_sensor]
+        [calib_mngr.stopGroupMeasurement() for calib_mngr in self.calib_mngrs]
+        [
+            self.calib_mngrs[0].setMeasurementMode(sensor, False)
+            for sensor in self.ref_sensor
+        ]
+        self.measurement_ready = False
+
+    # Data management
+
+    def getMeasurementSensors(self) -> list[Sensor]:
+        sensors = list(self.ref_sensor)
+        for calib_mngr in self.calib_mngrs:
+            sensors += list(calib_mngr.platform_group.getSensors().values())
+        return sensors
+
+    def removeMeasurement(self, index: int) -> None:
+        [calib_mngr.removeMeasurement(index) for calib_mngr in self.calib_mngrs]
+
+    def saveResults(self, sensor_manager: SensorManager) -> None:
+        with sensor_manager.configBatch():
+            for calib_mngr in self.calib_mngrs:
+                calib_mngr.saveResults(sensor_manager)
+
+    def clearValues(self) -> None:
+        [calib_mngr.clearValues() for calib_mngr in self.calib_mngrs]
+        self.shutdownExecutor()
+
+    def closeBundle(self) -> None:
+        [calib_mngr.closeBundle() for calib_mngr in self.calib_mngrs]
+
+    # Setters and getters
+
+    def refSensorConnected(self) -> bool:
+        return bool(self.calib_mngrs) and self.calib_mngrs[0].refSensorConnected()
+
+    def getRecordInterval(self) -> int:
+        return self.calib_mngrs[0].getRecordInterval()
+
+    def setConvergence(
+        self,
+        enabled: bool,
+        sem_threshold: float = 0.05,
+        max_time_ms: int = 10000,
+        min_samples: int = 100,
+    ) -> None:
+        for calib_mngr in self.calib_mngrs:
+            calib_mngr.setConvergence(enabled, sem_threshold, max_time_ms, min_samples)
+
+    def isConverged(self) -> bool:
+        if not self.measurement_ready:
+            return False
+        calib_mngr = self.calib_mngrs[0]
+        if not calib_mngr.convergence:
+            return False
+        return sensorsConverged(
+            self.getMeasurementSensors(),
+            calib_mngr.sem_threshold,
+            calib_mngr.min_samples,
+        )
+
+    def getRecordDuration(self) -> int:
+        return self.calib_mngrs[0].getRecordDuration()
+
+    def getPlatformNames(self) -> list[str]:
+        return [calib_mngr.getPlatformName() for calib_mngr in self.calib_mngrs]
+
+    def getLastValues(self) -> list[float]:
+        # Distances and reference means are the same for every platform
+        return self.calib_mngrs[0].getLastValues()
+
+    def getResults(self) -> dict[str, tuple[pd.DataFrame, pd.DataFrame]]:
+        # Same solver as single platform calibrations, one process per platform
+        inputs = [calib_mngr.getSolverInputs() for calib_mngr in self.calib_mngrs]
+        try:
+            if self.executor is None:
+                # Spawned, as forking copies the Qt and sensor threads
+                self.executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=len(self.calib_mngrs),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            futures = [
+                self.executor.submit(solveLeastSquares, *solver_inputs)
+                for solver_inputs in inputs
+            ]
+            solutions = [future.result() for future in futures]
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"Could not solve platforms in parallel, solving here: {e}")
+            self.shutdownExecutor()
+            solutions = [calib_mngr.solver.solve() for calib_mngr in self.calib_mngrs]
+        results: dict[str, tuple[pd.DataFrame, pd.DataFrame]] = {}
+        for calib_mngr, solution in zip(self.calib_mngrs, solutions):
+            results[calib_mngr.getPlatformName()] = calib_mngr.setSolution(*solution)
+        return results
+
+    def shutdownExecutor(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
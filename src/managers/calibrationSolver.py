@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+# Force and moment components solved per platform calibration
+PLATFORM_COMPONENTS = 6
+PLATFORM_SENSORS = 12
+# Scale applied to the covariance diagonal of the calibration parameters
+COVARIANCE_SCALE = 25
+# Platform sensor name keys, in calibration matrix column order
+PLATFORM_SENSOR_KEYS = [
+    "X_1",
+    "X_2",
+    "X_3",
+    "X_4",
+    "Y_1",
+    "Y_2",
+    "Y_3",
+    "Y_4",
+    "Z_1",
+    "Z_2",
+    "Z_3",
+    "Z_4",
+]
+
+
+# Calibration matrix column of a platform sensor, None if not recognized
+def getPlatformSensorIndex(sensor_name: str) -> int | None:
+    for index, key in enumerate(PLATFORM_SENSOR_KEYS):
+        if key in sensor_name:
+            return index
+    return None
+
+
+# Platform center forces and moments for every measurement.
+# triaxial_values (M x 3) are the mean X, Y, Z triaxial readings,
+# force_ratios the X, Y, Z triaxial slopes and distances (M x 3) the lever arms.
+def buildPlatformForces(
+    triaxial_values: np.ndarray, force_ratios: np.ndarray, distances: np.ndarray
+) -> np.ndarray:
+    triaxial_values = np.asarray(triaxial_values, dtype=float)
+    force_ratios = np.asarray(force_ratios, dtype=float)
+    distances = np.asarray(distances, dtype=float)
+    # Triaxial sensor axes are rotated respect to the platform axes
+    forces = np.column_stack(
+        [
+            -triaxial_values[:, 1] * force_ratios[1],
+            -triaxial_values[:, 0] * force_ratios[0],
+            triaxial_values[:, 2] * force_ratios[2],
+        ]
+    )
+    # Skew-symmetric lever arm product, same as [l]x @ f
+    moments = np.cross(distances, forces)
+    return np.hstack([forces, moments])
+
+
+# Least squares of several targets sharing the features matrix (M x params).
+# Returns the coefficients (params x targets) and the diagonal of inv(V^T V),
+# NaN for parameters that are not identifiable.
+def solveLeastSquares(
+    features: np.ndarray, targets: np.ndarray, rcond: float = None
+) -> tuple[np.ndarray, np.ndarray]:
+    features = np.asarray(features, dtype=float)
+    targets = np.asarray(targets, dtype=float)
+    # One SVD for all targets, singular values below the cutoff are dropped
+    u, s, vt = np.linalg.svd(features, full_matrices=False)
+    if rcond is None:
+        rcond = np.finfo(float).eps * max(features.shape)
+    keep = s > rcond * s[0]
+    s_inv = np.zeros_like(s)
+    s_inv[keep] = 1 / s[keep]
+    coefficients = vt.T @ (s_inv[:, None] * (u.T @ targets))
+    # inv(V^T V) = W S^-2 W^T, only its diagonal is needed
+    variances = np.sum((vt.T * s_inv) ** 2, axis=1)
+    # Parameters in the dropped directions are not identifiable
+    identifiable = np.sum(vt[keep] ** 2, axis=0) > 1 - np.sqrt(rcond)
+    variances[~identifiable] = np.nan
+    return coefficients, variances
+
+
+# Solve the platform calibration as six regressions sharing the sensor matrix.
+# sensor_values (M x 12) are the mean platform readings and
+# forces (M x 6) the platform center targets from buildPlatformForces.
+# Returns the 72 parameters and their std devs, ordered as the dense
+# kron(eye(6), v) system: component k and sensor j at index k * 12 + j.
+def solvePlatformCalibration(
+    sensor_values: np.ndarray, forces: np.ndarray, rcond: float = None
+) -> tuple[np.ndarray, np.ndarray]:
+    forces = np.asarray(forces, dtype=float)
+    coefficients, variances = solveLeastSquares(sensor_values, forces, rcond)
+    x = coefficients.T.reshape(-1, 1)
+    std_devs = np.tile(np.sqrt(COVARIANCE_SCALE * variances), forces.shape[1])
+    return x, std_devs
+
+
+class IncrementalLeastSquares:
+    # Least squares of the kept measurement rows, so measurements can be added
+    # and removed. Every solve is a SVD of the rows, as the normal equations
+    # square the condition number. Targets share the same features.
+    def __init__(
+        self, n_features: int, n_targets: int = 1, fit_intercept: bool = False
+    ) -> None:
+        self.fit_intercept = fit_intercept
+        self.n_params = n_features + int(fit_intercept)
+        self.n_targets = n_targets
+        self.clear()
+
+    def clear(self) -> None:
+        self.features: list[np.ndarray] = []
+        self.targets: list[np.ndarray] = []
+        self.solution: tuple[np.ndarray, np.ndarray] = None
+
+    def add(self, features, targets) -> None:
+        features, targets = self.asRow(features, targets)
+        self.features.append(features)
+        self.targets.append(targets)
+        self.solution = None
+
+    def remove(self, features, targets) -> None:
+        # Last row with the same values, as given when added
+        features, targets = self.asRow(features, targets)
+        for index in reversed(range(len(self.features))):
+            if np.array_equal(self.features[index], features) and np.array_equal(
+                self.targets[index], targets
+            ):
+                del self.features[index]
+                del self.targets[index]
+                self.solution = None
+                return
+        raise ValueError("Measurement to remove not found")
+
+    def asRow(self, features, targets) -> tuple[np.ndarray, np.ndarray]:
+        features = np.asarray(features, dtype=float).reshape(-1)
+        targets = np.asarray(targets, dtype=float).reshape(-1)
+        if self.fit_intercept:
+            features = np.append(features, 1)
+        return features, targets
+
+    def getArrays(self) -> tuple[np.ndarray, np.ndarray]:
+        # Features (M x params) and targets (M x targets) of the kept rows
+        return (
+            np.array(self.features, dtype=float).reshape(-1, self.n_params),
+            np.array(self.targets, dtype=float).reshape(-1, self.n_targets),
+        )
+
+    def solve(self, rcond: float = None) -> tuple[np.ndarray, np.ndarray]:
+        # Coefficients (params x targets) and diagonal of inv(V^T V)
+        if self.solution is not None and rcond is None:
+            return self.solution
+        if self.getCount() == 0:
+            return (
+                np.zeros((self.n_params, self.n_targets)),
+                np.full(self.n_params, np.nan),
+            )
+        solution = solveLeastSquares(*self.getArrays(), rcond)
+        if rcond is None:
+            self.solution = solution
+        return solution
+
+    def getCount(self) -> int:
+        return len(self.features)
+
+    def getCoefficients(self) -> np.ndarray:
+        return self.solve()[0]
+
+    def getVariances(self) -> np.ndarray:
+        return self.solve()[1]
+
+    def getResidualSumSquares(self) -> np.ndarray:
+        features, targets = self.getArrays()
+        residuals = targets - features @ self.getCoefficients()
+        return np.sum(residuals**2, axis=0)
+
+    def getScore(self) -> np.ndarray:
+        # Coefficient of determination of every target
+        if self.getCount() == 0:
+            return np.full(self.n_targets, np.nan)
+        targets = self.getArrays()[1]
+        total = np.sum((targets - targets.mean(axis=0)) ** 2, axis=0)
+        residuals = self.getResidualSumSquares()
+        perfect = np.isclose(total, 0)
+        score = 1 - residuals / np.where(perfect, 1, total)
+        score[perfect] = np.where(np.isclose(residuals[perfect], 0), 1.0, 0.0)
+        return score
@@ -3,6 +3,7 @@
 from loguru import logger
 from src.handlers import drivers
 from src.enums.configPaths import ConfigPaths as CfgPaths
+from src.managers.configManager import diffConfigSections
 from src.enums.sensorParams import SParams
 from src.enums.cameraParams import CParams
 from src.enums.sensorTypes import STypes
@@ -28,14 +29,42 @@ class CameraManager:
     def __init__(self) -> None:
         self.config_mngr: ConfigYAMLHandler
         self.camera_threads: list[CameraRecordThread] = []
+        self.config_cameras: dict = {}
 
     def setup(self, config_manager: ConfigYAMLHandler) -> None:
         self.config_mngr = config_manager
-        config_cameras = self.config_mngr.getConfigValue(
+        self.config_cameras = self.config_mngr.getConfigValue(
             CfgPaths.CAMERA_SECTION.value, {}
         )
         self.clearThreads()
-        self.loadCameras(config_cameras)
+        self.loadCameras(self.config_cameras)
+
+    def reload(self, config_manager: ConfigYAMLHandler) -> None:
+        # Keep the camera threads of unchanged cameras
+        old_cameras = self.config_cameras
+        self.config_mngr = config_manager
+        self.config_cameras = self.config_mngr.getConfigValue(
+            CfgPaths.CAMERA_SECTION.value, {}
+        )
+        _, _, changed = diffConfigSections(old_cameras, self.config_cameras)
+        old_threads = {
+            thread.getCamera().getID(): thread for thread in self.camera_threads
+        }
+        new_threads: list[CameraRecordThread] = []
+        for camera_id in self.config_cameras or {}:
+            thread = old_threads.pop(camera_id, None)
+            if thread is not None and camera_id not in changed:
+                new_threads.append(thread)
+                continue
+            if thread is not None and thread.isRunning():
+                thread.stop()
+            camera = self.loadCamera(camera_id, self.config_cameras[camera_id])
+            if camera is not None:
+                new_threads.append(CameraRecordThread(camera))
+        for thread in old_threads.values():
+            if thread.isRunning():
+                thread.stop()
+        self.camera_threads[:] = new_threads
 
     def loadCameras(self, contents: dict) -> None:
         if not contents:
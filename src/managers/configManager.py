@@ -1,10 +1,40 @@
 # -*- coding: utf-8 -*-
 
 import os
+import stat
 import yaml
+import tempfile
+import threading
+import functools
+from contextlib import contextmanager
 from loguru import logger
 from src.enums.configPaths import ConfigPaths
 
+# Sentinel for key paths that are not in the config
+_missing = object()
+
+
+@functools.lru_cache(maxsize=None)
+def splitKeyPath(key_path: str) -> tuple[str, ...]:
+    return tuple(key_path.split("."))
+
+
+# Compare two config sections by entry id.
+# Returns the added, removed and changed ids. Unchanged entries are not listed.
+def diffConfigSections(
+    old_section: dict, new_section: dict
+) -> tuple[list[str], list[str], list[str]]:
+    old_section = old_section or {}
+    new_section = new_section or {}
+    added = [id for id in new_section if id not in old_section]
+    removed = [id for id in old_section if id not in new_section]
+    changed = [
+        id
+        for id in new_section
+        if id in old_section and new_section[id] != old_section[id]
+    ]
+    return added, removed, changed
+
 
 class ConfigManager:
     def __init__(self) -> None:
@@ -13,9 +43,21 @@ class ConfigManager:
         )
         self.selected_config_path = self.default_config_path
 
+        # Saves are skipped inside batches and delayed by save_delay_s (0 is no delay)
+        self.dirty: bool = False
+        self.batch_depth: int = 0
+        self.save_delay_s: float = 0
+        self.save_timer: threading.Timer = None
+        self.lock = threading.RLock()
+        # Bumped on every load or change, resolved values are cached per version
+        self.version: int = 0
+        self.value_cache: dict[str, object] = {}
+
         self.loadConfigFile(self.selected_config_path)
 
     def loadConfigFile(self, file_path) -> None:
+        # Pending changes belong to the current file
+        self.flush()
         if not os.path.exists(file_path):
             logger.warning(f"Could not find custom config file: {file_path}.")
             return
@@ -42,33 +84,111 @@ class ConfigManager:
         self.loadConfig(self.default_config_path)
         self.selected_config_path = self.default_config_path
         self.setConfigValue(ConfigPaths.CUSTOM_CONFIG_PATH.value, str(file_path))
+        # Delayed saves would write the custom config instead
+        self.flush()
         self.loadConfig(file_path)
         self.selected_config_path = file_path
 
     def loadConfig(self, path) -> None:
         with open(path, "r") as file:
             self.config_dict = yaml.load(file, Loader=yaml.FullLoader)
+        self.bumpVersion()
+
+    def bumpVersion(self) -> None:
+        self.version += 1
+        self.value_cache.clear()
 
     def saveConfig(self) -> None:
-        with open(self.selected_config_path, "w") as file:
-            yaml.dump(self.config_dict, file, sort_keys=False)
+        # Write a temp file next to the config and swap it in,
+        # so a crash mid-write never leaves a truncated config
+        config_dir = os.path.dirname(os.path.abspath(self.selected_config_path))
+        fd, temp_path = tempfile.mkstemp(suffix=".yaml.tmp", dir=config_dir)
+        try:
+            with os.fdopen(fd, "w") as file:
+                yaml.dump(self.config_dict, file, sort_keys=False)
+                file.flush()
+                os.fsync(file.fileno())
+            # Temp files are only readable by the owner, keep the config mode
+            if os.path.exists(self.selected_config_path):
+                os.chmod(
+                    temp_path,
+                    stat.S_IMODE(os.stat(self.selected_config_path).st_mode),
+                )
+            os.replace(temp_path, self.selected_config_path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+    # Save scheduling
+
+    @contextmanager
+    def batch(self):
+        with self.lock:
+            self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.batch_depth -= 1
+            self.requestSave()
+
+    def requestSave(self) -> None:
+        with self.lock:
+            if not self.dirty or self.batch_depth > 0:
+                return
+            if self.save_delay_s <= 0:
+                self.flush()
+                return
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+            self.save_timer = threading.Timer(self.save_delay_s, self.flush)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+
+    def flush(self) -> None:
+        with self.lock:
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+                self.save_timer = None
+            if not self.dirty:
+                return
+            self.saveConfig()
+            self.dirty = False
+
+    def setSaveDelay(self, delay_ms: int) -> None:
+        self.save_delay_s = delay_ms / 1000
 
     # Setters and getters
 
     def setConfigValue(self, key_path: str, value) -> None:
-        keys = key_path.split(".")
-        config = self.config_dict
-        for key in keys[:-1]:
-            config = config.get(key, {})
-        config[keys[-1]] = value
-        self.saveConfig()
+        keys = splitKeyPath(key_path)
+        with self.lock:
+            config = self.config_dict
+            for key in keys[:-1]:
+                config = config.get(key, {})
+            config[keys[-1]] = value
+            self.dirty = True
+            self.bumpVersion()
+        self.requestSave()
+
+    def isDirty(self) -> bool:
+        return self.dirty
 
     def getConfigValue(self, key_path: str, default_value=None):
-        keys = key_path.split(".")
-        config = self.config_dict
-        for key in keys[:-1]:
-            config = config.get(key, {})
-        return config.get(keys[-1], default_value)
+        value = self.value_cache.get(key_path, _missing)
+        if value is _missing:
+            keys = splitKeyPath(key_path)
+            config = self.config_dict
+            for key in keys[:-1]:
+                config = config.get(key, {})
+            value = config.get(keys[-1], _missing)
+            self.value_cache[key_path] = value
+        if value is _missing:
+            return default_value
+        return value
+
+    def getVersion(self) -> int:
+        return self.version
 
     def getCurrentFilePath(self):
         return self.selected_config_path
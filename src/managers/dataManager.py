@@ -11,7 +11,16 @@ from src.qtUIs.widgets.matplotlibWidgets import (
     PlotPlatformCOPWidget,
 )
 from src.managers.sensorManager import SensorManager
+from src.managers.profileManager import profiler
+from src.managers.sessionLoader import Session
+from src.managers.sampleStore import SampleStore, RAW, CALIBRATED, FILTERED
+from src.managers import arrowExport
+from src.managers.calibrationSolver import (
+    PLATFORM_SENSOR_KEYS,
+    getPlatformSensorIndex,
+)
 from src.handlers import SensorGroup, Sensor
+from src.handlers.valueBuffer import asFloatValues
 from src.enums.plotTypes import PlotTypes
 from src.enums.sensorTypes import SGTypes, STypes
 from src.enums.sensorStatus import SGStatus
@@ -21,13 +30,19 @@ from loguru import logger
 
 class DataManager:
     def __init__(self):
-        # Time
-        self.timestamp_list: list = []
-        self.timeincr_list: list = []
-        # Data
-        self.df_raw: pd.DataFrame = pd.DataFrame()
-        self.df_calibrated: pd.DataFrame = pd.DataFrame()
-        self.df_filtered: pd.DataFrame = pd.DataFrame()
+        # Time, as timestamps (ms) and seconds from the first one
+        self.timestamp_list: np.ndarray = np.empty(0, dtype=np.int64)
+        self.timeincr_list: np.ndarray = np.empty(0)
+        # Time ranges (s) already resolved to index pairs
+        self.range_indexes: dict[tuple[float, float], tuple[int, int]] = {}
+        # Data, raw values with calibrated and filtered values computed on request
+        self.store: SampleStore = SampleStore()
+        # False for sessions saved without raw values, their columns are calibrated
+        self.has_raw: bool = True
+        # Storage dtype of each raw column, to save sessions in the same dtypes
+        self.storage_dtypes: dict[str, np.dtype] = {}
+        # Last session shared with analysis processes
+        self.shared_table: arrowExport.SharedTable = None
         # Sensor header suffixes
         self.imu_ang_headers: list[str] = ["qx", "qy", "qz", "qw"]
         self.imu_vel_headers: list[str] = ["wx", "wy", "wz"]
@@ -47,141 +62,290 @@ class DataManager:
             "Z_3": 1,
             "Z_4": 1,
         }
+        # Platform dimensions (mm)
+        self.platform_lx: float = 508
+        self.platform_ly: float = 308
+        self.platform_h: float = 20
+        self.platform_components: list[str] = ["Fx", "Fy", "Fz", "Mx", "My", "Mz"]
+        # Platform group id -> tared raw block (N x 12) and calibration matrix (6 x 12)
+        self.platform_sensor_names: dict[str, list[str]] = {}
+        self.platform_raw: dict[str, np.ndarray] = {}
+        self.platform_filtered: dict[str, np.ndarray] = {}
+        self.platform_matrix: dict[str, np.ndarray] = {}
 
     def clearDataFrames(self) -> None:
-        self.df_raw: pd.DataFrame = pd.DataFrame()
-        self.df_calibrated: pd.DataFrame = pd.DataFrame()
-        self.df_filtered: pd.DataFrame = pd.DataFrame()
+        self.store.clear()
+        self.has_raw = True
+        self.storage_dtypes.clear()
+        self.platform_sensor_names.clear()
+        self.platform_raw.clear()
+        self.platform_filtered.clear()
+        self.platform_matrix.clear()
 
     # Data load methods
 
+    @profiler.track("data.load")
     def loadData(self, time_list: list, sensor_groups: list[SensorGroup]) -> None:
         self.clearDataFrames()
-        self.timestamp_list = time_list
-        self.timeincr_list = [(t - time_list[0]) / 1000 for t in time_list]
+        self.setTimes(time_list)
+        columns: list[str] = []
+        values: list = []
+        slopes: list[float] = []
+        intercepts: list[float] = []
+        loaded_groups: list[SensorGroup] = []
         for group in sensor_groups:
             if not group.getRead():
                 continue
             if group.getStatus() == SGStatus.ERROR:
                 continue
+            loaded_groups.append(group)
             for sensor in group.getSensors(only_available=True).values():
                 if sensor.getType() == STypes.SENSOR_IMU:
-                    values_list = self.getListedData(sensor)
-                    for i, suffix in enumerate(
+                    # No need to calibrate IMUs
+                    imu_headers = (
                         self.imu_ang_headers
                         + self.imu_vel_headers
                         + self.imu_acc_headers
-                    ):
-                        imu_name = sensor.getName() + "_" + suffix
-                        self.df_raw[imu_name] = values_list[i]
-                        # No need to calibrate IMUs
-                        self.df_calibrated[imu_name] = values_list[i]
+                    )
+                    imu_values = self.getListedData(sensor, len(imu_headers))
+                    for i, suffix in enumerate(imu_headers):
+                        columns.append(sensor.getName() + "_" + suffix)
+                        values.append(imu_values[:, i])
+                        slopes.append(1)
+                        intercepts.append(0)
                     continue
-                self.df_raw[sensor.getName()] = sensor.getValues()
-                slope = sensor.getSlope()
-                intercept = sensor.getIntercept()
-                self.df_calibrated[sensor.getName()] = [
-                    value * slope + intercept for value in sensor.getValues()
-                ]
+                columns.append(sensor.getName())
+                values.append(sensor.getValues())
+                slopes.append(sensor.getSlope())
+                intercepts.append(sensor.getIntercept())
+        self.setRawData(columns, values, slopes, intercepts)
+        for group in loaded_groups:
+            if group.getType() == SGTypes.GROUP_PLATFORM:
+                self.loadPlatformData(group)
+
+    @profiler.track("data.load_session")
+    def loadSession(self, session: Session, sensor_groups: list[SensorGroup]) -> None:
+        # Only the columns of the given sensor groups are read from the session
+        self.clearDataFrames()
+        columns: list[str] = []
+        for group in sensor_groups:
+            for sensor in group.getSensors().values():
+                if sensor.getType() == STypes.SENSOR_IMU:
+                    columns += [
+                        sensor.getName() + "_" + suffix
+                        for suffix in self.imu_ang_headers
+                        + self.imu_vel_headers
+                        + self.imu_acc_headers
+                    ]
+                    continue
+                columns.append(sensor.getName())
+        columns = [column for column in session.getColumns() if column in columns]
+        if not columns:
+            logger.warning(
+                f"No sensor of the config found in session {session.getPath()}."
+                + " Loading all its columns."
+            )
+            columns = session.getColumns()
+        # Raw values are calibrated with the sensor config. Sessions without raw
+        # values keep their calibrated ones, with unit gains.
+        self.has_raw = session.hasRaw()
+        slopes = {column: 1 for column in columns}
+        intercepts = {column: 0 for column in columns}
+        if self.has_raw:
+            for group in sensor_groups:
+                for sensor in group.getSensors().values():
+                    if sensor.getName() in slopes:
+                        slopes[sensor.getName()] = sensor.getSlope()
+                        intercepts[sensor.getName()] = sensor.getIntercept()
+        else:
+            logger.info(
+                f"Session {session.getPath()} has no raw values."
+                + " Loading its calibrated values."
+            )
+        data = session.getColumnsData(columns, raw=self.has_raw)
+        self.setTimes(session.getTimestamps())
+        self.setRawData(
+            columns,
+            [data[column] for column in columns],
+            [slopes[column] for column in columns],
+            [intercepts[column] for column in columns],
+        )
+        for group in sensor_groups:
+            if group.getType() == SGTypes.GROUP_PLATFORM:
+                self.loadPlatformData(group)
 
-    # Transforms values lists into separate variable lists.
-    # Ex: [ti [gx, gy, gz]] -> [gx[ti], gy[ti], gz[ti]]
-    def getListedData(self, sensor: Sensor) -> list[list[float]]:
-        main_list = sensor.getValues()
-        new_main_list: list[list[float]] = [[] for _ in range(len(main_list[0]))]
-        for value_list in main_list:
-            for i, value in enumerate(value_list):
-                new_main_list[i].append(value)
-        return new_main_list
+    def setRawData(
+        self,
+        columns: list[str],
+        values: list[np.ndarray],
+        slopes: list[float],
+        intercepts: list[float],
+    ) -> None:
+        # Values are kept in their storage dtype, integer ones are upcast to float64
+        self.storage_dtypes = {
+            column: np.asarray(column_values).dtype
+            for column, column_values in zip(columns, values)
+        }
+        self.store.setData(columns, values, slopes, intercepts)
+
+    def setCacheBudget(self, cache_budget_mb: float) -> None:
+        self.store.setCacheBudget(cache_budget_mb)
+
+    def setTimes(self, time_list: list) -> None:
+        self.timestamp_list = np.asarray(time_list, dtype=np.int64)
+        self.timeincr_list = np.empty(0)
+        if len(self.timestamp_list):
+            self.timeincr_list = (self.timestamp_list - self.timestamp_list[0]) / 1000
+        self.range_indexes.clear()
+
+    def loadPlatformData(self, group: SensorGroup) -> None:
+        # Tared raw values in calibration matrix column order, missing sensors are zero.
+        # Calibrated values (no raw data) are already scaled, so their gain is one.
+        raw_block = np.zeros((len(self.timestamp_list), len(PLATFORM_SENSOR_KEYS)))
+        slopes = np.zeros(len(PLATFORM_SENSOR_KEYS))
+        sensor_names: list[str] = []
+        for sensor in group.getSensors(
+            only_available=True, sensor_type=STypes.SENSOR_LOADCELL
+        ).values():
+            index = getPlatformSensorIndex(sensor.getName())
+            if not self.store.hasColumn(sensor.getName()):
+                continue
+            if index is None:
+                logger.warning(
+                    f"Could not recognize sensor {sensor.getName()}."
+                    + " Needs X_, Y_ or Z_ in name to be identified."
+                )
+                continue
+            sensor_names.append(sensor.getName())
+            if not self.has_raw:
+                slopes[index] = 1
+                raw_block[:, index] = self.store.getRaw(sensor.getName())
+                continue
+            slopes[index] = sensor.getSlope()
+            # Calibrated value is slope * (raw + intercept / slope)
+            offset = sensor.getIntercept() / slopes[index] if slopes[index] else 0
+            raw_block[:, index] = self.store.getRaw(sensor.getName()) + offset
+        matrix = group.getCalibrationMatrix()
+        if not self.has_raw:
+            if matrix is not None:
+                logger.warning(
+                    f"No raw values of platform {group.getName()}."
+                    + " Its calibration matrix is not applied."
+                )
+            matrix = self.getDefaultPlatformMatrix(slopes)
+        elif matrix is None:
+            matrix = self.getDefaultPlatformMatrix(slopes)
+        self.platform_sensor_names[group.getID()] = sensor_names
+        self.platform_raw[group.getID()] = raw_block
+        self.platform_matrix[group.getID()] = matrix
+
+    # Platform matrix from the sensor slopes and orientations, without cross-talk.
+    # Moments only come from the Z loadcells at the platform corners.
+    def getDefaultPlatformMatrix(self, slopes: np.ndarray) -> np.ndarray:
+        gains = slopes * np.array(
+            [self.forces_sign[key] for key in PLATFORM_SENSOR_KEYS]
+        )
+        matrix = np.zeros((len(self.platform_components), len(PLATFORM_SENSOR_KEYS)))
+        for axis in range(3):
+            matrix[axis, axis * 4 : axis * 4 + 4] = gains[axis * 4 : axis * 4 + 4]
+        matrix[3, 8:] = self.platform_ly / 2 * np.array([-1, -1, 1, 1]) * gains[8:]
+        matrix[4, 8:] = self.platform_lx / 2 * np.array([-1, 1, 1, -1]) * gains[8:]
+        return matrix
+
+    # Block with a column per variable of sensors with listed values.
+    # Ex: [ti [gx, gy, gz]] -> [ti, (gx, gy, gz)]. Detached values are NaN.
+    def getListedData(self, sensor: Sensor, size: int) -> np.ndarray:
+        values = sensor.getValues()
+        if values.ndim == 2 and values.shape[1] == size:
+            return values
+        logger.warning(f"Sensor {sensor.getName()} does not have {size} values.")
+        return np.full((len(values), size), np.nan)
+
+    # Index pair of the values between start_s and end_s (both included)
+    def getRangeIndexes(self, start_s: float, end_s: float) -> tuple[int, int]:
+        key = (start_s, end_s)
+        if key not in self.range_indexes:
+            idx1 = int(np.searchsorted(self.timeincr_list, start_s, side="left"))
+            idx2 = int(np.searchsorted(self.timeincr_list, end_s, side="right"))
+            self.range_indexes[key] = (idx1, max(idx2, idx1 + 1))
+        return self.range_indexes[key]
+
+    def getDuration(self) -> float:
+        if not len(self.timeincr_list):
+            return 0.0
+        return float(self.timeincr_list[-1])
 
     def isRangedPlot(self, idx1: int, idx2: int) -> bool:
         if idx1 != 0 or idx2 != 0:
-            if idx2 > idx1 and idx1 >= 0 and idx2 <= len(self.df_filtered):
+            if idx2 > idx1 and idx1 >= 0 and idx2 <= self.store.getSize():
                 return True
         return False
 
     # Getters
 
     def getDataSize(self) -> int:
-        return len(self.df_raw)
+        return self.store.getSize()
+
+    def getColumns(self) -> list[str]:
+        return self.store.getColumns()
+
+    def getStorageDTypes(self) -> dict[str, np.dtype]:
+        return self.storage_dtypes
 
+    def hasRaw(self) -> bool:
+        return self.has_raw
+
+    def getRawFrame(self) -> pd.DataFrame | None:
+        if not self.has_raw:
+            return None
+        return self.store.getFrame(RAW)
+
+    def getCalibratedFrame(self) -> pd.DataFrame:
+        return self.store.getFrame(CALIBRATED)
+
+    @profiler.track("plot.group")
     def getGroupPlotWidget(
         self,
         plot_type: PlotTypes,
-        sensor_names: list[str],
+        sensor_group: SensorGroup,
         idx1: int = 0,
         idx2: int = 0,
     ) -> PlotPlatformForcesWidget | PlotPlatformCOPWidget | PlotFigureWidget:
         # Platform groups
-        if (
-            plot_type == PlotTypes.GROUP_PLATFORM_COP
-            or plot_type == PlotTypes.GROUP_PLATFORM_FORCES
-        ):
-            # Make forces dataframes
-            df_fx = pd.DataFrame()
-            df_fy = pd.DataFrame()
-            df_fz = pd.DataFrame()
-            for sensor_name in sensor_names:
-                sign = 1
-                for key in self.forces_sign.keys():
-                    if key in sensor_name:
-                        sign = self.forces_sign[key]
-                        break
-                if "X_" in sensor_name:
-                    df_fx[sensor_name] = self.getForce(sensor_name, sign)
-                    continue
-                if "Y_" in sensor_name:
-                    df_fy[sensor_name] = self.getForce(sensor_name, sign)
-                    continue
-                if "Z_" in sensor_name:
-                    df_fz[sensor_name] = self.getForce(sensor_name, sign)
-                    continue
-                logger.warning(
-                    f"Could not recognize sensor {sensor_name}."
-                    + " Needs X_, Y_ or Z_ in name to be identified."
+        group_id = sensor_group.getID()
+        if group_id not in self.platform_filtered:
+            logger.error(f"Sensor group {group_id} not found in platform results!")
+            return PlotFigureWidget()
+        if plot_type == PlotTypes.GROUP_PLATFORM_COP:
+            plotter = PlotPlatformCOPWidget()
+            sensor_amount = len(self.platform_sensor_names[group_id])
+            if sensor_amount != len(PLATFORM_SENSOR_KEYS):
+                logger.error(
+                    "Could not build COP plot!"
+                    + f" Need 12 platform sensors, only {sensor_amount} provided."
                 )
-            if plot_type == PlotTypes.GROUP_PLATFORM_COP:
-                plotter = PlotPlatformCOPWidget()
-                # Check shapes
-                if df_fx.shape[1] != 4:
-                    logger.error(
-                        "Could not build COP plot!"
-                        + f"Need 4 X axis sensors, only {df_fx.shape[1]} provided."
-                    )
-                    return plotter
-                if df_fy.shape[1] != 4:
-                    logger.error(
-                        "Could not build COP plot!"
-                        + f"Need 4 Y axis sensors, only {df_fy.shape[1]} provided."
-                    )
-                    return plotter
-                if df_fz.shape[1] != 4:
-                    logger.error(
-                        "Could not build COP plot!"
-                        + f"Need 4 Z axis sensors, only {df_fz.shape[1]} provided."
-                    )
-                    return plotter
-                # Get COP and build plot
-                if self.isRangedPlot(idx1, idx2):
-                    df_fx = df_fx[idx1:idx2]
-                    df_fy = df_fy[idx1:idx2]
-                    df_fz = df_fz[idx1:idx2]
-                cop = self.getPlatformCOP(df_fx, df_fy, df_fz)
-                # Invert COP axis for ellipse cause plot is inverted
-                ellipse_params = self.getEllipseFromCOP((cop[1], cop[0]))
-                plotter.setupPlot(cop, ellipse_params)
                 return plotter
-            if plot_type == PlotTypes.GROUP_PLATFORM_FORCES:
-                plotter = PlotPlatformForcesWidget()
-                if self.isRangedPlot(idx1, idx2):
-                    plotter.setupRangedPlot(
-                        self.timeincr_list, df_fx, df_fy, df_fz, idx1, idx2
-                    )
-                    return plotter
-                plotter.setupPlot(self.timeincr_list, df_fx, df_fy, df_fz)
+            forces = self.getPlatformForces(group_id, idx1, idx2).to_numpy()
+            cop = self.getPlatformCOP(forces)
+            # Invert COP axis for ellipse cause plot is inverted
+            ellipse_params = self.getEllipseFromCOP((cop[1], cop[0]))
+            plotter.setupPlot(cop, ellipse_params)
+            return plotter
+        if plot_type == PlotTypes.GROUP_PLATFORM_FORCES:
+            plotter = PlotPlatformForcesWidget()
+            df_fx, df_fy, df_fz = [
+                self.getPlatformAxisForces(group_id, axis) for axis in range(3)
+            ]
+            if self.isRangedPlot(idx1, idx2):
+                plotter.setupRangedPlot(
+                    self.timeincr_list, df_fx, df_fy, df_fz, idx1, idx2
+                )
                 return plotter
+            plotter.setupPlot(self.timeincr_list, df_fx, df_fy, df_fz)
+            return plotter
         return PlotFigureWidget()
 
+    @profiler.track("plot.preview")
     def getPlotPreviewWidget(
         self,
         sensor_name: str,
@@ -191,11 +355,11 @@ class DataManager:
         plotter = PlotFigureWidget()
 
         # Check first if dataframe contains sensor_name
-        if sensor_name not in self.df_filtered.columns:
+        if not self.store.hasColumn(sensor_name):
             logger.error(f"Sensor name {sensor_name} not found in dataframe results!")
             return plotter
 
-        df = self.df_filtered[sensor_name].copy(deep=True)
+        df = pd.Series(self.store.getFiltered(sensor_name), name=sensor_name)
 
         if self.isRangedPlot(idx1, idx2):
             plotter.setupRangedPreviewPlot(df, idx1, idx2)
@@ -203,6 +367,7 @@ class DataManager:
         plotter.setupPlot(df)
         return plotter
 
+    @profiler.track("plot.sensor")
     def getSensorPlotWidget(
         self,
         plot_type: PlotTypes,
@@ -214,12 +379,11 @@ class DataManager:
 
         # Check first if dataframe contains sensor_name
         col_exist = False
-        for column in self.df_filtered.columns:
+        for column in self.store.getColumns():
             if sensor_name in column:
                 col_exist = True
                 break
         if not col_exist:
-            print(self.df_filtered)
             logger.error(f"Sensor name {sensor_name} not found in dataframe results!")
             return plotter
 
@@ -259,42 +423,128 @@ class DataManager:
         plotter.setupPlot(df, ("Time (s)", y_label))
         return plotter
 
-    def getRawDataframe(self, idx1: int = 0, idx2: int = 0) -> pd.DataFrame:
-        return self.formatDataframe(self.df_raw.copy(deep=True), idx1, idx2)
+    def getRawDataframe(self, idx1: int = 0, idx2: int = 0) -> pd.DataFrame | None:
+        if not self.has_raw:
+            return None
+        return self.formatDataframe(RAW, idx1, idx2)
 
     def getCalibrateDataframe(self, idx1: int = 0, idx2: int = 0) -> pd.DataFrame:
-        return self.formatDataframe(self.df_calibrated.copy(deep=True), idx1, idx2)
+        return self.formatDataframe(CALIBRATED, idx1, idx2)
 
-    def formatDataframe(
-        self, df: pd.DataFrame, idx1: int = 0, idx2: int = 0
-    ) -> pd.DataFrame:
-        timestamp = self.timestamp_list.copy()
+    @profiler.track("data.format")
+    def formatDataframe(self, kind: str, idx1: int = 0, idx2: int = 0) -> pd.DataFrame:
+        # Ranges are views, only the formatted values are new
+        timestamp = self.timestamp_list
         if self.isRangedPlot(idx1, idx2):
             timestamp = timestamp[idx1:idx2]
-            df = df.iloc[idx1:idx2]
+            df = self.store.getFrame(kind, idx1=idx1, idx2=idx2)
+        else:
+            df = self.store.getFrame(kind)
         # Format dataframe values to 0.000000e+00
         df = df.map("{:.6e}".format)
         # Add timestamp values
         df.insert(0, "timestamp", timestamp)
         return df
 
+    # Arrow tables for analysis processes
+
+    def getSessionTable(self, metadata: dict = None):
+        # Raw, calibrated and derived (filtered platform forces) signals of the
+        # whole test. Requires pyarrow.
+        if not arrowExport.isArrowAvailable():
+            logger.warning("pyarrow is not installed, no Arrow table available.")
+            return None
+        columns = self.store.getColumns()
+        derived = {}
+        for group_id in self.platform_filtered:
+            forces = self.getPlatformForces(group_id).to_numpy()
+            for i, component in enumerate(self.platform_components):
+                derived[f"{group_id}_{component}"] = forces[:, i]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cop_x, cop_y = self.getPlatformCOP(forces)
+            derived[f"{group_id}_COPx"] = cop_x
+            derived[f"{group_id}_COPy"] = cop_y
+        session_metadata = {
+            "samples": self.getDataSize(),
+            "duration_s": self.getDuration(),
+            "raw": self.has_raw,
+            "storage_dtypes": {
+                column: dtype.str for column, dtype in self.storage_dtypes.items()
+            },
+            "calibration": {
+                column: [
+                    float(self.store.slopes[i]),
+                    float(self.store.intercepts[i]),
+                ]
+                for i, column in enumerate(columns)
+            },
+            "platform_matrices": {
+                group_id: matrix.tolist()
+                for group_id, matrix in self.platform_matrix.items()
+            },
+        }
+        session_metadata.update(metadata or {})
+        return arrowExport.buildSessionTable(
+            self.timestamp_list,
+            {
+                arrowExport.CALIBRATED: {
+                    column: self.store.getCalibrated(column) for column in columns
+                },
+                arrowExport.RAW: {
+                    column: self.store.getRaw(column)
+                    for column in columns
+                    if self.has_raw
+                },
+                arrowExport.DERIVED: derived,
+            },
+            session_metadata,
+        )
+
+    def shareSession(self, test_name: str, table=None) -> str:
+        # Publishes the session in shared memory, replacing the last shared one
+        if table is None:
+            table = self.getSessionTable({"name": test_name})
+        if table is None:
+            return None
+        self.closeSharedSession()
+        try:
+            self.shared_table = arrowExport.SharedTable(
+                arrowExport.getSharedName(test_name), table
+            )
+        except OSError as e:
+            logger.error(f"Could not share session {test_name}: {e}")
+            return None
+        logger.info(
+            f"Session shared as {self.shared_table.getName()}"
+            + f" ({self.shared_table.getSize() / (1024 * 1024):.2f} MB)"
+        )
+        return self.shared_table.getName()
+
+    def closeSharedSession(self) -> None:
+        if self.shared_table is None:
+            return
+        self.shared_table.close()
+        self.shared_table = None
+
     # Data process methods
 
     # ButterWorth filter
+    @profiler.track("data.filter")
     def applyButterFilter(self, fs: int = 100, fc: int = 5, order: int = 6):
         b, a = butter(order, fc / (0.5 * fs), btype="low", analog=False)
-        self.df_filtered = pd.DataFrame()
-        for col in self.df_calibrated:
-            self.df_filtered[col] = filtfilt(b, a, self.df_calibrated[col])
+        # Sensor columns are filtered when a plot requests them
+        self.store.setFilter(b, a)
+        # Filter is linear, so filtering the raw blocks equals filtering the forces
+        for group_id, raw_block in self.platform_raw.items():
+            values = pd.DataFrame(raw_block).interpolate(limit_direction="both")
+            self.platform_filtered[group_id] = filtfilt(b, a, values.to_numpy(), axis=0)
 
     # - Sensor methods
     def getForce(self, sensor_name: str, sign: int) -> pd.DataFrame:
-        df = self.df_filtered[sensor_name].copy(deep=True)
-        df *= sign
-        return df
+        return pd.Series(self.store.getFiltered(sensor_name) * sign, name=sensor_name)
 
     def getDistance(self, sensor_name: str) -> pd.DataFrame:
-        return self.df_filtered[sensor_name]
+        return pd.Series(self.store.getFiltered(sensor_name), name=sensor_name)
 
     def getIMUAngles(self, sensor_name: str, suffix_list: list[str]) -> pd.DataFrame:
         df_quat: pd.DataFrame = self.getIMUValues(sensor_name, suffix_list)
@@ -316,58 +566,41 @@ class DataManager:
 
     def getIMUValues(self, sensor_name: str, suffix_list: list[str]) -> pd.DataFrame:
         headers = [sensor_name + "_" + suffix for suffix in suffix_list]
-        return self.df_filtered[headers]
+        return self.store.getFrame(FILTERED, headers)
 
     # - Platform group methods
 
-    # Expected input format: name_1, name_2, name_3, name_4
-    # Output: x1, x2, x3, x4
-    def getPlatformForces(self, sensor_names: list[str]) -> pd.DataFrame:
-        df_list: list[pd.DataFrame] = []
-        for sensor_name in sensor_names:
-            sign = 1
-            for key in self.forces_sign.keys():
-                if key in sensor_name:
-                    sign = self.forces_sign[key]
-                    break
-            df_list.append(self.getForce(sensor_name, sign))
-        return pd.concat(df_list)
-
-    def getPlatformCOP(
-        self, df_fx: pd.DataFrame, df_fy: pd.DataFrame, df_fz: pd.DataFrame
-    ) -> tuple[pd.Series, pd.Series]:
-        # Platform dimensions
-        lx = 508  # mm
-        ly = 308  # mm
-        h = 20  # mm
-        # Get sum forces
-        fx = df_fx.sum(axis=1)
-        fy = df_fy.sum(axis=1)
-        fz = df_fz.sum(axis=1)
-        # Operate
-        mx = (
-            ly
-            / 2
-            * (
-                -df_fz.iloc[:, 0]
-                - df_fz.iloc[:, 1]
-                + df_fz.iloc[:, 2]
-                + df_fz.iloc[:, 3]
-            )
-        )
-        my = (
-            lx
-            / 2
-            * (
-                -df_fz.iloc[:, 0]
-                + df_fz.iloc[:, 1]
-                + df_fz.iloc[:, 2]
-                - df_fz.iloc[:, 3]
-            )
+    # Filtered platform forces and moments (Fx, Fy, Fz, Mx, My, Mz)
+    def getPlatformForces(
+        self, group_id: str, idx1: int = 0, idx2: int = 0
+    ) -> pd.DataFrame:
+        raw_block = self.platform_filtered[group_id]
+        if self.isRangedPlot(idx1, idx2):
+            raw_block = raw_block[idx1:idx2]
+        forces = raw_block @ self.platform_matrix[group_id].T
+        return pd.DataFrame(forces, columns=self.platform_components)
+
+    # Contribution of every sensor of the axis (0: X, 1: Y, 2: Z) to its force.
+    # Other sensors contributions are summed in a cross-talk column.
+    def getPlatformAxisForces(self, group_id: str, axis: int) -> pd.DataFrame:
+        contributions = (
+            self.platform_filtered[group_id] * self.platform_matrix[group_id][axis]
         )
-        # Get COP
-        cop_x = (-h * fx - my) / fz
-        cop_y = (-h * fy + mx) / fz
+        df = pd.DataFrame()
+        axis_indexes = range(axis * 4, axis * 4 + 4)
+        for sensor_name in self.platform_sensor_names[group_id]:
+            index = getPlatformSensorIndex(sensor_name)
+            if index in axis_indexes:
+                df[sensor_name] = contributions[:, index]
+        cross_talk = np.delete(contributions, axis_indexes, axis=1).sum(axis=1)
+        if np.any(cross_talk):
+            df["Cross-talk"] = cross_talk
+        return df
+
+    def getPlatformCOP(self, forces: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        fx, fy, fz, mx, my = forces[:, :5].T
+        cop_x = (-self.platform_h * fx - my) / fz
+        cop_y = (-self.platform_h * fy + mx) / fz
         cop_x = cop_x - np.mean(cop_x)
         cop_y = cop_y - np.mean(cop_y)
         return [cop_x, cop_y]
@@ -394,22 +627,42 @@ class DataManager:
     # Tare sensors
 
     def tareSensors(self, sensor_manager: SensorManager, last_values: int) -> None:
-        for group in sensor_manager.getGroups(only_available=True):
-            for sensor in group.getSensors(only_available=True).values():
-                # Only tare loadcells and encoders
-                if sensor.getType() not in [
-                    STypes.SENSOR_LOADCELL,
-                    STypes.SENSOR_ENCODER,
-                ]:
+        # Only tare loadcells and encoders
+        sensors = [
+            sensor
+            for group in sensor_manager.getGroups(only_available=True)
+            for sensor in group.getSensors(only_available=True).values()
+            if sensor.getType() in [STypes.SENSOR_LOADCELL, STypes.SENSOR_ENCODER]
+        ]
+        if not sensors:
+            return
+        # All sensors register a value on every tick, so their last values are aligned
+        amount = min(last_values, *[len(sensor.getValues()) for sensor in sensors])
+        if amount <= 0:
+            logger.warning("No recorded values to tare sensors.")
+            return
+        values = np.array(
+            [asFloatValues(sensor.getValues()[-amount:]) for sensor in sensors],
+            dtype=float,
+        )
+        slopes = np.array([sensor.getSlope() for sensor in sensors], dtype=float)
+        # Calibrated mean is slope * mean + intercept, so the tared intercept
+        # that sets it to zero is -slope * mean
+        valid = ~np.isnan(values)
+        counts = valid.sum(axis=1)
+        means = np.where(valid, values, 0).sum(axis=1) / np.maximum(counts, 1)
+        new_intercepts = -slopes * means
+        with sensor_manager.configBatch():
+            for sensor, new_intercept, count in zip(sensors, new_intercepts, counts):
+                # Detached during the whole tare window, keep its intercept
+                if count == 0:
+                    logger.warning(
+                        f"No values of sensor {sensor.getName()} to tare it."
+                        + " Intercept not changed."
+                    )
                     continue
-                # Tare process
-                logger.debug(f"Tare sensor {sensor.getName()}")
-                slope = sensor.getSlope()
-                intercept = sensor.getIntercept()
-                calib_values = [
-                    value * slope + intercept
-                    for value in sensor.getValues()[-last_values:]
-                ]
-                new_intercept = float(sensor.getIntercept() - np.mean(calib_values))
-                logger.debug(f"From {intercept} to {new_intercept}")
-                sensor_manager.setSensorIntercept(sensor, new_intercept)
+                logger.debug(
+                    f"Tare sensor {sensor.getName()}"
+                    + f" from {sensor.getIntercept()} to {new_intercept}"
+                )
+                sensor_manager.setSensorIntercept(sensor, float(new_intercept))
@@ -1,8 +1,17 @@
 import os
-import glob
 import pandas as pd
 from loguru import logger
 from src.managers.configManager import ConfigManager
+from src.managers.profileManager import profiler
+from src.managers.sessionLoader import SESSION_EXTENSION, writeSession
+from src.managers.sessionIndex import SessionIndex, buildSessionRecord
+from src.managers.arrowExport import ARROW_EXTENSION, writeArrowFile
+from src.managers.rawArchive import (
+    ARCHIVE_EXTENSION,
+    RawArchive,
+    openArchive,
+    writeArchive,
+)
 from src.enums.configPaths import ConfigPaths as CfgPaths
 from typing import Protocol
 
@@ -19,6 +28,9 @@ class FileManager:
         self.file_name: str = "Test"
         self.file_name_suffix: str = ""
         self.file_path: str = os.path.join(os.path.dirname(__file__), "..", "..")
+        # Index of the sessions saved in the file path, and files of the current one
+        self.session_index: SessionIndex = None
+        self.saved_files: list[str] = []
 
     def setup(self, config_manager: ConfigYAMLHandler):
         self.cfg_mngr = config_manager
@@ -31,19 +43,20 @@ class FileManager:
         if self.getPathExists():
             self.checkFileName()
 
-    def checkFileNameSuffix(self, file_name: str) -> int:
-        total_path = os.path.join(self.file_path, file_name + ".*")
-        if not glob.glob(total_path):
-            return 0
-        suffix_num = 1
-        suffix_num_max = 100
-        while suffix_num < suffix_num_max:
-            new_name = f"{file_name}_{suffix_num}"
-            total_path = os.path.join(self.file_path, new_name + ".*")
-            if not glob.glob(total_path):
-                break
-            suffix_num += 1
-        return suffix_num
+    def getSessionIndex(self) -> SessionIndex:
+        if self.session_index is None or (
+            self.session_index.getFolderPath() != self.file_path
+        ):
+            self.session_index = SessionIndex(self.file_path)
+        return self.session_index
+
+    def indexSession(self, timestamps: list, df: pd.DataFrame) -> None:
+        # Record the files saved for the current test name
+        if not self.saved_files or not self.getPathExists():
+            return
+        self.getSessionIndex().addSession(
+            buildSessionRecord(self.getFileName(), timestamps, df, self.saved_files)
+        )
 
     # Setters and getters
 
@@ -68,12 +81,8 @@ class FileManager:
     def checkFileName(self, file_name: str = None) -> None:
         if not file_name:
             file_name = self.file_name
-        file_suffix_num = 0
-        suffix_list = ["", "_RAW"]
-        for suffix in suffix_list:
-            num = self.checkFileNameSuffix(file_name + suffix)
-            if num > file_suffix_num:
-                file_suffix_num = num
+        self.saved_files = []
+        file_suffix_num = self.getSessionIndex().getFreeSuffixNum(file_name)
         if file_suffix_num > 0:
             self.file_name_suffix = f"_{file_suffix_num}"
             logger.warning(
@@ -94,6 +103,7 @@ class FileManager:
 
     # File saving methods
 
+    @profiler.track("file.save_csv")
     def saveDataToCSV(self, df: pd.DataFrame, name_suffix: str = ""):
         if not self.getPathExists():
             logger.warning("The file path does not exist!")
@@ -101,12 +111,14 @@ class FileManager:
         file_name = self.file_name + self.file_name_suffix + name_suffix
         total_path = os.path.join(self.file_path, file_name + ".csv")
         df.to_csv(total_path, index=False)
+        self.addSavedFile(total_path)
 
         file_size = os.path.getsize(total_path) / (1024 * 1024)
         logger.info(
             f"Test file {file_name} saved in {self.file_path} ({str(round(file_size, 2))} MB)"
         )
 
+    @profiler.track("file.save_binary")
     def saveDataToBinary(self, df: pd.DataFrame, name_suffix: str = ""):
         if not self.getPathExists():
             logger.warning("The file path does not exist!")
@@ -114,8 +126,92 @@ class FileManager:
         file_name = self.file_name + self.file_name_suffix + name_suffix
         total_path = os.path.join(self.file_path, file_name + ".pk1")
         df.to_pickle(total_path)
+        self.addSavedFile(total_path)
 
         file_size = os.path.getsize(total_path) / (1024 * 1024)
         logger.info(
             f"Test file {file_name} saved in {self.file_path} ({str(round(file_size, 2))} MB)"
         )
+
+    @profiler.track("file.save_session")
+    def saveDataToSession(
+        self,
+        timestamps: list,
+        df_calibrated: pd.DataFrame,
+        df_raw: pd.DataFrame = None,
+        config: dict = None,
+        dtypes: dict = None,
+    ):
+        # Binary session folder, opened memory-mapped by the session loader
+        if not self.getPathExists():
+            logger.warning("The file path does not exist!")
+            return
+        file_name = self.file_name + self.file_name_suffix
+        total_path = os.path.join(self.file_path, file_name + SESSION_EXTENSION)
+        try:
+            writeSession(total_path, timestamps, df_calibrated, df_raw, config, dtypes)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not save session {file_name}: {e}")
+            return
+        self.addSavedFile(total_path)
+
+    @profiler.track("file.save_archive")
+    def saveDataToArchive(
+        self,
+        timestamps: list,
+        df_raw: pd.DataFrame,
+        dtypes: dict = None,
+        name_suffix: str = "_RAW",
+    ):
+        # Compressed raw values, chunked to read time ranges
+        if not self.getPathExists():
+            logger.warning("The file path does not exist!")
+            return
+        codec, level = "zlib", None
+        if self.cfg_mngr is not None:
+            codec = self.cfg_mngr.getConfigValue(
+                CfgPaths.TEST_ARCHIVE_CODEC.value, codec
+            )
+            level = self.cfg_mngr.getConfigValue(
+                CfgPaths.TEST_ARCHIVE_LEVEL.value, level
+            )
+        file_name = self.file_name + self.file_name_suffix + name_suffix
+        total_path = os.path.join(self.file_path, file_name + ARCHIVE_EXTENSION)
+        try:
+            writeArchive(total_path, timestamps, df_raw, dtypes, codec, level)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not save archive {file_name}: {e}")
+            return
+        self.addSavedFile(total_path)
+
+        file_size = os.path.getsize(total_path) / (1024 * 1024)
+        logger.info(
+            f"Test archive {file_name} saved in {self.file_path} ({str(round(file_size, 2))} MB)"
+        )
+
+    @profiler.track("file.save_arrow")
+    def saveDataToArrow(self, table, name_suffix: str = ""):
+        # Arrow IPC (Feather) file of a DataManager session table
+        if not self.getPathExists():
+            logger.warning("The file path does not exist!")
+            return
+        file_name = self.file_name + self.file_name_suffix + name_suffix
+        total_path = os.path.join(self.file_path, file_name + ARROW_EXTENSION)
+        try:
+            writeArrowFile(total_path, table)
+        except OSError as e:
+            logger.error(f"Could not save Arrow file {file_name}: {e}")
+            return
+        self.addSavedFile(total_path)
+
+        file_size = os.path.getsize(total_path) / (1024 * 1024)
+        logger.info(
+            f"Test file {file_name} saved in {self.file_path} ({str(round(file_size, 2))} MB)"
+        )
+
+    def loadArchive(self, file_path: str) -> RawArchive:
+        return openArchive(file_path)
+
+    def addSavedFile(self, file_path: str) -> None:
+        self.saved_files.append(os.path.basename(file_path))
+        self.getSessionIndex().addFile(file_path)
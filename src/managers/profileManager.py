@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+import os
+import io
+import time
+import pstats
+import cProfile
+import functools
+import tracemalloc
+import pandas as pd
+from contextlib import contextmanager
+from loguru import logger
+from typing import Protocol
+
+
+class FileHandler(Protocol):
+    def saveDataToCSV(self, df: pd.DataFrame, name_suffix: str = ""): ...
+
+    def getFileName(self) -> str: ...
+
+    def getFilePath(self) -> str: ...
+
+    def getPathExists(self) -> bool: ...
+
+
+class ProfileManager:
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self.use_cprofile: bool = False
+        self.use_tracemalloc: bool = False
+        self.profiler: cProfile.Profile = None
+        # Span name -> [calls, total_s, max_s, peak_memory_bytes]
+        self.spans: dict[str, list] = {}
+        self.depth: int = 0
+
+    def enable(self, use_cprofile: bool = False, use_tracemalloc: bool = False) -> None:
+        self.clear()
+        self.enabled = True
+        self.use_cprofile = use_cprofile
+        self.use_tracemalloc = use_tracemalloc
+        if self.use_cprofile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if self.use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        logger.info(
+            "Profile mode enabled"
+            + (" with cProfile" if use_cprofile else "")
+            + (" with tracemalloc" if use_tracemalloc else "")
+        )
+
+    def disable(self) -> None:
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler = None
+        if self.use_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.enabled = False
+        self.use_cprofile = False
+        self.use_tracemalloc = False
+
+    def clear(self) -> None:
+        self.spans.clear()
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    # Timing spans
+
+    @contextmanager
+    def span(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        # Memory peaks are only measured on outer spans, nested spans would reset them
+        measure_memory = self.use_tracemalloc and self.depth == 0
+        if measure_memory:
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+        self.depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.depth -= 1
+            peak_memory = 0
+            if measure_memory:
+                peak_memory = tracemalloc.get_traced_memory()[1] - start_memory
+            self.registerSpan(name, elapsed, peak_memory)
+
+    def track(self, name: str):
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with self.span(name):
+                    return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def registerSpan(self, name: str, elapsed_s: float, peak_memory: int = 0) -> None:
+        span = self.spans.setdefault(name, [0, 0.0, 0.0, 0])
+        span[0] += 1
+        span[1] += elapsed_s
+        span[2] = max(span[2], elapsed_s)
+        span[3] = max(span[3], peak_memory)
+
+    # Getters
+
+    def isEnabled(self) -> bool:
+        return self.enabled
+
+    def getReport(self) -> list[dict]:
+        report: list[dict] = []
+        for name, (calls, total_s, max_s, peak_memory) in self.spans.items():
+            report.append(
+                {
+                    "stage": name,
+                    "calls": calls,
+                    "total_ms": round(total_s * 1000, 4),
+                    "mean_ms": round(total_s / calls * 1000, 4),
+                    "max_ms": round(max_s * 1000, 4),
+                    "peak_memory_kb": round(peak_memory / 1024, 2),
+                }
+            )
+        return sorted(report, key=lambda row: row["total_ms"], reverse=True)
+
+    # Report saving
+
+    def saveReport(self, file_manager: FileHandler) -> None:
+        if not self.enabled:
+            return
+        if not file_manager.getPathExists():
+            logger.warning("The file path does not exist! Profile report not saved.")
+            return
+        file_manager.saveDataToCSV(pd.DataFrame(self.getReport()), "_PROFILE")
+        base_path = os.path.join(
+            file_manager.getFilePath(), file_manager.getFileName() + "_PROFILE"
+        )
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(base_path + ".prof")
+            stream = io.StringIO()
+            pstats.Stats(self.profiler, stream=stream).sort_stats(
+                pstats.SortKey.CUMULATIVE
+            ).print_stats(40)
+            with open(base_path + ".txt", "w") as file:
+                file.write(stream.getvalue())
+            self.profiler.enable()
+        if self.use_tracemalloc and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            with open(base_path + "_MEMORY.txt", "w") as file:
+                for stat in snapshot.statistics("lineno")[:40]:
+                    file.write(f"{stat}\n")
+        logger.info(f"Profile report saved in {file_manager.getFilePath()}")
+        self.clear()
+
+
+# Shared instance, so every stage can be wrapped without threading it through managers
+profiler = ProfileManager()
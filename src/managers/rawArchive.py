@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+
+import os
+import bz2
+import json
+import lzma
+import zlib
+import struct
+import numpy as np
+import pandas as pd
+from loguru import logger
+from src.handlers.valueBuffer import asFloatValues, asStorageValues
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+# Archive file: compressed column blocks of each chunk, then a JSON index and a
+# footer with the index offset. Chunks are decompressed only when read.
+ARCHIVE_EXTENSION = ".fpz"
+ARCHIVE_MAGIC = b"FPZ1"
+ARCHIVE_VERSION = 1
+FOOTER = struct.Struct("<Q4s")
+TIMESTAMP_COLUMN = "timestamp"
+# One minute of values at 10 ms
+CHUNK_ROWS = 6000
+
+# Codec name -> (compress(data, level), decompress(data), default level, levels)
+CODECS = {
+    "zlib": (
+        lambda data, level: zlib.compress(data, level),
+        zlib.decompress,
+        6,
+        range(-1, 10),
+    ),
+    "lzma": (
+        lambda data, level: lzma.compress(data, preset=level),
+        lzma.decompress,
+        6,
+        range(0, 10),
+    ),
+    "bz2": (
+        lambda data, level: bz2.compress(data, level),
+        bz2.decompress,
+        9,
+        range(1, 10),
+    ),
+}
+if zstandard is not None:
+    CODECS["zstd"] = (
+        lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+        3,
+        range(1, zstandard.MAX_COMPRESSION_LEVEL + 1),
+    )
+if lz4 is not None:
+    CODECS["lz4"] = (
+        lambda data, level: lz4.frame.compress(data, compression_level=level),
+        lz4.frame.decompress,
+        0,
+        range(0, 17),
+    )
+
+
+def getCodecs() -> list[str]:
+    return list(CODECS.keys())
+
+
+def getCodec(codec: str) -> tuple:
+    if codec not in CODECS:
+        raise ValueError(f"Archive codec {codec} not available. Use: {getCodecs()}")
+    return CODECS[codec]
+
+
+# Blocks are the deltas of the value bits (wrapping unsigned integers, so
+# floats and NaNs are lossless) with their bytes grouped by significance.
+# Slowly changing values give runs of zero bytes, which compress well.
+
+
+def encodeBlock(values: np.ndarray, dtype: np.dtype) -> bytes:
+    values = np.ascontiguousarray(values, dtype=dtype)
+    bits = values.view(f"<u{dtype.itemsize}")
+    deltas = np.diff(bits, prepend=bits.dtype.type(0))
+    return deltas.view(np.uint8).reshape(-1, dtype.itemsize).T.tobytes()
+
+
+def decodeBlock(data: bytes, dtype: np.dtype, rows: int) -> np.ndarray:
+    deltas = np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, rows)
+    deltas = np.ascontiguousarray(deltas.T).view(f"<u{dtype.itemsize}").ravel()
+    return np.cumsum(deltas, dtype=deltas.dtype).view(dtype)
+
+
+def writeArchive(
+    file_path: str,
+    timestamps: list,
+    df: pd.DataFrame,
+    dtypes: dict[str, np.dtype] = None,
+    codec: str = "zlib",
+    level: int = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> None:
+    # Columns are saved in their storage dtypes (float64 if not given)
+    compress, _, default_level, levels = getCodec(codec)
+    level = default_level if level is None else level
+    if not isinstance(level, int) or level not in levels:
+        raise ValueError(
+            f"Archive level {level} not valid for {codec}."
+            + f" Use {levels.start} to {levels.stop - 1}."
+        )
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if len(timestamps) != len(df):
+        raise ValueError("Archive needs one timestamp per row")
+    dtypes = dtypes or {}
+    columns = df.columns.tolist()
+    column_dtypes = [
+        np.dtype(dtypes.get(column, np.float64)).newbyteorder("<") for column in columns
+    ]
+    arrays = [
+        asStorageValues(df[column].to_numpy(), dtype)
+        for column, dtype in zip(columns, column_dtypes)
+    ]
+    chunks = []
+    temp_path = file_path + ".tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            file.write(ARCHIVE_MAGIC)
+            for start in range(0, len(timestamps), chunk_rows):
+                end = min(start + chunk_rows, len(timestamps))
+                blocks = []
+                for values, dtype in [(timestamps, np.dtype("<i8"))] + list(
+                    zip(arrays, column_dtypes)
+                ):
+                    data = compress(encodeBlock(values[start:end], dtype), level)
+                    blocks.append([file.tell(), len(data)])
+                    file.write(data)
+                chunks.append(
+                    {
+                        "rows": end - start,
+                        "start_ms": int(timestamps[start]),
+                        "end_ms": int(timestamps[end - 1]),
+                        "blocks": blocks,
+                    }
+                )
+            index_offset = file.tell()
+            index = {
+                "version": ARCHIVE_VERSION,
+                "codec": codec,
+                "level": level,
+                "rows": len(timestamps),
+                "columns": columns,
+                "dtypes": [dtype.str for dtype in column_dtypes],
+                "chunks": chunks,
+            }
+            file.write(json.dumps(index).encode("utf-8"))
+            file.write(FOOTER.pack(index_offset, ARCHIVE_MAGIC))
+        os.replace(temp_path, file_path)
+    except BaseException:
+        # Unfinished archives are not left behind
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class RawArchive:
+    # Reader of an archive file. Time ranges only decompress the chunks and
+    # columns they need.
+    def __init__(self, file_path: str) -> None:
+        self.file_path: str = file_path
+        with open(file_path, "rb") as file:
+            if file.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+                raise ValueError(f"Not an archive file: {file_path}")
+            file.seek(-FOOTER.size, os.SEEK_END)
+            index_offset, magic = FOOTER.unpack(file.read(FOOTER.size))
+            if magic != ARCHIVE_MAGIC:
+                raise ValueError(f"Unfinished archive file: {file_path}")
+            file.seek(index_offset)
+            self.index: dict = json.loads(
+                file.read(os.path.getsize(file_path) - FOOTER.size - index_offset)
+            )
+        if self.index.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported archive version in {file_path}")
+        self.columns: list[str] = self.index["columns"]
+        self.dtypes: list[np.dtype] = [
+            np.dtype(dtype) for dtype in self.index["dtypes"]
+        ]
+        self.decompress = getCodec(self.index["codec"])[1]
+
+    def getColumns(self) -> list[str]:
+        return self.columns
+
+    def getSize(self) -> int:
+        return self.index["rows"]
+
+    def getCodec(self) -> str:
+        return self.index["codec"]
+
+    def getTimeRange(self) -> tuple[int, int]:
+        chunks = self.index["chunks"]
+        if not chunks:
+            return (None, None)
+        return (chunks[0]["start_ms"], chunks[-1]["end_ms"])
+
+    def readBlock(self, file, chunk: dict, block: int, dtype: np.dtype) -> np.ndarray:
+        offset, size = chunk["blocks"][block]
+        file.seek(offset)
+        return decodeBlock(self.decompress(file.read(size)), dtype, chunk["rows"])
+
+    def read(
+        self, columns: list[str] = None, start_ms: int = None, end_ms: int = None
+    ) -> pd.DataFrame:
+        # Values between start_ms and end_ms (both included), with timestamps.
+        # Integer columns are upcast with NaN gaps, as in binary sessions.
+        if columns is None:
+            columns = self.columns
+        unknown = [column for column in columns if column not in self.columns]
+        if unknown:
+            raise KeyError(f"Columns not found in archive {self.file_path}: {unknown}")
+        chunks = [
+            chunk
+            for chunk in self.index["chunks"]
+            if (start_ms is None or chunk["end_ms"] >= start_ms)
+            and (end_ms is None or chunk["start_ms"] <= end_ms)
+        ]
+        indexes = [self.columns.index(column) for column in columns]
+        parts = {column: [] for column in [TIMESTAMP_COLUMN] + columns}
+        with open(self.file_path, "rb") as file:
+            for chunk in chunks:
+                timestamps = self.readBlock(file, chunk, 0, np.dtype("<i8"))
+                mask = np.ones(len(timestamps), dtype=bool)
+                if start_ms is not None:
+                    mask &= timestamps >= start_ms
+                if end_ms is not None:
+                    mask &= timestamps <= end_ms
+                parts[TIMESTAMP_COLUMN].append(timestamps[mask])
+                for column, i in zip(columns, indexes):
+                    values = self.readBlock(file, chunk, i + 1, self.dtypes[i])
+                    parts[column].append(asFloatValues(values[mask]))
+        return pd.DataFrame(
+            {
+                column: np.concatenate(values) if values else np.empty(0)
+                for column, values in parts.items()
+            }
+        )
+
+
+def openArchive(file_path: str) -> RawArchive:
+    try:
+        return RawArchive(file_path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not open archive {file_path}: {e}")
+        return None
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from src.handlers.valueBuffer import asFloatValues
+
+RAW = "raw"
+CALIBRATED = "calibrated"
+FILTERED = "filtered"
+
+
+class SampleStore:
+    # Raw columns of a test, kept once in their storage dtype (float32 for
+    # compact sensors, float64 otherwise). Calibrated and filtered columns are
+    # computed in float64 when requested and kept in a cache of limited size.
+    # Columns with slope 1 and intercept 0 (IMUs) are never copied.
+    def __init__(self, cache_budget_mb: float = 256) -> None:
+        self.columns: list[str] = []
+        self.column_indexes: dict[str, int] = {}
+        self.raw_columns: list[np.ndarray] = []
+        self.size: int = 0
+        self.slopes: np.ndarray = np.empty(0)
+        self.intercepts: np.ndarray = np.empty(0)
+        # Butterworth filter coefficients
+        self.filter_ba: tuple[np.ndarray, np.ndarray] = None
+        self.cache: OrderedDict[tuple[str, str], np.ndarray] = OrderedDict()
+        self.cache_size: int = 0
+        self.cache_budget: int = int(cache_budget_mb * 1024 * 1024)
+
+    def setData(
+        self,
+        columns: list[str],
+        raw_columns: list[np.ndarray],
+        slopes: np.ndarray = None,
+        intercepts: np.ndarray = None,
+    ) -> None:
+        # Raw columns as a list, or as a block (samples x columns)
+        if isinstance(raw_columns, np.ndarray):
+            if raw_columns.ndim != 2:
+                raise ValueError("Raw block needs two dimensions")
+            raw_columns = list(raw_columns.T)
+        if len(raw_columns) != len(columns):
+            raise ValueError("Raw block needs one column per column name")
+        raw_columns = [
+            np.ascontiguousarray(asFloatValues(values)) for values in raw_columns
+        ]
+        if len({len(values) for values in raw_columns}) > 1:
+            raise ValueError("Raw columns need the same size")
+        self.columns = list(columns)
+        self.column_indexes = {column: i for i, column in enumerate(self.columns)}
+        self.raw_columns = raw_columns
+        self.size = len(raw_columns[0]) if raw_columns else 0
+        self.slopes = np.ones(len(columns)) if slopes is None else np.asarray(slopes)
+        self.intercepts = (
+            np.zeros(len(columns)) if intercepts is None else np.asarray(intercepts)
+        )
+        self.clearCache()
+
+    def clear(self) -> None:
+        self.setData([], [])
+
+    def setFilter(self, b: np.ndarray, a: np.ndarray) -> None:
+        self.filter_ba = (b, a)
+        for key in [key for key in self.cache if key[0] == FILTERED]:
+            self.cache_size -= self.cache.pop(key).nbytes
+
+    def setCacheBudget(self, cache_budget_mb: float) -> None:
+        self.cache_budget = int(cache_budget_mb * 1024 * 1024)
+        self.trimCache()
+
+    # Cache
+
+    def clearCache(self) -> None:
+        self.cache.clear()
+        self.cache_size = 0
+
+    def trimCache(self) -> None:
+        # Least recently used columns are dropped first
+        while self.cache and self.cache_size > self.cache_budget:
+            _, values = self.cache.popitem(last=False)
+            self.cache_size -= values.nbytes
+
+    def getCached(self, kind: str, column: str, compute) -> np.ndarray:
+        key = (kind, column)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        values = compute()
+        values.flags.writeable = False
+        self.cache[key] = values
+        self.cache_size += values.nbytes
+        self.trimCache()
+        return values
+
+    def getCacheSize(self) -> int:
+        return self.cache_size
+
+    # Columns
+
+    def getColumns(self) -> list[str]:
+        return self.columns
+
+    def hasColumn(self, column: str) -> bool:
+        return column in self.column_indexes
+
+    def getSize(self) -> int:
+        return self.size
+
+    def getRaw(self, column: str) -> np.ndarray:
+        return self.raw_columns[self.column_indexes[column]]
+
+    def getCalibrated(self, column: str) -> np.ndarray:
+        i = self.column_indexes[column]
+        if self.slopes[i] == 1 and self.intercepts[i] == 0:
+            return self.raw_columns[i]
+        return self.getCached(
+            CALIBRATED,
+            column,
+            lambda: self.calibrateValues(self.raw_columns[i], i),
+        )
+
+    def calibrateValues(self, values: np.ndarray, i: int) -> np.ndarray:
+        # Upcast, so float32 columns are calibrated in float64
+        calibrated = np.multiply(values, self.slopes[i], dtype=np.float64)
+        calibrated += self.intercepts[i]
+        return calibrated
+
+    def getFiltered(self, column: str) -> np.ndarray:
+        if self.filter_ba is None:
+            return self.getCalibrated(column)
+        return self.getCached(
+            FILTERED, column, lambda: self.filterValues(self.getCalibrated(column))
+        )
+
+    def filterValues(self, values: np.ndarray) -> np.ndarray:
+        # Only needed with a filter, so the store can be used without scipy
+        from scipy.signal import filtfilt
+
+        # Detached gaps are bridged, otherwise filtfilt spreads NaNs to every value
+        if np.isnan(values).any():
+            values = pd.Series(values).interpolate(limit_direction="both").to_numpy()
+        return filtfilt(*self.filter_ba, values)
+
+    def getColumnValues(self, kind: str, column: str) -> np.ndarray:
+        if kind == RAW:
+            return self.getRaw(column)
+        if kind == CALIBRATED:
+            return self.getCalibrated(column)
+        return self.getFiltered(column)
+
+    def getFrame(
+        self,
+        kind: str = RAW,
+        columns: list[str] = None,
+        idx1: int = 0,
+        idx2: int = None,
+    ) -> pd.DataFrame:
+        if columns is None:
+            columns = self.columns
+        return pd.DataFrame(
+            {
+                column: self.getColumnValues(kind, column)[idx1:idx2]
+                for column in columns
+            }
+        )
+
+    def getMemoryUsage(self) -> int:
+        return sum(values.nbytes for values in self.raw_columns) + self.cache_size
@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
 
+import os
+import numpy as np
+from datetime import datetime, timedelta
 from loguru import logger
 from src.handlers.sensorGroup import SensorGroup
 from src.handlers.sensor import Sensor
 from src.handlers import drivers
+from src.managers.configManager import diffConfigSections
+from src.managers.calibrationHistory import CalibrationHistory, openCalibrationHistory
 from src.enums.configPaths import ConfigPaths as CfgPaths
 from src.enums.sensorParams import SParams, SGParams
 from src.enums.sensorTypes import STypes, SGTypes
@@ -21,8 +26,12 @@ taobotics_conn_keys = [SParams.SERIAL]
 class ConfigYAMLHandler(Protocol):
     def setConfigValue(self, key_path: str, value) -> None: ...
 
+    def batch(self): ...
+
     def getConfigValue(self, key_path: str, default_value=None): ...
 
+    def getVersion(self) -> int: ...
+
 
 class SensorManager:
     def __init__(self) -> None:
@@ -32,27 +41,160 @@ class SensorManager:
         self.sensor_groups: list[SensorGroup] = []
         self.loadcell_calib_ref: Sensor = None
         self.platform_calib_ref: list[Sensor] = []
+        self.keep_connections: bool = True
+        self.compact_storage: bool = True
+        # Config sections of the loaded sensors, to compare them on reload
+        self.config_groups: dict = {}
+        self.loadcell_calib_id: str = None
+        self.platform_calib_ids: list[str] = []
+        # Sensors kept from the previous config while reloading
+        self.sensor_pool: dict[str, Sensor] = {}
+        # Saved calibrations, to warn about drifting calibrations on load
+        self.calib_history: CalibrationHistory = None
+        self.calib_history_path: str = os.path.join(
+            os.path.dirname(__file__), "..", "..", "calibration_history.db"
+        )
+        self.drift_threshold: float = 0.05
+        self.drift_days: int = 365
 
     def setup(self, config_manager: ConfigYAMLHandler) -> None:
         self.config_mngr = config_manager
+        self.readConfigSections()
+        self.clearSensors()
+        # Load sensor groups
+        self.loadSensorGroups(self.config_groups)
+        # Load calibration sensors
+        self.loadcell_calib_ref = self.loadSensor(self.loadcell_calib_id)
+        self.platform_calib_ref = self.loadCalibPlatformSensors(self.platform_calib_ids)
+        self.checkCalibrationDrift()
+
+    def reload(self, config_manager: ConfigYAMLHandler) -> None:
+        # Only create, update or remove the sensors and groups that changed,
+        # so unchanged sensors keep their drivers and open connections.
+        if not self.sensor_groups:
+            self.setup(config_manager)
+            return
+        old_sensors = self.config_sensors
+        old_groups = self.config_groups
+        old_loadcell_calib_id = self.loadcell_calib_id
+        old_platform_calib_ids = self.platform_calib_ids
+        self.config_mngr = config_manager
+        self.readConfigSections()
+        _, removed, changed = diffConfigSections(old_sensors, self.config_sensors)
+        _, _, changed_groups = diffConfigSections(old_groups, self.config_groups)
+
+        def keepSensor(sensor: Sensor) -> bool:
+            sensor_id = sensor.getID()
+            if sensor_id in removed:
+                return False
+            if sensor_id in changed and not self.isSameDevice(
+                old_sensors[sensor_id], self.config_sensors[sensor_id]
+            ):
+                return False
+            # Kept sensors read the sections of the new config, changed or not
+            sensor.setConfigVersion(self.config_mngr.getVersion)
+            sensor.updateParams(self.config_sensors[sensor_id])
+            sensor.setKeepWarm(self.keep_connections)
+            sensor.setCompactStorage(self.compact_storage)
+            return True
+
+        # Group sensors
+        old_group_objects = {group.getID(): group for group in self.sensor_groups}
+        self.sensor_pool = {}
+        for group in old_group_objects.values():
+            for sensor in group.getSensors().values():
+                if keepSensor(sensor):
+                    self.sensor_pool[sensor.getID()] = sensor
+                else:
+                    sensor.release()
+        new_groups: list[SensorGroup] = []
+        for group_id in self.config_groups:
+            group = old_group_objects.get(group_id)
+            if (
+                group is not None
+                and group_id not in changed_groups
+                and all(
+                    sensor_id in self.sensor_pool for sensor_id in group.getSensors()
+                )
+            ):
+                [self.sensor_pool.pop(sensor_id) for sensor_id in group.getSensors()]
+                new_groups.append(group)
+                continue
+            group = self.loadSensorGroup(group_id, self.config_groups[group_id])
+            if group is not None:
+                new_groups.append(group)
+                logger.info(f"Sensor group {group_id} reloaded.")
+        [sensor.release() for sensor in self.sensor_pool.values()]
+        self.sensor_pool = {}
+        self.sensor_groups[:] = new_groups
+
+        # Calibration sensors
+        if self.loadcell_calib_ref is None or not (
+            self.loadcell_calib_id == old_loadcell_calib_id
+            and keepSensor(self.loadcell_calib_ref)
+        ):
+            if self.loadcell_calib_ref is not None:
+                self.loadcell_calib_ref.release()
+            self.loadcell_calib_ref = self.loadSensor(self.loadcell_calib_id)
+        platform_calib_ref = self.platform_calib_ref or []
+        if not (
+            platform_calib_ref
+            and self.platform_calib_ids == old_platform_calib_ids
+            and all([keepSensor(sensor) for sensor in platform_calib_ref])
+        ):
+            [sensor.release() for sensor in platform_calib_ref]
+            self.platform_calib_ref = self.loadCalibPlatformSensors(
+                self.platform_calib_ids
+            )
+        self.checkCalibrationDrift()
+
+    def readConfigSections(self) -> None:
         self.config_sensors = self.config_mngr.getConfigValue(
             CfgPaths.SENSORS_SECTION.value, {}
         )
-        config_groups = self.config_mngr.getConfigValue(
+        self.config_groups = self.config_mngr.getConfigValue(
             CfgPaths.SENSOR_GROUPS_SECTION.value, {}
         )
-        loadcell_calib_id = self.config_mngr.getConfigValue(
+        self.loadcell_calib_id = self.config_mngr.getConfigValue(
             CfgPaths.CALIBRATION_LOADCELL_SENSOR.value, {}
         )
-        platform_calib_sensors = self.config_mngr.getConfigValue(
+        self.platform_calib_ids = self.config_mngr.getConfigValue(
             CfgPaths.CALIBRATION_PLATFORM_TRIAXIAL.value, []
         )
-        self.clearSensors()
-        # Load sensor groups
-        self.loadSensorGroups(config_groups)
-        # Load calibration sensors
-        self.loadcell_calib_ref = self.loadSensor(loadcell_calib_id)
-        self.platform_calib_ref = self.loadCalibPlatformSensors(platform_calib_sensors)
+        self.keep_connections = self.config_mngr.getConfigValue(
+            CfgPaths.RECORD_KEEP_CONNECTIONS.value, True
+        )
+        self.compact_storage = self.config_mngr.getConfigValue(
+            CfgPaths.RECORD_COMPACT_STORAGE.value, True
+        )
+        history_path = self.config_mngr.getConfigValue(
+            CfgPaths.CALIBRATION_HISTORY_PATH.value, None
+        )
+        if history_path:
+            self.calib_history_path = history_path
+        self.drift_threshold = self.config_mngr.getConfigValue(
+            CfgPaths.CALIBRATION_DRIFT_THRESHOLD.value, 0.05
+        )
+        self.drift_days = self.config_mngr.getConfigValue(
+            CfgPaths.CALIBRATION_DRIFT_DAYS.value, 365
+        )
+        if (
+            self.calib_history is None
+            or self.calib_history.getFilePath() != self.calib_history_path
+        ):
+            self.calib_history = openCalibrationHistory(self.calib_history_path)
+
+    def isSameDevice(self, old_content: dict, new_content: dict) -> bool:
+        # Sensors with the same type and connection can keep their driver
+        if not isinstance(new_content, dict):
+            return False
+        if not all(key.value in new_content.keys() for key in sensor_keys):
+            return False
+        return (
+            old_content.get(SParams.TYPE.value) == new_content[SParams.TYPE.value]
+            and old_content.get(SParams.CONNECTION_SECTION.value)
+            == new_content[SParams.CONNECTION_SECTION.value]
+        )
 
     def loadSensorGroups(self, config_groups: dict) -> None:
         if not config_groups:
@@ -93,9 +235,19 @@ class SensorManager:
             id, content[SGParams.NAME.value], SGTypes[content[SGParams.TYPE.value]]
         )
         sensor_group.setRead(content[SGParams.READ.value])
+        if content.get(SGParams.CALIBRATION_MATRIX.value) is not None:
+            matrix = np.asarray(content[SGParams.CALIBRATION_MATRIX.value], dtype=float)
+            if matrix.shape == (6, 12):
+                sensor_group.setCalibrationMatrix(matrix)
+            else:
+                logger.warning(
+                    f"Sensor group {id} calibration matrix is not 6x12! Ignored."
+                )
         # Load all sensors for this sensor group
         for sensor_id in content[SGParams.SENSOR_LIST.value]:
-            sensor = self.loadSensor(sensor_id)
+            sensor = self.sensor_pool.pop(sensor_id, None)
+            if sensor is None:
+                sensor = self.loadSensor(sensor_id)
             if sensor is not None:
                 sensor_group.addSensor(sensor)
         # Check if any sensor has been loaded
@@ -123,6 +275,9 @@ class SensorManager:
             return None
         # Check sensor type required keys and setup
         sensor = Sensor()
+        sensor.setConfigVersion(self.config_mngr.getVersion)
+        sensor.setKeepWarm(self.keep_connections)
+        sensor.setCompactStorage(self.compact_storage)
         if content[SParams.TYPE.value] == STypes.SENSOR_LOADCELL.name:
             if not all(
                 key.value in content[SParams.CONNECTION_SECTION.value].keys()
@@ -184,7 +339,15 @@ class SensorManager:
                 return []
         return sensor_list
 
+    def releaseSensors(self) -> None:
+        [group.release() for group in self.sensor_groups]
+        if self.loadcell_calib_ref is not None:
+            self.loadcell_calib_ref.release()
+        [sensor.release() for sensor in self.platform_calib_ref or []]
+
     def clearSensors(self) -> None:
+        # Close warm channels before dropping their handlers
+        self.releaseSensors()
         self.sensor_groups.clear()
         self.loadcell_calib_ref = None
         self.platform_calib_ref = None
@@ -226,6 +389,10 @@ class SensorManager:
                 )
                 return
 
+    def configBatch(self):
+        # Group several config changes in a single config file write
+        return self.config_mngr.batch()
+
     def setSensorSlopeByID(self, group_id: str, sensor_id: str, slope: float) -> None:
         group = self.getGroup(group_id)
         if group is None:
@@ -268,6 +435,78 @@ class SensorManager:
             intercept,
         )
 
+    def setGroupCalibrationMatrix(
+        self, sensor_group: SensorGroup, matrix: np.ndarray
+    ) -> None:
+        sensor_group.setCalibrationMatrix(np.asarray(matrix, dtype=float))
+        self.config_mngr.setConfigValue(
+            CfgPaths.SENSOR_GROUPS_SECTION.value
+            + "."
+            + sensor_group.getID()
+            + "."
+            + SGParams.CALIBRATION_MATRIX.value,
+            np.asarray(matrix, dtype=float).tolist(),
+        )
+
+    # Calibration history
+
+    def recordSensorCalibration(self, sensor: Sensor, source: str = "") -> None:
+        if self.calib_history is None:
+            return
+        self.calib_history.addSensorCalibration(
+            sensor.getID(),
+            sensor.getSlope(),
+            sensor.getIntercept(),
+            sensor_name=sensor.getName(),
+            source=source,
+        )
+
+    def recordGroupCalibration(
+        self,
+        sensor_group: SensorGroup,
+        std_dev_matrix: np.ndarray = None,
+        source: str = "",
+    ) -> None:
+        if self.calib_history is None:
+            return
+        self.calib_history.addPlatformCalibration(
+            sensor_group.getID(),
+            sensor_group.getCalibrationMatrix(),
+            std_dev_matrix,
+            group_name=sensor_group.getName(),
+            source=source,
+        )
+        for sensor in sensor_group.getSensors().values():
+            self.recordSensorCalibration(sensor, source)
+
+    def checkCalibrationDrift(self) -> None:
+        # Warn when loaded calibrations differ from the saved ones of the last days
+        if self.calib_history is None:
+            return
+        since = datetime.now() - timedelta(days=self.drift_days)
+        for group in self.sensor_groups:
+            if group.getCalibrationMatrix() is not None:
+                drift = self.calib_history.getPlatformDrift(
+                    group.getID(), group.getCalibrationMatrix(), since
+                )
+                if drift is not None and drift > self.drift_threshold:
+                    logger.warning(
+                        f"Sensor group {group.getID()} calibration matrix drifted "
+                        + f"{drift:.1%} from its calibrations of the last {self.drift_days} days."
+                    )
+            for sensor in group.getSensors().values():
+                drift = self.calib_history.getSensorDrift(
+                    sensor.getID(), sensor.getSlope(), since
+                )
+                if drift is not None and drift > self.drift_threshold:
+                    logger.warning(
+                        f"Sensor {sensor.getID()} slope drifted {drift:.1%} "
+                        + f"from its calibrations of the last {self.drift_days} days."
+                    )
+
+    def getCalibrationHistory(self) -> CalibrationHistory:
+        return self.calib_history
+
     def getGroups(
         self, only_available: bool = False, group_type: SGTypes = None
     ) -> list[SensorGroup]:
@@ -288,6 +527,24 @@ class SensorManager:
                 return group
         return None
 
+    def getSensorStats(self, only_available: bool = True) -> list[dict]:
+        stats_list: list[dict] = []
+        for group in self.getGroups(only_available=only_available):
+            for sensor in group.getSensors(only_available=only_available).values():
+                sensor_stats = {
+                    "group": group.getID(),
+                    "sensor": sensor.getID(),
+                    "name": sensor.getName(),
+                }
+                sensor_stats.update(sensor.getStats().getSummary())
+                sensor_stats["gaps"] = len(sensor.getGaps())
+                sensor_stats["gap_times_ms"] = " ".join(
+                    f"{start}:{'' if end is None else end}"
+                    for start, end in sensor.getGaps()
+                )
+                stats_list.append(sensor_stats)
+        return stats_list
+
     def getSensorCalibRef(self) -> Sensor:
         return self.loadcell_calib_ref
 
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from loguru import logger
+
+INDEX_FILE_NAME = "sessions_index.json"
+INDEX_VERSION = 1
+# File name suffixes of the files saved for each session
+SESSION_FILE_SUFFIXES = ["", "_RAW", "_DIAGNOSTICS", "_PROFILE"]
+
+
+class SessionIndex:
+    # Index of the sessions saved in a test folder. Keeps the used file names,
+    # so name checks are set lookups, and the session records to query them.
+    def __init__(self, folder_path: str) -> None:
+        self.folder_path: str = folder_path
+        self.file_path: str = os.path.join(folder_path, INDEX_FILE_NAME)
+        self.sessions: dict[str, dict] = {}
+        self.names: set[str] = set()
+        self.load()
+
+    def load(self) -> None:
+        self.sessions = {}
+        if os.path.exists(self.file_path):
+            try:
+                with open(self.file_path, "r") as file:
+                    content = json.load(file)
+                if content.get("version") == INDEX_VERSION:
+                    self.sessions = content.get("sessions", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read session index {self.file_path}: {e}")
+        # Files copied into the folder by hand are not in the index,
+        # so the folder is listed once to know every used name
+        self.names = set()
+        if os.path.isdir(self.folder_path):
+            self.names = {
+                os.path.splitext(entry)[0] for entry in os.listdir(self.folder_path)
+            }
+        for session in self.sessions.values():
+            self.names.update(
+                os.path.splitext(os.path.basename(path))[0]
+                for path in session.get("files", [])
+            )
+
+    def save(self) -> None:
+        temp_path = self.file_path + ".tmp"
+        try:
+            with open(temp_path, "w") as file:
+                json.dump(
+                    {"version": INDEX_VERSION, "sessions": self.sessions},
+                    file,
+                    indent=1,
+                )
+            os.replace(temp_path, self.file_path)
+        except OSError as e:
+            logger.error(f"Could not save session index {self.file_path}: {e}")
+
+    # Names
+
+    def isNameUsed(self, name: str) -> bool:
+        return name in self.names
+
+    def isSessionNameUsed(self, name: str, suffix_num: int = 0) -> bool:
+        # Files of a session are <name>_<num><suffix>, older ones <name><suffix>_<num>
+        for suffix in SESSION_FILE_SUFFIXES:
+            if suffix_num == 0:
+                if self.isNameUsed(name + suffix):
+                    return True
+                continue
+            if self.isNameUsed(f"{name}_{suffix_num}{suffix}"):
+                return True
+            if self.isNameUsed(f"{name}{suffix}_{suffix_num}"):
+                return True
+        return False
+
+    def getFreeSuffixNum(self, name: str) -> int:
+        suffix_num = 0
+        while self.isSessionNameUsed(name, suffix_num):
+            suffix_num += 1
+        return suffix_num
+
+    def addFile(self, file_path: str) -> None:
+        self.names.add(os.path.splitext(os.path.basename(file_path))[0])
+
+    # Sessions
+
+    def addSession(self, record: dict) -> None:
+        self.sessions[record["name"]] = record
+        [self.addFile(path) for path in record.get("files", [])]
+        self.save()
+
+    def getSession(self, name: str) -> dict:
+        return self.sessions.get(name)
+
+    def getSessions(
+        self,
+        name: str = None,
+        channel: str = None,
+        since: datetime = None,
+        until: datetime = None,
+        min_duration_s: float = None,
+    ) -> list[dict]:
+        # Sessions sorted by start time, filtered by name part, channel and dates
+        sessions = []
+        for session in self.sessions.values():
+            if name is not None and name.lower() not in session["name"].lower():
+                continue
+            if channel is not None and channel not in session["channels"]:
+                continue
+            start_time = datetime.fromisoformat(session["start_time"])
+            if since is not None and start_time < since:
+                continue
+            if until is not None and start_time > until:
+                continue
+            if min_duration_s is not None and session["duration_s"] < min_duration_s:
+                continue
+            sessions.append(session)
+        return sorted(sessions, key=lambda session: session["start_time"])
+
+    def getFolderPath(self) -> str:
+        return self.folder_path
+
+
+def buildSessionRecord(
+    name: str, timestamps: list, df: pd.DataFrame, files: list[str]
+) -> dict:
+    # Timestamps are in ms
+    times = np.asarray(timestamps, dtype=float)
+    duration_s = float((times[-1] - times[0]) / 1000) if len(times) > 1 else 0.0
+    stats = {}
+    for column in df.columns:
+        values = pd.to_numeric(df[column], errors="coerce").to_numpy(float)
+        valid = values[~np.isnan(values)]
+        stats[column] = {
+            "mean": float(valid.mean()) if len(valid) else None,
+            "std": float(valid.std()) if len(valid) else None,
+            "min": float(valid.min()) if len(valid) else None,
+            "max": float(valid.max()) if len(valid) else None,
+            "missing": int(len(values) - len(valid)),
+        }
+    return {
+        "name": name,
+        "start_time": (
+            datetime.fromtimestamp(times[0] / 1000).isoformat()
+            if len(times)
+            else datetime.now().isoformat()
+        ),
+        "duration_s": duration_s,
+        "samples": len(times),
+        "sample_rate_hz": (len(times) - 1) / duration_s if duration_s > 0 else 0.0,
+        "channels": df.columns.tolist(),
+        "files": files,
+        "stats": stats,
+    }
+
+
+def main() -> None:
+    # List the indexed sessions of a test folder:
+    # python -m src.managers.sessionIndex <folder> [--name N] [--channel C] [--since D]
+    parser = argparse.ArgumentParser(description="List indexed test sessions")
+    parser.add_argument("folder", help="Test folder with a session index")
+    parser.add_argument("--name", help="Part of the session name")
+    parser.add_argument("--channel", help="Sessions with this channel")
+    parser.add_argument("--since", help="Sessions started since this ISO date")
+    parser.add_argument("--until", help="Sessions started until this ISO date")
+    parser.add_argument("--min-duration", type=float, help="Minimum duration (s)")
+    args = parser.parse_args()
+    index = SessionIndex(args.folder)
+    sessions = index.getSessions(
+        name=args.name,
+        channel=args.channel,
+        since=datetime.fromisoformat(args.since) if args.since else None,
+        until=datetime.fromisoformat(args.until) if args.until else None,
+        min_duration_s=args.min_duration,
+    )
+    for session in sessions:
+        sys.stdout.write(
+            f"{session['start_time']}  {session['name']}  "
+            + f"{session['duration_s']:.1f} s  {session['sample_rate_hz']:.1f} Hz  "
+            + f"{len(session['channels'])} channels\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import yaml
+import concurrent.futures
+import numpy as np
+import pandas as pd
+from abc import ABC, abstractmethod
+from loguru import logger
+from src.handlers.valueBuffer import asFloatValues, asStorageValues
+
+# Binary sessions are a folder with one .npy file per column, opened memory-mapped
+SESSION_INDEX = "index.json"
+SESSION_CONFIG = "config.yaml"
+SESSION_VERSION = 2
+# Version 1 sessions are float64 only, version 2 ones keep the storage dtypes
+SUPPORTED_VERSIONS = [1, 2]
+TIMESTAMP_COLUMN = "timestamp"
+RAW_SUFFIX = "_RAW"
+SESSION_EXTENSION = ".session"
+
+
+class Session(ABC):
+    # Recorded test with lazy column access: columns are only read when requested
+    # and then kept, so plots only touch the columns they need.
+    def __init__(self, path: str, columns: list[str], config: dict = None) -> None:
+        self.path: str = path
+        self.columns: list[str] = columns
+        self.config: dict = config
+        self.timestamps: np.ndarray = None
+        self.calibrated: dict[str, np.ndarray] = {}
+        self.raw: dict[str, np.ndarray] = {}
+
+    @abstractmethod
+    def readColumns(self, columns: list[str], raw: bool) -> dict[str, np.ndarray]: ...
+
+    @abstractmethod
+    def readTimestamps(self) -> np.ndarray: ...
+
+    @abstractmethod
+    def hasRaw(self) -> bool: ...
+
+    # Column access
+
+    def getColumns(self) -> list[str]:
+        return self.columns
+
+    def getTimestamps(self) -> np.ndarray:
+        if self.timestamps is None:
+            self.timestamps = self.readTimestamps()
+        return self.timestamps
+
+    def getSize(self) -> int:
+        return len(self.getTimestamps())
+
+    def getColumn(self, column: str, raw: bool = False) -> np.ndarray:
+        return self.getColumnsData([column], raw)[column]
+
+    def getColumnsData(
+        self, columns: list[str] = None, raw: bool = False
+    ) -> dict[str, np.ndarray]:
+        if columns is None:
+            columns = self.columns
+        unknown = [column for column in columns if column not in self.columns]
+        if unknown:
+            raise KeyError(f"Columns not found in session {self.path}: {unknown}")
+        if raw and not self.hasRaw():
+            raise KeyError(f"Session {self.path} has no raw values")
+        cache = self.raw if raw else self.calibrated
+        missing = [column for column in columns if column not in cache]
+        if missing:
+            cache.update(self.readColumns(missing, raw))
+        return {column: cache[column] for column in columns}
+
+    def getDataFrame(self, columns: list[str] = None, raw: bool = False):
+        return pd.DataFrame(self.getColumnsData(columns, raw), copy=False)
+
+    def load(
+        self, columns: list[str] = None
+    ) -> tuple[pd.DataFrame, pd.DataFrame | None]:
+        # Calibrated and raw columns are read at the same time, no raw frame if
+        # the session only has calibrated values
+        if not self.hasRaw():
+            return (self.getDataFrame(columns), None)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            calibrated = executor.submit(self.getDataFrame, columns, False)
+            raw = executor.submit(self.getDataFrame, columns, True)
+            return (calibrated.result(), raw.result())
+
+    def getConfig(self) -> dict:
+        return self.config
+
+    def getPath(self) -> str:
+        return self.path
+
+
+class CSVSession(Session):
+    # Saved <name>.csv and <name>_RAW.csv files, read with explicit float dtypes
+    def __init__(self, file_path: str) -> None:
+        self.raw_path: str = None
+        base_path, _ = os.path.splitext(file_path)
+        if base_path.endswith(RAW_SUFFIX):
+            base_path = base_path[: -len(RAW_SUFFIX)]
+            if os.path.exists(base_path + ".csv"):
+                file_path = base_path + ".csv"
+        if os.path.exists(base_path + RAW_SUFFIX + ".csv"):
+            self.raw_path = base_path + RAW_SUFFIX + ".csv"
+        self.file_path: str = file_path
+        header = pd.read_csv(file_path, nrows=0).columns.tolist()
+        super().__init__(file_path, header[1:])
+
+    def readCSV(self, file_path: str, columns: list[str]) -> pd.DataFrame:
+        dtypes = {column: np.float64 for column in columns}
+        return pd.read_csv(file_path, usecols=columns, dtype=dtypes, engine="c")
+
+    def readColumns(self, columns: list[str], raw: bool) -> dict[str, np.ndarray]:
+        df = self.readCSV(self.raw_path if raw else self.file_path, columns)
+        return {column: df[column].to_numpy() for column in columns}
+
+    def readTimestamps(self) -> np.ndarray:
+        df = pd.read_csv(self.file_path, usecols=[0], dtype=np.int64, engine="c")
+        return df.iloc[:, 0].to_numpy()
+
+    def hasRaw(self) -> bool:
+        return self.raw_path is not None
+
+
+class BinarySession(Session):
+    # Session folder written by writeSession, with memory-mapped columns
+    def __init__(self, folder_path: str) -> None:
+        with open(os.path.join(folder_path, SESSION_INDEX), "r") as file:
+            self.index: dict = json.load(file)
+        if self.index.get("version") not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported session version in {folder_path}")
+        config = None
+        config_path = os.path.join(folder_path, SESSION_CONFIG)
+        if os.path.exists(config_path):
+            with open(config_path, "r") as file:
+                config = yaml.safe_load(file)
+        super().__init__(folder_path, self.index["columns"], config)
+
+    def openArray(self, file_name: str) -> np.ndarray:
+        return np.load(os.path.join(self.path, file_name), mmap_mode="r")
+
+    def readColumns(self, columns: list[str], raw: bool) -> dict[str, np.ndarray]:
+        # Float columns stay memory-mapped, integer ones are upcast with NaN gaps
+        folder = "raw" if raw else "calibrated"
+        return {
+            column: asFloatValues(
+                self.openArray(
+                    os.path.join(folder, f"{self.columns.index(column)}.npy")
+                )
+            )
+            for column in columns
+        }
+
+    def readTimestamps(self) -> np.ndarray:
+        return self.openArray(TIMESTAMP_COLUMN + ".npy")
+
+    def hasRaw(self) -> bool:
+        return self.index.get("raw", False)
+
+
+def openSession(path: str) -> Session:
+    # Opens a binary <name>.session folder, or the CSV files of a session
+    if os.path.isdir(path):
+        return BinarySession(path)
+    if path.endswith(".csv"):
+        return CSVSession(path)
+    raise ValueError(f"Unknown session format: {path}")
+
+
+def writeSession(
+    folder_path: str,
+    timestamps: list,
+    df_calibrated: pd.DataFrame,
+    df_raw: pd.DataFrame = None,
+    config: dict = None,
+    dtypes: dict[str, np.dtype] = None,
+) -> None:
+    # Raw columns are saved in their storage dtype (float64 if not given),
+    # and calibrated ones in float32 if their raw values are float32
+    dtypes = {column: np.dtype(dtype) for column, dtype in (dtypes or {}).items()}
+    if df_raw is not None and df_raw.columns.tolist() != df_calibrated.columns.tolist():
+        raise ValueError("Raw and calibrated session columns do not match")
+    folders = {"calibrated": df_calibrated}
+    if df_raw is not None:
+        folders["raw"] = df_raw
+    for folder, df in folders.items():
+        os.makedirs(os.path.join(folder_path, folder), exist_ok=True)
+        for i, column in enumerate(df.columns):
+            dtype = dtypes.get(column, np.dtype(np.float64))
+            if folder == "calibrated" and dtype != np.float32:
+                dtype = np.dtype(np.float64)
+            np.save(
+                os.path.join(folder_path, folder, f"{i}.npy"),
+                asStorageValues(df[column].to_numpy(), dtype),
+            )
+    np.save(
+        os.path.join(folder_path, TIMESTAMP_COLUMN + ".npy"),
+        np.asarray(timestamps, dtype=np.int64),
+    )
+    if config is not None:
+        with open(os.path.join(folder_path, SESSION_CONFIG), "w") as file:
+            yaml.safe_dump(config, file, sort_keys=False)
+    # Index is written last, so unfinished sessions can not be opened
+    with open(os.path.join(folder_path, SESSION_INDEX), "w") as file:
+        json.dump(
+            {
+                "version": SESSION_VERSION,
+                "rows": len(timestamps),
+                "columns": df_calibrated.columns.tolist(),
+                "raw": df_raw is not None,
+            },
+            file,
+        )
+    logger.info(f"Session saved in {folder_path}")
@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
 
 import time
+import threading
+import concurrent.futures
 from loguru import logger
 from src.handlers.sensorGroup import SensorGroup
+from src.enums.sensorStatus import SStatus
+from src.enums.cameraStatus import CStatus
+from src.managers.profileManager import profiler
 from src.qtUIs.threads.cameraThread import CameraRecordThread
 
 
@@ -14,6 +19,9 @@ class TestManager:
         self.camera_threads: list[CameraRecordThread] = []
         self.sensors_connected: bool = False
         self.test_times: list = []
+        # Device id -> (probe time, connection params) of the last successful probe
+        self.probe_cache: dict[str, tuple[float, str]] = {}
+        self.probe_cache_ttl_s: float = 60
 
     # Setters and getters
     def setSensorGroups(self, sensor_groups: list[SensorGroup]) -> None:
@@ -28,15 +36,123 @@ class TestManager:
     def getTestTimes(self) -> list:
         return self.test_times
 
+    def clearProbeCache(self) -> None:
+        self.probe_cache.clear()
+
     # Test methods
-    def checkConnection(self) -> bool:
-        connection_results_list = [
-            handler.checkConnections() for handler in self.sensor_groups
-        ]
-        [thread.getCamera().connect(check=True) for thread in self.camera_threads]
+    def checkConnection(
+        self,
+        progress_fn=None,
+        cancel_event: threading.Event = None,
+        timeout_s: float = 10,
+    ) -> bool:
+        # Probe every sensor and camera concurrently, reporting each result
+        # through progress_fn(device_name, connected, checked_amount, total_amount).
+        # Probes are (device, probe_fn, available, discard_fn), discard_fn undoes
+        # the probes that finish after the check gave up on them.
+        probes: dict[str, tuple] = {}
+        for group in self.sensor_groups:
+            if not group.getRead():
+                group.updateStatus([])
+                continue
+            for sensor in group.getSensors().values():
+                # Cached probes only hold for channels still open and attached
+                probes[sensor.getID()] = (
+                    sensor,
+                    sensor.checkConnection,
+                    sensor.getStatus() == SStatus.AVAILABLE
+                    and sensor.getRead()
+                    and sensor.isWarm()
+                    and not sensor.isDetached(),
+                    lambda sensor=sensor: self.discardSensorProbe(sensor),
+                )
+        for thread in self.camera_threads:
+            camera = thread.getCamera()
+            probes[camera.getID()] = (
+                camera,
+                lambda camera=camera: camera.connect(check=True),
+                camera.getStatus() == CStatus.AVAILABLE and camera.getRead(),
+                lambda camera=camera: camera.setStatus(CStatus.NOT_FOUND),
+            )
+
+        results: dict[str, bool] = {}
+        total = len(probes)
+        executor = concurrent.futures.ThreadPoolExecutor()
+        futures: dict[concurrent.futures.Future, str] = {}
+        for device_id, (device, probe_fn, available, _) in probes.items():
+            if available and self.isProbeCached(device_id, device):
+                results[device_id] = True
+                self.notifyProbe(progress_fn, device, True, len(results), total)
+                continue
+            futures[executor.submit(probe_fn)] = device_id
+
+        pending = set(futures)
+        deadline = time.monotonic() + timeout_s
+        while pending:
+            if cancel_event is not None and cancel_event.is_set():
+                logger.warning("Connection check cancelled.")
+                break
+            if time.monotonic() > deadline:
+                logger.warning(
+                    f"Connection check timed out after {timeout_s} s"
+                    + f" with {len(pending)} devices pending."
+                )
+                break
+            done, pending = concurrent.futures.wait(
+                pending, timeout=0.1, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                device_id = futures[future]
+                device = probes[device_id][0]
+                connected = future.exception() is None and bool(future.result())
+                results[device_id] = connected
+                if connected:
+                    self.probe_cache[device_id] = (
+                        time.monotonic(),
+                        str(device.getConnectionParams()),
+                    )
+                else:
+                    self.probe_cache.pop(device_id, None)
+                self.notifyProbe(progress_fn, device, connected, len(results), total)
+        # Late results must not change devices reported as not connected
+        for future in pending:
+            discard_fn = probes[futures[future]][3]
+            future.add_done_callback(lambda _, discard_fn=discard_fn: discard_fn())
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        # Devices without result (cancelled or timed out) count as not connected
+        connection_results_list = []
+        for group in self.sensor_groups:
+            if not group.getRead():
+                continue
+            connection_results_list.append(
+                group.updateStatus(
+                    [results.get(sensor_id, False) for sensor_id in group.getSensors()]
+                )
+            )
         self.sensors_connected = any(connection_results_list)
         return self.sensors_connected
 
+    def discardSensorProbe(self, sensor) -> None:
+        sensor.release()
+        sensor.setStatus(SStatus.NOT_FOUND)
+
+    def isProbeCached(self, device_id: str, device) -> bool:
+        if device_id not in self.probe_cache:
+            return False
+        probe_time, connection_params = self.probe_cache[device_id]
+        if time.monotonic() - probe_time > self.probe_cache_ttl_s:
+            return False
+        return connection_params == str(device.getConnectionParams())
+
+    def notifyProbe(
+        self, progress_fn, device, connected: bool, checked: int, total: int
+    ) -> None:
+        if progress_fn is None:
+            return
+        progress_fn(device.getName(), connected, checked, total)
+
+    @profiler.track("test.start")
     def testStart(self, test_folder_path: str, test_name: str) -> None:
         logger.info(f"Starting test: {test_name}")
         self.test_times.clear()
@@ -46,10 +162,12 @@ class TestManager:
             thread.setFilePath(test_folder_path + "/" + test_name)
             thread.start()
 
+    @profiler.track("test.tick")
     def testRegisterValues(self) -> None:
         self.test_times.append(round(time.time() * 1000))
         [handler.register() for handler in self.sensor_groups]
 
+    @profiler.track("test.stop")
     def testStop(self, test_name: str) -> None:
         logger.info(f"Finish test: {test_name}")
         [handler.stop() for handler in self.sensor_groups]
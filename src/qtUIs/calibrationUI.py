@@ -9,10 +9,12 @@ from src.managers.sensorManager import SensorManager
 from src.managers.calibrationManager import (
     SensorCalibrationManager,
     PlatformCalibrationManager,
+    MultiPlatformCalibrationManager,
 )
 from src.qtUIs.widgets.calibrationPanelWidget import (
     SensorCalibrationPanelWidget,
     PlatformCalibrationPanelWidget,
+    MultiPlatformCalibrationPanelWidget,
 )
 from src.qtUIs.widgets.mainWidgets import CalibrationSelector
 from src.qtUIs.widgets import customQtLoaders as customQT
@@ -41,6 +43,8 @@ class CalibrationUI(QtWidgets.QWidget):
         )
         if self.platform_selector.count() > 0:
             self.platform_calibrate_button.setEnabled(True)
+        if self.platform_selector.count() > 1:
+            self.all_platforms_calibrate_button.setEnabled(True)
         if self.sensor_selector.count() > 0:
             self.sensor_calibrate_button.setEnabled(True)
         pass
@@ -72,6 +76,9 @@ class CalibrationUI(QtWidgets.QWidget):
         record_amount: int = self.cfg_mngr.getConfigValue(
             ConfigPaths.CALIBRATION_DATA_AMOUNT.value, 300
         )
+        keep_raw_values: bool = self.cfg_mngr.getConfigValue(
+            ConfigPaths.CALIBRATION_SAVE_RAW.value, True
+        )
         # Calibration manager for platform calibration
         calib_mngr = PlatformCalibrationManager()
         calib_mngr.setup(
@@ -79,12 +86,11 @@ class CalibrationUI(QtWidgets.QWidget):
             self.sensor_mngr.getPlatformCalibRef(),
             record_interval,
             record_amount,
+            keep_raw_values,
         )
+        calib_mngr.setConvergence(*self.getConvergenceSettings())
         # Clear panel layout
-        for i in reversed(range(self.panel_layout.count())):
-            widget = self.panel_layout.itemAt(i).widget()
-            if widget is not None:
-                widget.deleteLater()
+        self.clearPanel()
         # Build layout with new calibration panel
         platform_calib_panel = PlatformCalibrationPanelWidget(
             self.sensor_mngr,
@@ -94,6 +100,38 @@ class CalibrationUI(QtWidgets.QWidget):
         self.panel_layout.addWidget(platform_calib_panel)
         pass
 
+    @QtCore.Slot()
+    def calibrateAllPlatforms(self):
+        platform_groups = self.calibration_selector.getGroups()
+        if len(platform_groups) < 2:
+            return
+        record_interval: int = self.cfg_mngr.getConfigValue(
+            ConfigPaths.CALIBRATION_INTERVAL_MS.value, 10
+        )
+        record_amount: int = self.cfg_mngr.getConfigValue(
+            ConfigPaths.CALIBRATION_DATA_AMOUNT.value, 300
+        )
+        keep_raw_values: bool = self.cfg_mngr.getConfigValue(
+            ConfigPaths.CALIBRATION_SAVE_RAW.value, True
+        )
+        # Calibration manager for all platforms at once
+        calib_mngr = MultiPlatformCalibrationManager()
+        calib_mngr.setup(
+            platform_groups,
+            self.sensor_mngr.getPlatformCalibRef(),
+            record_interval,
+            record_amount,
+            keep_raw_values,
+        )
+        calib_mngr.setConvergence(*self.getConvergenceSettings())
+        # Clear panel layout
+        self.clearPanel()
+        # Build layout with new calibration panel
+        platforms_calib_panel = MultiPlatformCalibrationPanelWidget(
+            self.sensor_mngr, calib_mngr
+        )
+        self.panel_layout.addWidget(platforms_calib_panel)
+
     @QtCore.Slot()
     def calibrateSensor(self):
         sensor = self.calibration_selector.getSelectedSensor()
@@ -112,11 +150,9 @@ class CalibrationUI(QtWidgets.QWidget):
             record_interval,
             record_amount,
         )
+        calib_mngr.setConvergence(*self.getConvergenceSettings())
         # Clear panel layout
-        for i in reversed(range(self.panel_layout.count())):
-            widget = self.panel_layout.itemAt(i).widget()
-            if widget is not None:
-                widget.deleteLater()
+        self.clearPanel()
         # Build layout with new calibration panel
         sensor_calib_panel = SensorCalibrationPanelWidget(
             self.sensor_mngr, calib_mngr, sensor.getName(), sensor.getProperties()
@@ -126,13 +162,36 @@ class CalibrationUI(QtWidgets.QWidget):
     @QtCore.Slot()
     def goToMainUI(self):
         # Clear panel layout
-        for i in reversed(range(self.panel_layout.count())):
-            widget = self.panel_layout.itemAt(i).widget()
-            if widget is not None:
-                widget.deleteLater()
+        self.clearPanel()
         self.panel_layout.addWidget(QtWidgets.QWidget())
         self.stacked_widget.setCurrentIndex(0)
 
+    def clearPanel(self) -> None:
+        # Panels stop their running measurements before they are deleted
+        for i in reversed(range(self.panel_layout.count())):
+            widget = self.panel_layout.itemAt(i).widget()
+            if widget is None:
+                continue
+            if hasattr(widget, "teardown"):
+                widget.teardown()
+            widget.deleteLater()
+
+    def getConvergenceSettings(self) -> tuple[bool, float, int, int]:
+        return (
+            self.cfg_mngr.getConfigValue(
+                ConfigPaths.CALIBRATION_CONVERGENCE.value, False
+            ),
+            self.cfg_mngr.getConfigValue(
+                ConfigPaths.CALIBRATION_SEM_THRESHOLD.value, 0.05
+            ),
+            self.cfg_mngr.getConfigValue(
+                ConfigPaths.CALIBRATION_MAX_TIME_MS.value, 10000
+            ),
+            self.cfg_mngr.getConfigValue(
+                ConfigPaths.CALIBRATION_MIN_SAMPLES.value, 100
+            ),
+        )
+
     # UI section loaders
 
     def loadInfoPanel(self) -> QtWidgets.QWidget:
@@ -165,6 +224,12 @@ class CalibrationUI(QtWidgets.QWidget):
             enabled=False,
             connect_fn=self.calibratePlatform,
         )
+        self.all_platforms_calibrate_button = customQT.createQPushButton(
+            "Calibrate all platforms",
+            QssLabels.CONTROL_PANEL_BTN,
+            enabled=False,
+            connect_fn=self.calibrateAllPlatforms,
+        )
         self.sensor_calibrate_button = customQT.createQPushButton(
             "Calibrate sensor",
             QssLabels.CONTROL_PANEL_BTN,
@@ -206,6 +271,7 @@ class CalibrationUI(QtWidgets.QWidget):
         vbox_layout.addWidget(QtWidgets.QLabel("Select platform"))
         vbox_layout.addWidget(self.platform_selector)
         vbox_layout.addWidget(self.platform_calibrate_button)
+        vbox_layout.addWidget(self.all_platforms_calibrate_button)
         vbox_layout.addItem(QtWidgets.QSpacerItem(10, 10))
         vbox_layout.addWidget(QtWidgets.QLabel("Select sensor"))
         vbox_layout.addWidget(self.sensor_selector)
@@ -4,33 +4,28 @@
 
 import os
 import yaml
-import pandas as pd
+from contextlib import nullcontext
+from src.managers.configManager import splitKeyPath
 from src.managers.sensorManager import SensorManager
 from src.managers.dataManager import DataManager
+from src.managers.sessionLoader import openSession
 from src.enums.sensorStatus import SStatus
 
 
 class DataTester:
-    def __init__(self):
-        raw_data_path = os.path.join(
-            os.path.dirname(__file__),
-            "..",
-            "..",
-            "tests",
-            "files",
-            "full_dataset_RAW.csv",
-        )
-        calib_data_path = os.path.join(
-            os.path.dirname(__file__),
-            "..",
-            "..",
-            "tests",
-            "files",
-            "full_dataset.csv",
-        )
-        self.df_raw = pd.read_csv(raw_data_path)
-        self.df = pd.read_csv(calib_data_path)
-        self.cfg_mngr = CustomConfigManager()
+    def __init__(self, session_path: str = None):
+        if session_path is None:
+            session_path = os.path.join(
+                os.path.dirname(__file__),
+                "..",
+                "..",
+                "tests",
+                "files",
+                "full_dataset.csv",
+            )
+        self.session = openSession(session_path)
+        # Sensor config saved with the session, if any
+        self.cfg_mngr = CustomConfigManager(self.session.getConfig())
 
     def overrideManagers(
         self, sensor_manager: SensorManager, data_manager: DataManager
@@ -39,27 +34,32 @@ class DataTester:
         # Modify sensor status to available
         for group in sensor_manager.getGroups():
             for sensor in group.getSensors().values():
-                sensor.status = SStatus.AVAILABLE
+                sensor.setStatus(SStatus.AVAILABLE)
         # Replace imported data
-        time_list = self.df.iloc[:, 0]
-        data_manager.df_raw = self.df_raw.iloc[:, 1:]
-        data_manager.df_calibrated = self.df.iloc[:, 1:]
-        data_manager.timestamp_list = time_list
-        data_manager.timeincr_list = [(t - time_list[0]) / 1000 for t in time_list]
+        data_manager.loadSession(self.session, sensor_manager.getGroups())
 
 
 class CustomConfigManager:
-    def __init__(self) -> None:
+    def __init__(self, session_config: dict = None) -> None:
         config_path = os.path.join(os.path.dirname(__file__), "..", "..", "config.yaml")
         with open(config_path, "r") as file:
             self.config_dict = yaml.load(file, Loader=yaml.FullLoader)
+        if session_config:
+            self.config_dict.update(session_config)
 
     def setConfigValue(self, key_path: str, value) -> None:
         pass
 
+    def batch(self):
+        return nullcontext()
+
     def getConfigValue(self, key_path: str, default_value=None):
-        keys = key_path.split(".")
+        keys = splitKeyPath(key_path)
         config = self.config_dict
         for key in keys[:-1]:
             config = config.get(key, {})
         return config.get(keys[-1], default_value)
+
+    def getVersion(self) -> int:
+        # Values are never changed, see setConfigValue
+        return 0
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import pandas as pd
 from src.enums.qssLabels import QssLabels
 from src.enums.configPaths import ConfigPaths as CfgPaths
 from src.enums.uiResources import IconPaths, ImagePaths
@@ -10,6 +11,7 @@ from src.managers.fileManager import FileManager
 from src.managers.dataManager import DataManager
 from src.managers.cameraManager import CameraManager
 from src.managers.sensorManager import SensorManager
+from src.managers.profileManager import profiler
 from src.qtUIs.widgets import customQtLoaders as customQT
 from src.qtUIs.widgets.mainWidgets import (
     SensorSettings,
@@ -19,6 +21,7 @@ from src.qtUIs.widgets.mainWidgets import (
     PlatformPlotSelector,
 )
 from src.qtUIs.dataImporter import DataTester
+from src.qtUIs.threads.connectionThread import ConnectionCheckThread
 from PySide6 import QtWidgets, QtGui, QtCore
 
 
@@ -39,6 +42,7 @@ class MainUI(QtWidgets.QWidget):
         self.test_mngr = TestManager()
         self.data_mngr = DataManager()
         self.camera_mngr = CameraManager()
+        self.locked_widgets: list[QtWidgets.QWidget] = []
 
         self.initManagers()
         self.initUI()
@@ -48,14 +52,38 @@ class MainUI(QtWidgets.QWidget):
     def initManagers(self) -> None:
         self.file_mngr = FileManager()
         self.file_mngr.setup(self.cfg_mngr)
+        self.data_mngr.setCacheBudget(
+            self.cfg_mngr.getConfigValue(CfgPaths.RECORD_DATA_CACHE_MB.value, 256)
+        )
         self.sensor_mngr.setup(self.cfg_mngr)
         self.camera_mngr.setup(self.cfg_mngr)
         self.test_mngr.setSensorGroups(self.sensor_mngr.getGroups())
         self.test_mngr.setCameraThreads(self.camera_mngr.getCameraThreads())
+        self.sensor_panels = SensorSettings(self.sensor_mngr)
+        self.camera_panels = CameraSettings(self.camera_mngr)
+
+        self.initTimers()
 
+    def reloadManagers(self) -> None:
+        # Only the sensors, groups and cameras that changed are rebuilt
+        self.file_mngr.setup(self.cfg_mngr)
+        self.data_mngr.setCacheBudget(
+            self.cfg_mngr.getConfigValue(CfgPaths.RECORD_DATA_CACHE_MB.value, 256)
+        )
+        self.sensor_mngr.reload(self.cfg_mngr)
+        self.camera_mngr.reload(self.cfg_mngr)
+        self.test_mngr.setSensorGroups(self.sensor_mngr.getGroups())
+        self.test_mngr.setCameraThreads(self.camera_mngr.getCameraThreads())
+
+    def initTimers(self) -> None:
         self.test_timer = QtCore.QTimer(self)
         self.test_timer.timeout.connect(self.test_mngr.testRegisterValues)
-        self.tare_timer = QtCore.QTimer(self)
+        self.status_timer = QtCore.QTimer(self)
+        self.status_timer.timeout.connect(self.sensor_panels.refreshStatus)
+
+        self.connection_thread = ConnectionCheckThread(self.test_mngr)
+        self.connection_thread.device_checked.connect(self.updateConnectionProgress)
+        self.connection_thread.finished.connect(self.finishConnectSensors)
 
     def initUI(self) -> None:
         self.main_layout = QtWidgets.QHBoxLayout()
@@ -91,6 +119,7 @@ class MainUI(QtWidgets.QWidget):
         self.test_timer.start(
             self.cfg_mngr.getConfigValue(CfgPaths.RECORD_INTERVAL_MS.value, 100)
         )
+        self.status_timer.start(500)
 
     @QtCore.Slot()
     def stopTest(self):
@@ -99,6 +128,7 @@ class MainUI(QtWidgets.QWidget):
 
         # Stop test
         self.test_timer.stop()
+        self.status_timer.stop()
         self.test_mngr.testStop(self.file_mngr.getFileName())
 
         # Get results from recorded data
@@ -126,6 +156,23 @@ class MainUI(QtWidgets.QWidget):
             self.file_mngr.saveDataToCSV(dataframe)
         if self.cfg_mngr.getConfigValue(CfgPaths.TEST_SAVE_RAW.value, True):
             self.file_mngr.saveDataToCSV(dataframe_raw, "_RAW")
+        if self.cfg_mngr.getConfigValue(CfgPaths.TEST_SAVE_DIAGNOSTICS.value, True):
+            self.file_mngr.saveDataToCSV(
+                pd.DataFrame(self.sensor_mngr.getSensorStats()), "_DIAGNOSTICS"
+            )
+        if self.cfg_mngr.getConfigValue(CfgPaths.TEST_SAVE_SESSION.value, False):
+            self.saveSession()
+        if self.cfg_mngr.getConfigValue(CfgPaths.TEST_SAVE_ARCHIVE.value, False):
+            self.file_mngr.saveDataToArchive(
+                self.data_mngr.timestamp_list,
+                self.data_mngr.getRawFrame(),
+                self.data_mngr.getStorageDTypes(),
+            )
+        self.saveArrowTable()
+        self.file_mngr.indexSession(
+            self.data_mngr.timestamp_list, self.data_mngr.getCalibratedFrame()
+        )
+        profiler.saveReport(self.file_mngr)
 
         self.start_button.setEnabled(True)
         self.calibration_button.setEnabled(True)
@@ -144,12 +191,12 @@ class MainUI(QtWidgets.QWidget):
         )
         tare_time_ms = int(tare_amount * tare_interval_ms)
 
-        self.tare_timer.start()
-        QtCore.QTimer.singleShot(tare_time_ms, self.tare_timer.stop)
-
-        while self.tare_timer.isActive():
-            QtCore.QCoreApplication.processEvents()
+        # The test keeps recording, tare values are taken when the time is up
+        QtCore.QTimer.singleShot(
+            tare_time_ms, lambda: self.finishTareSensors(tare_amount)
+        )
 
+    def finishTareSensors(self, tare_amount: int):
         self.data_mngr.tareSensors(self.sensor_mngr, tare_amount)
 
         self.stop_button.setEnabled(True)
@@ -168,7 +215,7 @@ class MainUI(QtWidgets.QWidget):
         )
         if config_file_path:
             self.cfg_mngr.loadConfigFile(config_file_path)
-        self.initManagers()
+        self.reloadManagers()
         self.getSensorInformation()
         # self.updatePlotTabs()
         self.updateTestStatus()
@@ -194,22 +241,50 @@ class MainUI(QtWidgets.QWidget):
 
     @QtCore.Slot()
     def connectSensors(self):
-        self.sensors_connect_button.setEnabled(False)
-        self.sensors_connection_progressbar.setValue(50)
-        self.test_mngr.checkConnection()
-        self.sensors_connection_progressbar.setValue(100)
+        if self.connection_thread.isRunning():
+            self.sensors_connect_button.setEnabled(False)
+            self.connection_thread.cancel()
+            return
+        self.connection_thread.setTimeout(
+            self.cfg_mngr.getConfigValue(
+                CfgPaths.RECORD_CONNECTION_TIMEOUT_MS.value, 10000
+            )
+        )
+        self.sensors_connect_button.setText("Cancel connection")
+        self.sensors_connection_progressbar.setValue(0)
+        self.setConnectionLock(True)
+        self.connection_thread.start()
+
+    @QtCore.Slot(str, bool, int, int)
+    def updateConnectionProgress(
+        self, device_name: str, connected: bool, checked: int, total: int
+    ):
+        self.sensors_connection_progressbar.setValue(int(checked / total * 100))
+        self.sensors_connection_progressbar.setFormat(
+            f"{device_name}: {'connected' if connected else 'not found'}"
+        )
+
+    @QtCore.Slot()
+    def finishConnectSensors(self):
+        self.setConnectionLock(False)
         self.getSensorInformation()
         self.sensors_connection_progressbar.setValue(0)
+        self.sensors_connection_progressbar.resetFormat()
         self.updateTestStatus()
+        self.sensors_connect_button.setText("Connect selected sensors")
         self.sensors_connect_button.setEnabled(True)
 
     @QtCore.Slot()
     def changePlotRange(self):
         if self.sender() is self.data_start:
-            self.data_end.setMinimum(self.data_start.value() + 1)
+            self.data_end.setMinimum(
+                self.data_start.value() + self.data_start.singleStep()
+            )
             return
         if self.sender() is self.data_end:
-            self.data_start.setMaximum(self.data_end.value() - 1)
+            self.data_start.setMaximum(
+                self.data_end.value() - self.data_end.singleStep()
+            )
             return
 
     @QtCore.Slot()
@@ -253,8 +328,9 @@ class MainUI(QtWidgets.QWidget):
             butter_order = self.filter_order_input.value()
             self.data_mngr.applyButterFilter(butter_fs, butter_fc, butter_order)
         if range:
-            idx1 = self.data_start.value()
-            idx2 = self.data_end.value()
+            idx1, idx2 = self.data_mngr.getRangeIndexes(
+                self.data_start.value(), self.data_end.value()
+            )
             self.sensor_plotter.setIndexes(idx1, idx2)
             self.platform_plotter.setIndexes(idx1, idx2)
             self.preview_plotter.updatePreview(idx1, idx2)
@@ -265,18 +341,60 @@ class MainUI(QtWidgets.QWidget):
         # Only ranges
         self.updateDataSettings(filter=False)
 
+    def saveSession(self) -> None:
+        # Sensor config is saved with the session, to load it again later
+        config = {
+            section.value: self.cfg_mngr.getConfigValue(section.value, {})
+            for section in [
+                CfgPaths.SENSOR_GROUPS_SECTION,
+                CfgPaths.SENSORS_CALIBRATION_SECTION,
+                CfgPaths.SENSORS_SECTION,
+            ]
+        }
+        df_raw = None
+        if self.cfg_mngr.getConfigValue(CfgPaths.TEST_SAVE_RAW.value, True):
+            df_raw = self.data_mngr.getRawFrame()
+        self.file_mngr.saveDataToSession(
+            self.data_mngr.timestamp_list,
+            self.data_mngr.getCalibratedFrame(),
+            df_raw,
+            config,
+            self.data_mngr.getStorageDTypes(),
+        )
+
+    def saveArrowTable(self) -> None:
+        # Arrow table of the test, saved next to the CSVs or shared with notebooks
+        save = self.cfg_mngr.getConfigValue(CfgPaths.TEST_SAVE_ARROW.value, False)
+        share = self.cfg_mngr.getConfigValue(CfgPaths.TEST_SHARE_ARROW.value, False)
+        if not save and not share:
+            return
+        table = self.data_mngr.getSessionTable({"name": self.file_mngr.getFileName()})
+        if table is None:
+            return
+        if save:
+            self.file_mngr.saveDataToArrow(table)
+        if share:
+            self.data_mngr.shareSession(self.file_mngr.getFileName(), table)
+
     @QtCore.Slot()
     def saveResults(self):
-        idx1 = self.data_start.value()
-        idx2 = self.data_end.value()
+        idx1, idx2 = self.data_mngr.getRangeIndexes(
+            self.data_start.value(), self.data_end.value()
+        )
         dataframe = self.data_mngr.getCalibrateDataframe(idx1, idx2)
         dataframe_raw = self.data_mngr.getRawDataframe(idx1, idx2)
 
         self.file_mngr.checkFileName()
         if self.cfg_mngr.getConfigValue(CfgPaths.TEST_SAVE_CALIB.value, True):
             self.file_mngr.saveDataToCSV(dataframe)
-        if self.cfg_mngr.getConfigValue(CfgPaths.TEST_SAVE_RAW.value, True):
+        # Loaded sessions without raw values have no _RAW file to save
+        if dataframe_raw is not None and self.cfg_mngr.getConfigValue(
+            CfgPaths.TEST_SAVE_RAW.value, True
+        ):
             self.file_mngr.saveDataToCSV(dataframe_raw, "_RAW")
+        self.file_mngr.indexSession(
+            dataframe["timestamp"].tolist(), dataframe.iloc[:, 1:]
+        )
 
     # UI section loaders
 
@@ -411,7 +529,7 @@ class MainUI(QtWidgets.QWidget):
         file_settings_grid_layout.setAlignment(QtCore.Qt.AlignTop)
         # - Config file
         config_label = customQT.createLabelBox("Configuration file:")
-        config_button = customQT.createQPushButton(
+        self.config_button = customQT.createQPushButton(
             "Select config file", enabled=True, connect_fn=self.setConfigFile
         )
         self.config_path = QtWidgets.QLineEdit(self)
@@ -432,7 +550,7 @@ class MainUI(QtWidgets.QWidget):
         # - Build grid layout
         file_settings_grid_layout.addWidget(config_label, 0, 0)
         file_settings_grid_layout.addWidget(self.config_path, 0, 1)
-        file_settings_grid_layout.addWidget(config_button, 0, 2)
+        file_settings_grid_layout.addWidget(self.config_button, 0, 2)
         file_settings_grid_layout.addWidget(test_folder_label, 1, 0)
         file_settings_grid_layout.addWidget(self.test_folder_path, 1, 1)
         file_settings_grid_layout.addWidget(test_folder_button, 1, 2)
@@ -460,13 +578,16 @@ class MainUI(QtWidgets.QWidget):
 
         # - Data start and end points
         data_index_grid = QtWidgets.QGridLayout()
-        self.data_start = QtWidgets.QSpinBox()
-        self.data_start.valueChanged.connect(self.changePlotRange)
-        self.data_end = QtWidgets.QSpinBox()
-        self.data_end.valueChanged.connect(self.changePlotRange)
-        data_index_grid.addWidget(QtWidgets.QLabel("First index:"), 0, 0)
+        self.data_start = QtWidgets.QDoubleSpinBox()
+        self.data_end = QtWidgets.QDoubleSpinBox()
+        for time_input in [self.data_start, self.data_end]:
+            time_input.setDecimals(3)
+            time_input.setSingleStep(0.01)
+            time_input.setSuffix(" s")
+            time_input.valueChanged.connect(self.changePlotRange)
+        data_index_grid.addWidget(QtWidgets.QLabel("Start time:"), 0, 0)
         data_index_grid.addWidget(self.data_start, 0, 1)
-        data_index_grid.addWidget(QtWidgets.QLabel("Last index:"), 0, 2)
+        data_index_grid.addWidget(QtWidgets.QLabel("End time:"), 0, 2)
         data_index_grid.addWidget(self.data_end, 0, 3)
 
         # - Butterworth filter options
@@ -566,6 +687,11 @@ class MainUI(QtWidgets.QWidget):
         group_box_platforms.setLayout(self.hbox_platforms)
         group_box_cameras.setLayout(self.hbox_cameras)
         group_box_defaults.setLayout(self.hbox_defaults)
+        self.sensor_group_boxes = [
+            group_box_platforms,
+            group_box_cameras,
+            group_box_defaults,
+        ]
         hbox_bottom_groups = QtWidgets.QHBoxLayout()
         hbox_bottom_groups.addWidget(group_box_defaults)
         hbox_bottom_groups.addWidget(group_box_cameras)
@@ -707,6 +833,22 @@ class MainUI(QtWidgets.QWidget):
             self.tare_button.setEnabled(enable)
         self.start_button.setEnabled(enable)
 
+    def setConnectionLock(self, lock: bool) -> None:
+        # Probe threads use the sensors, nothing else may start, reload or toggle them
+        if lock:
+            self.locked_widgets = [
+                widget
+                for widget in [
+                    self.config_button,
+                    self.calibration_button,
+                    self.datatester_button,
+                    *self.sensor_group_boxes,
+                ]
+                if widget.isEnabled()
+            ]
+            self.setControlPanelButtons(False)
+        [widget.setEnabled(not lock) for widget in self.locked_widgets]
+
     def setDataSettings(self, enable: bool = False) -> None:
         self.reset_results_settings_button.setEnabled(enable)
         self.update_results_button.setEnabled(enable)
@@ -714,27 +856,25 @@ class MainUI(QtWidgets.QWidget):
         self.data_start.setValue(0)
         self.data_end.setValue(0)
         if enable:
-            max_value = self.data_mngr.getDataSize()
+            max_value = self.data_mngr.getDuration()
             self.data_start.setMinimum(0)
-            self.data_start.setMaximum(max_value - 1)
-            self.data_end.setMinimum(1)
+            self.data_start.setMaximum(max_value)
+            self.data_end.setMinimum(0)
             self.data_end.setMaximum(max_value)
             self.data_end.setValue(max_value)
         self.data_start.setEnabled(enable)
         self.data_end.setEnabled(enable)
 
     def getSensorInformation(self):
-        sensor_panels = SensorSettings(self.sensor_mngr)
-        camera_panels = CameraSettings(self.camera_mngr)
-        sensor_panels.updateLayout(
+        self.sensor_panels.updateLayout(
             self.hbox_platforms,
             self.sensor_mngr.getGroups(group_type=SGTypes.GROUP_PLATFORM),
         )
-        sensor_panels.updateLayout(
+        self.sensor_panels.updateLayout(
             self.hbox_defaults,
             self.sensor_mngr.getGroups(group_type=SGTypes.GROUP_DEFAULT),
         )
-        camera_panels.updateLayout(
+        self.camera_panels.updateLayout(
             self.hbox_cameras,
             self.camera_mngr.getCameras(),
         )
@@ -19,13 +19,15 @@ class MainMenu(QtWidgets.QMainWindow):
         self.setGeometry(100, 100, 1920, 1080)
 
         stacked_widget = QtWidgets.QStackedWidget()
-        config_manager = ConfigManager()
-        sensor_manager = SensorManager()
+        self.config_manager = ConfigManager()
+        # Group quick UI changes (read checkboxes, test name) in fewer config writes
+        self.config_manager.setSaveDelay(500)
+        self.sensor_manager = SensorManager()
 
         # Define UIs and connect signals
-        self.mainUI = MainUI(stacked_widget, config_manager, sensor_manager)
+        self.mainUI = MainUI(stacked_widget, self.config_manager, self.sensor_manager)
         self.calibrationUI = CalibrationUI(
-            stacked_widget, config_manager, sensor_manager
+            stacked_widget, self.config_manager, self.sensor_manager
         )
         self.mainUI.close_menu.connect(self.close)
         stacked_widget.currentChanged.connect(self.stackChangeHandler)
@@ -38,3 +40,11 @@ class MainMenu(QtWidgets.QMainWindow):
     def stackChangeHandler(self, index: int) -> None:
         if index == 1:
             self.calibrationUI.updateUI()
+
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        # Close sensor channels kept warm between tests
+        self.sensor_manager.releaseSensors()
+        # Remove the session shared with analysis processes
+        self.mainUI.data_mngr.closeSharedSession()
+        self.config_manager.flush()
+        super().closeEvent(event)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+from PySide6 import QtCore
+from typing import Protocol
+
+
+class CalibrationHandler(Protocol):
+    def registerValue(self) -> None: ...
+
+    def isConverged(self) -> bool: ...
+
+    def getRecordInterval(self) -> int: ...
+
+    def getRecordDuration(self) -> int: ...
+
+
+class CalibrationRecordThread(QtCore.QThread):
+    # Measurement progress (0-100) and registered samples
+    progress = QtCore.Signal(int, int)
+
+    def __init__(self, calibration_manager: CalibrationHandler) -> None:
+        super().__init__()
+        self.calib_mngr = calibration_manager
+        self.progress_interval_s: float = 0.1
+        self.cancel_event = threading.Event()
+
+    def run(self) -> None:
+        self.cancel_event.clear()
+        interval_s = self.calib_mngr.getRecordInterval() / 1000
+        duration_s = self.calib_mngr.getRecordDuration() / 1000
+        start = time.monotonic()
+        next_tick = start
+        last_progress = start
+        samples = 0
+        while not self.cancel_event.is_set():
+            now = time.monotonic()
+            if now - start >= duration_s:
+                break
+            if now < next_tick:
+                time.sleep(next_tick - now)
+                continue
+            self.calib_mngr.registerValue()
+            samples += 1
+            if self.calib_mngr.isConverged():
+                break
+            # Ticks are scheduled from the start time, late ticks are skipped
+            # instead of bunched, so the sample interval does not drift.
+            missed_ticks = int((now - next_tick) // interval_s)
+            next_tick += (missed_ticks + 1) * interval_s
+            if now - last_progress >= self.progress_interval_s:
+                last_progress = now
+                self.progress.emit(int((now - start) / duration_s * 100), samples)
+        self.progress.emit(100, samples)
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from PySide6 import QtCore
+from src.managers.testManager import TestManager
+
+
+class ConnectionCheckThread(QtCore.QThread):
+    # Device name, connected, checked devices, total devices
+    device_checked = QtCore.Signal(str, bool, int, int)
+
+    def __init__(self, test_manager: TestManager, timeout_ms: int = 10000) -> None:
+        super().__init__()
+        self.test_mngr = test_manager
+        self.timeout_ms = timeout_ms
+        self.cancel_event = threading.Event()
+
+    def run(self) -> None:
+        self.cancel_event.clear()
+        self.test_mngr.checkConnection(
+            progress_fn=self.device_checked.emit,
+            cancel_event=self.cancel_event,
+            timeout_s=self.timeout_ms / 1000,
+        )
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    def setTimeout(self, timeout_ms: int) -> None:
+        self.timeout_ms = timeout_ms
@@ -1,14 +1,17 @@
 # -*- coding: utf-8 -*-
 
+import pandas as pd
 from PySide6 import QtWidgets, QtCore, QtGui
 from src.enums.qssLabels import QssLabels
 from src.managers.sensorManager import SensorManager
 from src.managers.calibrationManager import (
     SensorCalibrationManager,
     PlatformCalibrationManager,
+    MultiPlatformCalibrationManager,
 )
 from src.qtUIs.widgets import customQtLoaders as customQT
 from src.qtUIs.widgets.matplotlibWidgets import PlotRegressionWidget
+from src.qtUIs.threads.calibrationThread import CalibrationRecordThread
 
 
 class SensorCalibrationPanelWidget(QtWidgets.QWidget):
@@ -22,8 +25,9 @@ class SensorCalibrationPanelWidget(QtWidgets.QWidget):
         super(SensorCalibrationPanelWidget, self).__init__()
         self.sensor_mngr = sensor_manager
         self.calib_mngr = sensor_calibration_manager
-        self.recording_timer = QtCore.QTimer(self)
-        self.recording_timer.timeout.connect(self.calib_mngr.registerValue)
+        self.record_thread = CalibrationRecordThread(self.calib_mngr)
+        self.record_thread.progress.connect(self.updateMeasurementProgress)
+        self.record_thread.finished.connect(self.finishMeasurement)
 
         self.sensor_name = sensor_name
         self.sensor_properties = sensor_properties
@@ -110,6 +114,9 @@ class SensorCalibrationPanelWidget(QtWidgets.QWidget):
         grid_measure_btns_layout.addWidget(self.manual_measure_button, 0, 1)
         grid_measure_btns_layout.addWidget(self.test_value_input, 0, 2)
         grid_measure_btns_layout.addWidget(self.remove_row_button, 0, 3)
+        self.measurement_progressbar = QtWidgets.QProgressBar()
+        self.measurement_progressbar.setValue(0)
+        grid_measure_btns_layout.addWidget(self.measurement_progressbar, 1, 0, 1, 4)
 
         # -  Results TableWidget
         self.calib_results_widget = QtWidgets.QTableWidget(3, 1)
@@ -160,6 +167,11 @@ class SensorCalibrationPanelWidget(QtWidgets.QWidget):
 
     # UI buttons click connectors
 
+    @QtCore.Slot(int, int)
+    def updateMeasurementProgress(self, progress: int, samples: int):
+        self.measurement_progressbar.setValue(progress)
+        self.measurement_progressbar.setFormat(f"{samples} values")
+
     @QtCore.Slot()
     def onTextChanged(self):
         try:
@@ -173,34 +185,24 @@ class SensorCalibrationPanelWidget(QtWidgets.QWidget):
         test_value = float(self.test_value_input.text())
         self.enableButtons(False)
         self.calib_mngr.startMeasurement(ref_value=test_value)
-        self.recording_timer.start(self.calib_mngr.getRecordInterval())
-        QtCore.QTimer.singleShot(
-            self.calib_mngr.getRecordDuration(), self.recording_timer.stop
-        )
-        while self.recording_timer.isActive():
-            QtCore.QCoreApplication.processEvents()
-        self.calib_mngr.stopMeasurement()
-        values = self.calib_mngr.getLastValues()
-        self.addMeasurementRow(values[0], values[1], values[2], values[3])
-        sensor_values, test_values = self.calib_mngr.getValuesArrays()
-        self.plot_widget.updateScatter(sensor_values, test_values)
-        self.enableButtons(True)
+        self.record_thread.start()
 
     @QtCore.Slot()
     def recordDataWithSensor(self):
         self.enableButtons(False)
         self.calib_mngr.startMeasurement(use_ref_sensor=True)
-        self.recording_timer.start(self.calib_mngr.getRecordInterval())
-        QtCore.QTimer.singleShot(
-            self.calib_mngr.getRecordDuration(), self.recording_timer.stop
-        )
-        while self.recording_timer.isActive():
-            QtCore.QCoreApplication.processEvents()
+        self.record_thread.start()
+
+    @QtCore.Slot()
+    def finishMeasurement(self):
         self.calib_mngr.stopMeasurement()
+        self.measurement_progressbar.setValue(0)
+        self.measurement_progressbar.resetFormat()
         values = self.calib_mngr.getLastValues()
         self.addMeasurementRow(values[0], values[1], values[2], values[3])
         sensor_values, test_values = self.calib_mngr.getValuesArrays()
         self.plot_widget.updateScatter(sensor_values, test_values)
+        self.updateLiveResults()
         self.enableButtons(True)
 
     @QtCore.Slot()
@@ -212,6 +214,7 @@ class SensorCalibrationPanelWidget(QtWidgets.QWidget):
             self.calib_mngr.removeMeasurement(selected_row)
         sensor_values, test_values = self.calib_mngr.getValuesArrays()
         self.plot_widget.updateScatter(sensor_values, test_values)
+        self.updateLiveResults()
         self.enableButtons(True)
 
     @QtCore.Slot()
@@ -235,6 +238,15 @@ class SensorCalibrationPanelWidget(QtWidgets.QWidget):
 
     # Widget functions
 
+    def teardown(self) -> None:
+        # The record thread must not be running when the panel is deleted
+        if not self.record_thread.isRunning():
+            return
+        self.record_thread.finished.disconnect(self.finishMeasurement)
+        self.record_thread.cancel()
+        self.record_thread.wait()
+        self.calib_mngr.stopMeasurement()
+
     def enableButtons(self, enable: bool = False):
         if not enable:
             self.save_button.setEnabled(enable)
@@ -251,6 +263,13 @@ class SensorCalibrationPanelWidget(QtWidgets.QWidget):
         self.manual_measure_button.setEnabled(enable)
         self.clear_button.setEnabled(enable)
 
+    def updateLiveResults(self):
+        # Results are solved incrementally, so they follow every measurement
+        if self.measurements_widget.rowCount() > 1:
+            self.generateResults()
+            return
+        self.updateResultsTable(0, 0, 0)
+
     def addMeasurementRow(
         self,
         test_value: float,
@@ -297,8 +316,9 @@ class PlatformCalibrationPanelWidget(QtWidgets.QWidget):
         super(PlatformCalibrationPanelWidget, self).__init__()
         self.sensor_mngr = sensor_manager
         self.calib_mngr = platform_calibration_manager
-        self.recording_timer = QtCore.QTimer(self)
-        self.recording_timer.timeout.connect(self.calib_mngr.registerValue)
+        self.record_thread = CalibrationRecordThread(self.calib_mngr)
+        self.record_thread.progress.connect(self.updateMeasurementProgress)
+        self.record_thread.finished.connect(self.finishMeasurement)
 
         self.platform_name = platform_name
 
@@ -451,6 +471,9 @@ class PlatformCalibrationPanelWidget(QtWidgets.QWidget):
         )
         vbox_measure_btns_layout.addWidget(self.auto_measure_button)
         vbox_measure_btns_layout.addWidget(self.remove_row_button)
+        self.measurement_progressbar = QtWidgets.QProgressBar()
+        self.measurement_progressbar.setValue(0)
+        vbox_measure_btns_layout.addWidget(self.measurement_progressbar)
         hbox_measure_btns_layout.addWidget(distance_info_label)
         hbox_measure_btns_layout.addLayout(grid_distance_spinboxes_layout)
         hbox_measure_btns_layout.addLayout(grid_distance_fixedpoint_layout)
@@ -520,6 +543,11 @@ class PlatformCalibrationPanelWidget(QtWidgets.QWidget):
 
     # UI buttons click connectors
 
+    @QtCore.Slot(int, int)
+    def updateMeasurementProgress(self, progress: int, samples: int):
+        self.measurement_progressbar.setValue(progress)
+        self.measurement_progressbar.setFormat(f"{samples} values")
+
     @QtCore.Slot()
     def changeFixedPoint(self):
         lm, ln = 108, 30  # TODO set this distances in config
@@ -552,15 +580,16 @@ class PlatformCalibrationPanelWidget(QtWidgets.QWidget):
                 self.distance_delta_z.value(),
             ]
         )
-        self.recording_timer.start(self.calib_mngr.getRecordInterval())
-        QtCore.QTimer.singleShot(
-            self.calib_mngr.getRecordDuration(), self.recording_timer.stop
-        )
-        while self.recording_timer.isActive():
-            QtCore.QCoreApplication.processEvents()
+        self.record_thread.start()
+
+    @QtCore.Slot()
+    def finishMeasurement(self):
         self.calib_mngr.stopMeasurement()
+        self.measurement_progressbar.setValue(0)
+        self.measurement_progressbar.resetFormat()
         values = self.calib_mngr.getLastValues()
         self.addMeasurementRow(values)
+        self.updateLiveResults()
         self.enableButtons(True)
 
     @QtCore.Slot()
@@ -570,23 +599,12 @@ class PlatformCalibrationPanelWidget(QtWidgets.QWidget):
         if selected_row >= 0:
             self.measurements_widget.removeRow(selected_row)
             self.calib_mngr.removeMeasurement(selected_row)
+        self.updateLiveResults()
         self.enableButtons(True)
 
     @QtCore.Slot()
     def generateResults(self):
-        results = self.calib_mngr.getResults()
-        self.updateResultsTable(
-            table_widget=self.calib_matrix_widget,
-            dataframe=results[0],
-            color_matrix=self.color_matrix,
-            color=(0, 128, 0),
-        )
-        self.updateResultsTable(
-            table_widget=self.std_matrix_widget,
-            dataframe=results[1],
-            color_matrix=self.color_matrix,
-            color=(0, 128, 0),
-        )
+        self.showResults(self.calib_mngr.getResults())
         self.save_button.setEnabled(True)
 
     @QtCore.Slot()
@@ -602,6 +620,16 @@ class PlatformCalibrationPanelWidget(QtWidgets.QWidget):
 
     # Widget functions
 
+    def teardown(self) -> None:
+        # The record thread must not be running when the panel is deleted
+        if self.record_thread.isRunning():
+            self.record_thread.finished.disconnect(self.finishMeasurement)
+            self.record_thread.cancel()
+            self.record_thread.wait()
+            self.calib_mngr.stopMeasurement()
+        # Pending holds are written before the bundle is closed
+        self.calib_mngr.closeBundle()
+
     def enableButtons(self, enable: bool = False):
         if not enable:
             self.save_button.setEnabled(enable)
@@ -617,6 +645,25 @@ class PlatformCalibrationPanelWidget(QtWidgets.QWidget):
         self.clear_button.setEnabled(enable)
         pass
 
+    def updateLiveResults(self):
+        # Results are solved incrementally, so they follow every measurement
+        if self.measurements_widget.rowCount() > 11:
+            self.generateResults()
+
+    def showResults(self, results: tuple[pd.DataFrame, pd.DataFrame]):
+        self.updateResultsTable(
+            table_widget=self.calib_matrix_widget,
+            dataframe=results[0],
+            color_matrix=self.color_matrix,
+            color=(0, 128, 0),
+        )
+        self.updateResultsTable(
+            table_widget=self.std_matrix_widget,
+            dataframe=results[1],
+            color_matrix=self.color_matrix,
+            color=(0, 128, 0),
+        )
+
     def addMeasurementRow(self, test_values: list[float]):
         row_position = self.measurements_widget.rowCount()
         self.measurements_widget.insertRow(row_position)
@@ -668,3 +715,44 @@ class PlatformCalibrationPanelWidget(QtWidgets.QWidget):
         )
         self.calib_mngr.clearValues()
         self.calib_mngr.setupFileManager()
+
+
+class MultiPlatformCalibrationPanelWidget(PlatformCalibrationPanelWidget):
+    def __init__(
+        self,
+        sensor_manager: SensorManager,
+        multi_platform_calibration_manager: MultiPlatformCalibrationManager,
+    ):
+        self.results: dict[str, tuple[pd.DataFrame, pd.DataFrame]] = {}
+        super(MultiPlatformCalibrationPanelWidget, self).__init__(
+            sensor_manager,
+            multi_platform_calibration_manager,
+            ", ".join(multi_platform_calibration_manager.getPlatformNames()),
+        )
+        # Results are shown for one platform at a time
+        self.results_selector = QtWidgets.QComboBox()
+        self.results_selector.addItems(self.calib_mngr.getPlatformNames())
+        self.results_selector.currentIndexChanged.connect(self.showSelectedResults)
+        self.vbox_sensor_info_layout.addWidget(QtWidgets.QLabel("Show results of"))
+        self.vbox_sensor_info_layout.addWidget(self.results_selector)
+
+    @QtCore.Slot()
+    def generateResults(self):
+        self.results = self.calib_mngr.getResults()
+        self.showSelectedResults()
+        self.save_button.setEnabled(True)
+
+    @QtCore.Slot()
+    def showSelectedResults(self):
+        platform_name = self.results_selector.currentText()
+        if platform_name not in self.results:
+            return
+        self.showResults(self.results[platform_name])
+
+    def teardown(self) -> None:
+        super().teardown()
+        self.calib_mngr.shutdownExecutor()
+
+    def clearCalibrationTest(self):
+        self.results.clear()
+        super().clearCalibrationTest()
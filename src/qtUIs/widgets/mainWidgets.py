@@ -12,7 +12,8 @@ from src.enums.qssLabels import QssLabels
 from src.enums.uiResources import IconPaths
 from src.enums.sensorTypes import STypes, SGTypes
 from src.enums.plotTypes import PlotTypes
-from src.enums.sensorStatus import SGStatus
+from src.enums.sensorStatus import SStatus, SGStatus
+from src.enums.cameraStatus import CStatus
 
 from loguru import logger
 
@@ -35,16 +36,76 @@ def clearWidgetsLayout(layout: QtWidgets.QBoxLayout) -> None:
             widget.deleteLater()
 
 
+# Place the given widgets in the layout, deleting the ones not listed.
+# Returns the deleted widgets.
+def replaceWidgetsLayout(
+    layout: QtWidgets.QBoxLayout, widgets: list[QtWidgets.QWidget]
+) -> list[QtWidgets.QWidget]:
+    deleted: list[QtWidgets.QWidget] = []
+    for i in reversed(range(layout.count())):
+        widget = layout.itemAt(i).widget()
+        if widget is not None and widget not in widgets:
+            deleted.append(widget)
+            widget.deleteLater()
+    # Adding a widget already in the layout moves it, keeping the given order
+    for widget in widgets:
+        layout.addWidget(widget)
+    return deleted
+
+
+def setStatusLabel(label: QtWidgets.QLabel, status: SStatus | SGStatus) -> None:
+    label.setPixmap(QtGui.QPixmap(status.value[0].value))
+    label.setObjectName(status.value[1].value)
+    # Object name changes need a repolish to apply the new style
+    label.style().unpolish(label)
+    label.style().polish(label)
+
+
 class SensorSettings:
     def __init__(self, sensor_manager: SensorManager):
         self.sensor_mngr = sensor_manager
+        # Status labels shown, with their handler and last drawn status
+        self.status_labels: dict[QtWidgets.QLabel, list] = {}
+        # Group panels are kept while their group is loaded
+        self.group_panels: dict[SensorGroup, QtWidgets.QWidget] = {}
 
     def updateLayout(
         self, hbox_layout: QtWidgets.QHBoxLayout, sensor_groups: list[SensorGroup]
     ) -> None:
-        clearWidgetsLayout(hbox_layout)
+        panels: list[QtWidgets.QWidget] = []
         for group in sensor_groups:
-            hbox_layout.addWidget(self.buildSensorGroupPanel(group))
+            if group not in self.group_panels:
+                self.group_panels[group] = self.buildSensorGroupPanel(group)
+            panels.append(self.group_panels[group])
+        for widget in replaceWidgetsLayout(hbox_layout, panels):
+            self.unregisterStatusLabels(widget)
+            self.group_panels = {
+                group: panel
+                for group, panel in self.group_panels.items()
+                if panel is not widget
+            }
+        self.refreshStatus()
+
+    # Live status
+
+    def refreshStatus(self) -> None:
+        for label, (handler, drawn_status) in self.status_labels.items():
+            status = handler.getLiveStatus()
+            if status is drawn_status:
+                continue
+            setStatusLabel(label, status)
+            self.status_labels[label][1] = status
+
+    def registerStatusLabel(
+        self, label: QtWidgets.QLabel, handler: Sensor | SensorGroup
+    ) -> None:
+        self.status_labels[label] = [handler, handler.getStatus()]
+
+    def unregisterStatusLabels(self, widget: QtWidgets.QWidget) -> None:
+        if widget is None:
+            return
+        for label in widget.findChildren(QtWidgets.QLabel):
+            self.status_labels.pop(label, None)
 
     # Panel builders
 
@@ -56,11 +117,19 @@ class SensorSettings:
         status_label = customQT.createIconLabelBox(
             sensor.getStatus().value[0], sensor.getStatus().value[1]
         )
+        self.registerStatusLabel(status_label, sensor)
         sensor_icon = IconPaths.GRAPH
         if sensor.getType() in _sensor_types:
             sensor_icon = _sensor_types[sensor.getType()]
         type_label = customQT.createIconLabelBox(sensor_icon, QssLabels.SENSOR)
         text = f"{sensor.getName()} \n {sensor.getProperties()}"
+        stats = sensor.getStats()
+        if stats.getReads() > 0:
+            text = text + (
+                f"\n lat {stats.getMeanLatencyMs():.3f} ms (max {stats.getMaxLatencyMs():.3f})"
+                + f" - stale {stats.getStaleRatio():.1%}"
+                + f" - {stats.getCallbackRate():.0f} Hz"
+            )
         sensor_checkbox = customQT.createSensorQCheckBox(
             text,
             QssLabels.SENSOR,
@@ -69,6 +138,11 @@ class SensorSettings:
             group_id=group_id,
             sensor_id=sensor.getID(),
         )
+        if stats.getReads() > 0:
+            histogram = stats.getLatencyHistogram()
+            sensor_checkbox.setToolTip(
+                "\n".join(f"{label}: {count}" for label, count in histogram.items())
+            )
         # Build layout
         hbox_layout.addWidget(status_label)
         hbox_layout.addWidget(type_label)
@@ -83,6 +157,7 @@ class SensorSettings:
         status_label = customQT.createIconLabelBox(
             group.getStatus().value[0], group.getStatus().value[1]
         )
+        self.registerStatusLabel(status_label, group)
         group_icon = IconPaths.DEFAULT_GROUP_ICON
         if group.getType() in _sensor_group_types:
             group_icon = _sensor_group_types[group.getType()]
@@ -127,18 +202,31 @@ class SensorSettings:
             general_layout.addWidget(widget)
         dialog_window.setModal(True)
         dialog_window.exec_()
+        self.unregisterStatusLabels(dialog_window)
 
 
 class CameraSettings:
     def __init__(self, camera_manager: CameraManager):
         self.camera_mngr = camera_manager
+        # Camera panels are kept while their camera is loaded and its status is the same
+        self.camera_panels: dict[Camera, tuple[CStatus, QtWidgets.QWidget]] = {}
 
     def updateLayout(
         self, hbox_layout: QtWidgets.QHBoxLayout, camera_list: list[Camera]
     ) -> None:
-        clearWidgetsLayout(hbox_layout)
+        panels: list[QtWidgets.QWidget] = []
         for camera in camera_list:
-            hbox_layout.addWidget(self.buildCameraPanel(camera))
+            status, panel = self.camera_panels.get(camera, (None, None))
+            if status is not camera.getStatus():
+                panel = self.buildCameraPanel(camera)
+                self.camera_panels[camera] = (camera.getStatus(), panel)
+            panels.append(panel)
+        replaceWidgetsLayout(hbox_layout, panels)
+        self.camera_panels = {
+            camera: (status, panel)
+            for camera, (status, panel) in self.camera_panels.items()
+            if panel in panels
+        }
 
     # Panel builders
 
@@ -195,11 +283,7 @@ class PreviewPlotSelector(QtWidgets.QWidget):
 
     def setupComboBox(self) -> None:
         self.combo_box.clear()
-        data_keys = self.data_mngr.getCalibrateDataframe().to_dict().keys()
-        # Avoid timestamp in combo box options
-        data_iterator = iter(data_keys)
-        next(data_iterator)
-        for key in data_iterator:
+        for key in self.data_mngr.getColumns():
             self.combo_box.addItem(key)
 
     def updateSensorFigurePlot(self, sensor_name: str) -> None:
@@ -387,28 +471,28 @@ class PlatformPlotSelector(QtWidgets.QWidget):
             ).values()
         ]
         forces_widget = self.buildOptionPanel(
-            "Total forces", PlotTypes.GROUP_PLATFORM_FORCES, sensor_list, False
+            "Total forces", PlotTypes.GROUP_PLATFORM_FORCES, sensor_group, False
         )
         if len(sensor_list) > 0 and len(sensor_list) <= 12:
             forces_widget = self.buildOptionPanel(
-                "Total forces", PlotTypes.GROUP_PLATFORM_FORCES, sensor_list
+                "Total forces", PlotTypes.GROUP_PLATFORM_FORCES, sensor_group
             )
         cop_widget = self.buildOptionPanel(
-            "Platform COP", PlotTypes.GROUP_PLATFORM_COP, sensor_list, False
+            "Platform COP", PlotTypes.GROUP_PLATFORM_COP, sensor_group, False
         )
         if len(sensor_list) == 12:
             cop_widget = self.buildOptionPanel(
-                "Platform COP", PlotTypes.GROUP_PLATFORM_COP, sensor_list
+                "Platform COP", PlotTypes.GROUP_PLATFORM_COP, sensor_group
             )
         self.options_selector_layout.addWidget(forces_widget)
         self.options_selector_layout.addWidget(cop_widget)
 
     def updateSensorFigurePlot(
-        self, plot_type: PlotTypes, sensor_list: list[str]
+        self, plot_type: PlotTypes, sensor_group: SensorGroup
     ) -> None:
         clearWidgetsLayout(self.figure_layout)
         widget = self.data_mngr.getGroupPlotWidget(
-            plot_type, sensor_list, self.idx1, self.idx2
+            plot_type, sensor_group, self.idx1, self.idx2
         )
         self.figure_layout.addWidget(widget)
 
@@ -418,7 +502,7 @@ class PlatformPlotSelector(QtWidgets.QWidget):
         self,
         title: str,
         plot_type: PlotTypes,
-        sensor_list: list[str],
+        sensor_group: SensorGroup,
         enable: bool = True,
     ) -> QtWidgets.QWidget:
         widget = QtWidgets.QWidget()
@@ -432,8 +516,8 @@ class PlatformPlotSelector(QtWidgets.QWidget):
             enabled=enable,
         )
         sensor_btn.clicked.connect(
-            lambda *, plot_type=plot_type, sensor_list=sensor_list: self.updateSensorFigurePlot(
-                plot_type, sensor_list
+            lambda *, plot_type=plot_type, sensor_group=sensor_group: self.updateSensorFigurePlot(
+                plot_type, sensor_group
             )
         )
         # Build layout
@@ -499,6 +583,9 @@ class CalibrationSelector(QtWidgets.QWidget):
 
     # Getters
 
+    def getGroups(self) -> list[SensorGroup]:
+        return [group for group in self.group_list if group.getStatus() is SGStatus.OK]
+
     def getSelectedGroup(self) -> SensorGroup:
         index = self.group_combo_box.currentIndex()
         return self.group_list[index]
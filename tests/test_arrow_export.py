@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+from src.managers import arrowExport
+import os
+import sys
+import subprocess
+import numpy as np
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+@pytest.fixture
+def table():
+    pytest.importorskip("pyarrow")
+    raw = np.array([1.0, np.nan, 3.0], dtype=np.float32)
+    return arrowExport.buildSessionTable(
+        np.array([1000, 1010, 1020]),
+        {
+            arrowExport.CALIBRATED: {"LoadCell": raw.astype(float) * 2},
+            arrowExport.RAW: {"LoadCell": raw},
+            arrowExport.DERIVED: {"platform_1_Fz": np.zeros(3)},
+        },
+        {"name": "Test"},
+    )
+
+
+def assertSameTable(table, expected) -> None:
+    # Table.equals takes NaN values as different
+    assert table.schema.equals(expected.schema, check_metadata=True)
+    assert table.to_pandas().equals(expected.to_pandas())
+
+
+# Reader process of a shared table, which saves it to a file to be compared
+SHARED_READER = """
+import sys
+from src.managers import arrowExport
+table, memory = arrowExport.openSharedTable(sys.argv[1])
+arrowExport.writeArrowFile(sys.argv[2], table)
+del table
+memory.close()
+"""
+
+
+# Tests
+
+
+def test_session_table_fields(table) -> None:
+    assert table.column_names == [
+        "timestamp",
+        "LoadCell",
+        "LoadCell_RAW",
+        "platform_1_Fz",
+    ]
+    assert table.schema.field("LoadCell_RAW").metadata == {b"kind": b"raw"}
+    assert str(table.schema.field("LoadCell_RAW").type) == "float"
+    # NaNs are values, not nulls
+    assert table.column("LoadCell").null_count == 0
+    assert arrowExport.getSessionMetadata(table) == {"name": "Test"}
+
+
+def test_arrow_file_round_trip(tmp_path, table) -> None:
+    path = str(tmp_path / ("Test" + arrowExport.ARROW_EXTENSION))
+    arrowExport.writeArrowFile(path, table)
+    assertSameTable(arrowExport.readArrowFile(path), table)
+
+
+def test_shared_table_hand_off(tmp_path, table) -> None:
+    name = arrowExport.getSharedName("Test shared")
+    path = str(tmp_path / ("Test" + arrowExport.ARROW_EXTENSION))
+    shared = arrowExport.SharedTable(name, table)
+    try:
+        subprocess.run(
+            [sys.executable, "-c", SHARED_READER, name, path],
+            cwd=os.path.join(os.path.dirname(__file__), ".."),
+            check=True,
+        )
+    finally:
+        shared.close()
+    assertSameTable(arrowExport.readArrowFile(path), table)
+
+
+def test_shared_names() -> None:
+    assert arrowExport.getSharedName("Test 1/a") == "force_platform_Test_1_a"
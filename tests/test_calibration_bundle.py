@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+from src.managers.calibrationBundle import (
+    CalibrationBundleWriter,
+    loadCalibrationBundle,
+)
+import numpy as np
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+@pytest.fixture
+def bundle_path(tmp_path) -> str:
+    return str(tmp_path / "calibration_bundle.npz")
+
+
+# Tests
+
+
+def test_bundle_written_in_background(bundle_path: str) -> None:
+    writer = CalibrationBundleWriter(bundle_path)
+    raw = np.arange(30, dtype=float).reshape(10, 3)
+    writer.write({"sensor_names": ["X", "Y", "Z"], "holds/0/raw": raw})
+    # The writer keeps its own copy of the arrays
+    raw[:] = 0
+    writer.write({"holds/0/means": [4.5, 5.5, 6.5]})
+    writer.close()
+    bundle = loadCalibrationBundle(bundle_path)
+    assert sorted(bundle) == ["holds/0/means", "holds/0/raw", "sensor_names"]
+    np.testing.assert_array_equal(
+        bundle["holds/0/raw"], np.arange(30, dtype=float).reshape(10, 3)
+    )
+    assert bundle["sensor_names"].tolist() == ["X", "Y", "Z"]
+
+
+def test_bundle_readable_after_flush(bundle_path: str) -> None:
+    writer = CalibrationBundleWriter(bundle_path)
+    writer.write({"holds/0/forces": np.ones(6)})
+    writer.flush()
+    assert list(loadCalibrationBundle(bundle_path)) == ["holds/0/forces"]
+    writer.write({"holds/1/forces": np.zeros(6)})
+    writer.close()
+    assert len(loadCalibrationBundle(bundle_path)) == 2
+
+
+def test_bundle_duplicated_entries(bundle_path: str) -> None:
+    writer = CalibrationBundleWriter(bundle_path)
+    assert writer.write({"results/0/holds": [0, 1]})
+    assert not writer.write({"results/0/holds": [0]})
+    writer.close()
+    np.testing.assert_array_equal(
+        loadCalibrationBundle(bundle_path)["results/0/holds"], [0, 1]
+    )
+
+
+def test_bundle_appended(bundle_path: str) -> None:
+    writer = CalibrationBundleWriter(bundle_path)
+    writer.write({"holds/0/forces": np.ones(6)})
+    writer.close()
+    writer = CalibrationBundleWriter(bundle_path)
+    assert writer.getEntries() == {"holds/0/forces"}
+    assert not writer.write({"holds/0/forces": np.zeros(6)})
+    assert writer.write({"holds/1/forces": np.zeros(6)})
+    writer.close()
+    bundle = loadCalibrationBundle(bundle_path)
+    assert sorted(bundle) == ["holds/0/forces", "holds/1/forces"]
+    np.testing.assert_array_equal(bundle["holds/0/forces"], np.ones(6))
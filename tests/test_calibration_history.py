@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+from src.managers.calibrationHistory import CalibrationHistory
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+@pytest.fixture
+def history(tmp_path) -> CalibrationHistory:
+    return CalibrationHistory(str(tmp_path / "calibration_history.db"))
+
+
+# Tests
+
+
+def test_sensor_history_by_date(history: CalibrationHistory) -> None:
+    now = datetime.now()
+    for days, slope in [(500, 1.0), (200, 1.1), (10, 1.2)]:
+        history.addSensorCalibration(
+            "p1_z3", slope, 0.5, timestamp=now - timedelta(days=days)
+        )
+    history.addSensorCalibration("p1_z4", 3.0, 0.0)
+    last_year = history.getSensorHistory("p1_z3", since=now - timedelta(days=365))
+    assert last_year["slope"].tolist() == [1.1, 1.2]
+    assert last_year["timestamp"].is_monotonic_increasing
+    assert len(history.getSensorHistory("p1_z3")) == 3
+    assert history.getSensorHistory("unknown").empty
+
+
+def test_platform_history_keeps_matrices(history: CalibrationHistory) -> None:
+    matrix = np.arange(72, dtype=float).reshape(6, 12)
+    history.addPlatformCalibration("platform_1", matrix, np.ones(72), group_name="P1")
+    [(timestamp, saved_matrix, std_devs)] = history.getPlatformHistory("platform_1")
+    assert isinstance(timestamp, datetime)
+    assert np.array_equal(saved_matrix, matrix)
+    assert std_devs.shape == (6, 12)
+    assert history.getPlatformHistory("platform_2") == []
+
+
+def test_drift_from_saved_calibrations(history: CalibrationHistory) -> None:
+    now = datetime.now()
+    history.addSensorCalibration("p1_z1", 2.0, 0, timestamp=now - timedelta(days=400))
+    history.addSensorCalibration("p1_z1", 1.0, 0, timestamp=now - timedelta(days=30))
+    assert history.getSensorDrift("p1_z1", 1.0, since=now - timedelta(days=365)) == 0
+    assert history.getSensorDrift("p1_z1", 1.0) == pytest.approx(0.5)
+    assert history.getSensorDrift("p1_z2", 1.0) is None
+    matrix = np.eye(6, 12)
+    history.addPlatformCalibration("platform_1", matrix)
+    assert history.getPlatformDrift("platform_1", matrix) == 0
+    assert history.getPlatformDrift("platform_1", 1.1 * matrix) == pytest.approx(0.1)
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+from src.managers.calibrationSolver import (
+    COVARIANCE_SCALE,
+    IncrementalLeastSquares,
+    PLATFORM_SENSOR_KEYS,
+    buildPlatformForces,
+    getPlatformSensorIndex,
+    solvePlatformCalibration,
+)
+import numpy as np
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+def denseCalibration(
+    sensor_values: np.ndarray,
+    triaxial_values: np.ndarray,
+    force_ratios: list[float],
+    distances: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Reference dense system with kron(eye(6), v) blocks
+    M = len(sensor_values)
+    Zf = np.zeros((6 * M, 72))
+    f = np.zeros((6 * M, 1))
+    for i in range(M):
+        fpM = np.array(
+            [
+                -triaxial_values[i, 1] * force_ratios[1],
+                -triaxial_values[i, 0] * force_ratios[0],
+                triaxial_values[i, 2] * force_ratios[2],
+            ]
+        )
+        delta_x, delta_y, delta_z = distances[i]
+        delta = np.array(
+            [[0, -delta_z, delta_y], [delta_z, 0, -delta_x], [-delta_y, delta_x, 0]]
+        )
+        Zf[i * 6 : i * 6 + 6, :] = np.kron(np.eye(6), sensor_values[i].T)
+        f[i * 6 : i * 6 + 6, :] = np.dot(np.vstack([np.eye(3), delta]), fpM)[:, None]
+    x = np.linalg.lstsq(Zf, f, rcond=None)[0]
+    std_devs = np.sqrt(np.diag(25 * np.linalg.inv(np.dot(Zf.T, Zf))))
+    return x, std_devs
+
+
+def buildMeasurements(M: int, scale: float = 1, seed: int = 0) -> tuple:
+    rng = np.random.default_rng(seed)
+    sensor_values = rng.normal(0, 1, (M, 12)) * scale
+    triaxial_values = rng.normal(0, 1, (M, 3))
+    distances = rng.uniform(-0.3, 0.3, (M, 3))
+    return sensor_values, triaxial_values, [12.5, 11.8, 40.2], distances
+
+
+# Tests
+
+
+def test_platform_forces_lever_arms() -> None:
+    forces = buildPlatformForces([[0, 0, 1]], [1, 1, 2], [[0.1, 0.2, 0]])
+    np.testing.assert_allclose(forces, [[0, 0, 2, 0.4, -0.2, 0]])
+
+
+@pytest.mark.parametrize("scale", [1, 1e-4, 1e4])
+def test_solver_matches_dense_system(scale: float) -> None:
+    sensor_values, triaxial_values, ratios, distances = buildMeasurements(50, scale)
+    forces = buildPlatformForces(triaxial_values, ratios, distances)
+    x, std_devs = solvePlatformCalibration(sensor_values, forces)
+    dense_x, dense_std_devs = denseCalibration(
+        sensor_values, triaxial_values, ratios, distances
+    )
+    np.testing.assert_allclose(x, dense_x, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(std_devs, dense_std_devs, rtol=1e-9)
+
+
+def test_solver_ill_conditioned_sensors() -> None:
+    sensor_values, triaxial_values, ratios, distances = buildMeasurements(50)
+    # Nearly collinear sensors, the dense normal equations lose half the digits
+    rng = np.random.default_rng(1)
+    sensor_values[:, 1] = sensor_values[:, 0] + rng.normal(0, 1e-7, 50)
+    expected = rng.normal(0, 1, (12, 6))
+    forces = sensor_values @ expected
+    x, std_devs = solvePlatformCalibration(sensor_values, forces)
+    np.testing.assert_allclose(x.reshape(6, 12).T, expected, atol=1e-6)
+    assert np.isfinite(std_devs).all()
+
+
+def test_solver_rank_deficient_sensors() -> None:
+    sensor_values, triaxial_values, ratios, distances = buildMeasurements(50)
+    sensor_values[:, 3] = sensor_values[:, 2]
+    forces = buildPlatformForces(triaxial_values, ratios, distances)
+    x, std_devs = solvePlatformCalibration(sensor_values, forces)
+    assert np.isfinite(x).all()
+    assert np.isnan(std_devs.reshape(6, 12)[:, 2:4]).all()
+    assert not np.isnan(np.delete(std_devs.reshape(6, 12), [2, 3], axis=1)).any()
+
+
+def test_incremental_solver_matches_batch() -> None:
+    sensor_values, triaxial_values, ratios, distances = buildMeasurements(40)
+    forces = buildPlatformForces(triaxial_values, ratios, distances)
+    solver = IncrementalLeastSquares(12, 6)
+    [solver.add(values, force) for values, force in zip(sensor_values, forces)]
+    for index in [5, 17]:
+        solver.remove(sensor_values[index], forces[index])
+    kept = np.delete(np.arange(40), [5, 17])
+    x, std_devs = solvePlatformCalibration(sensor_values[kept], forces[kept])
+    coefficients, variances = solver.solve()
+    assert solver.getCount() == 38
+    np.testing.assert_allclose(coefficients.T.reshape(-1, 1), x, atol=1e-10)
+    np.testing.assert_allclose(
+        np.tile(np.sqrt(COVARIANCE_SCALE * variances), 6), std_devs, rtol=1e-8
+    )
+    residuals = forces[kept] - sensor_values[kept] @ coefficients
+    np.testing.assert_allclose(
+        solver.getResidualSumSquares(), np.sum(residuals**2, axis=0), rtol=1e-8
+    )
+
+
+def test_incremental_solver_ill_conditioned_sensors() -> None:
+    sensor_values, triaxial_values, ratios, distances = buildMeasurements(50)
+    rng = np.random.default_rng(1)
+    sensor_values[:, 1] = sensor_values[:, 0] + rng.normal(0, 1e-7, 50)
+    expected = rng.normal(0, 1, (12, 6))
+    forces = sensor_values @ expected
+    solver = IncrementalLeastSquares(12, 6)
+    [solver.add(values, force) for values, force in zip(sensor_values, forces)]
+    solver.remove(sensor_values[3], forces[3])
+    x, std_devs = solvePlatformCalibration(
+        np.delete(sensor_values, 3, axis=0), np.delete(forces, 3, axis=0)
+    )
+    np.testing.assert_allclose(solver.getCoefficients(), expected, atol=1e-6)
+    np.testing.assert_allclose(solver.getCoefficients().T.reshape(-1, 1), x)
+
+
+def test_incremental_solver_intercept_score() -> None:
+    rng = np.random.default_rng(2)
+    features = rng.uniform(0, 1e-3, 10)
+    targets = 2.5e4 * features - 3 + rng.normal(0, 0.01, 10)
+    solver = IncrementalLeastSquares(1, fit_intercept=True)
+    [solver.add(feature, target) for feature, target in zip(features, targets)]
+    slope, intercept = np.polyfit(features, targets, 1)
+    residuals = targets - (slope * features + intercept)
+    score = 1 - np.sum(residuals**2) / np.sum((targets - targets.mean()) ** 2)
+    np.testing.assert_allclose(solver.getCoefficients()[:, 0], [slope, intercept])
+    assert solver.getScore()[0] == pytest.approx(score)
+
+
+@pytest.mark.parametrize(
+    "sensor_name, index",
+    [("P1_LoadCell_X_1", 0), ("P1_LoadCell_Y_3", 6), ("P2_LoadCell_Z_4", 11)],
+)
+def test_platform_sensor_index(sensor_name: str, index: int) -> None:
+    assert getPlatformSensorIndex(sensor_name) == index
+    assert PLATFORM_SENSOR_KEYS[index] in sensor_name
+
+
+def test_platform_sensor_index_unknown() -> None:
+    assert getPlatformSensorIndex("Encoder_1") is None
@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+
+from src.managers.calibrationManager import (
+    MultiPlatformCalibrationManager,
+    PlatformCalibrationManager,
+    SensorCalibrationManager,
+    sensorsConverged,
+)
+from src.managers.calibrationBundle import CalibrationBundleWriter
+from src.managers.fileManager import FileManager
+from src.handlers.runningStats import RunningStats
+from src.enums.sensorStatus import SStatus
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+import os
+import numpy as np
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+class SensorMock:
+    # Sensor read as a constant value, set before every hold
+    def __init__(self, name: str, slope: float = 1) -> None:
+        self.name = name
+        self.slope = slope
+        self.value: float = 0
+        self.values: list[float] = []
+        self.running_stats: RunningStats = None
+
+    def connect(self) -> bool:
+        return True
+
+    def disconnect(self) -> None:
+        pass
+
+    def checkConnection(self) -> bool:
+        return True
+
+    def registerValue(self) -> None:
+        self.values.append(self.value)
+        if self.running_stats is not None:
+            self.running_stats.add(self.value)
+
+    def setTrackStats(self, track: bool) -> None:
+        self.running_stats = RunningStats() if track else None
+
+    def setRetainValues(self, retain: bool) -> None:
+        pass
+
+    def clearValues(self) -> None:
+        self.values = []
+
+    def getValues(self) -> list[float]:
+        return self.values
+
+    def getRunningStats(self) -> RunningStats:
+        return self.running_stats
+
+    def getName(self) -> str:
+        return self.name
+
+    def getSlope(self) -> float:
+        return self.slope
+
+    def getIntercept(self) -> float:
+        return 0
+
+    def getStatus(self) -> SStatus:
+        return SStatus.AVAILABLE
+
+
+class PlatformGroupMock:
+    # Sensors in config order: Z, X and Y sensors
+    def __init__(self, name: str = "Platform") -> None:
+        self.name = name
+        self.sensors = {
+            f"{name}_{axis}_{number}": SensorMock(f"{name}_LoadCell_{axis}_{number}")
+            for axis in "ZXY"
+            for number in range(1, 5)
+        }
+
+    def start(self) -> None:
+        pass
+
+    def register(self) -> None:
+        [sensor.registerValue() for sensor in self.sensors.values()]
+
+    def stop(self) -> None:
+        pass
+
+    def clearValues(self) -> None:
+        [sensor.clearValues() for sensor in self.sensors.values()]
+
+    def getSensors(self) -> dict[str, SensorMock]:
+        return self.sensors
+
+    def getName(self) -> str:
+        return self.name
+
+
+class CountingSensorMock(SensorMock):
+    def __init__(self, name: str, slope: float = 1) -> None:
+        super().__init__(name, slope)
+        self.reads = 0
+
+    def registerValue(self) -> None:
+        self.reads += 1
+        super().registerValue()
+
+
+class BrokenExecutorMock:
+    def __init__(self) -> None:
+        self.shutdowns = 0
+
+    def submit(self, *args):
+        raise BrokenProcessPool("A process in the pool was terminated")
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        self.shutdowns += 1
+
+
+class SensorManagerMock:
+    def __init__(self) -> None:
+        self.matrices: dict[str, np.ndarray] = {}
+
+    @contextmanager
+    def configBatch(self):
+        yield
+
+    def setGroupCalibrationMatrix(self, group, matrix: np.ndarray) -> None:
+        self.matrices[group.getName()] = matrix
+
+    def setSensorSlope(self, sensor: SensorMock, slope: float) -> None:
+        sensor.slope = slope
+
+    def recordGroupCalibration(self, group, std_devs: np.ndarray, path: str) -> None:
+        pass
+
+
+def buildStatsSensor(values: list[float], slope: float = 1) -> SensorMock:
+    sensor = SensorMock("LoadCell", slope)
+    sensor.setTrackStats(True)
+    [sensor.running_stats.add(value) for value in values]
+    return sensor
+
+
+def buildRefSensors() -> list[SensorMock]:
+    return [
+        SensorMock(f"Ref_{axis}", slope)
+        for axis, slope in zip("XYZ", [12.5, 11.8, 40.2])
+    ]
+
+
+def buildHolds(M: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Distances (M x 3), reference values (M x 3) and platform values (M x 12)
+    rng = np.random.default_rng(seed)
+    return (
+        rng.uniform(-300, 300, (M, 3)),
+        rng.normal(0, 1, (M, 3)),
+        rng.normal(0, 1, (M, 12)),
+    )
+
+
+def recordHold(
+    calib_mngr,
+    ref_sensor: list[SensorMock],
+    platform_groups: list[PlatformGroupMock],
+    distances: np.ndarray,
+    ref_values: np.ndarray,
+    platform_values: np.ndarray,
+) -> None:
+    for sensor, value in zip(ref_sensor, ref_values):
+        sensor.value = value
+    for platform_group in platform_groups:
+        for sensor, value in zip(platform_group.getSensors().values(), platform_values):
+            sensor.value = value
+    calib_mngr.startMeasurement(distances.tolist())
+    [calib_mngr.registerValue() for _ in range(3)]
+    calib_mngr.stopMeasurement()
+
+
+def buildPlatformManager(
+    platform_group: PlatformGroupMock, ref_sensor: list[SensorMock]
+) -> PlatformCalibrationManager:
+    # Without setup, so no calibration folder is created
+    calib_mngr = PlatformCalibrationManager()
+    calib_mngr.platform_group = platform_group
+    calib_mngr.ref_sensor = ref_sensor
+    return calib_mngr
+
+
+def buildMultiPlatformManager(
+    platform_groups: list[PlatformGroupMock], ref_sensor: list[SensorMock]
+) -> MultiPlatformCalibrationManager:
+    calib_mngr = MultiPlatformCalibrationManager()
+    calib_mngr.ref_sensor = ref_sensor
+    calib_mngr.calib_mngrs = [
+        buildPlatformManager(platform_group, ref_sensor)
+        for platform_group in platform_groups
+    ]
+    return calib_mngr
+
+
+def recordMultiPlatformHolds(
+    calib_mngr: MultiPlatformCalibrationManager,
+    platform_groups: list[PlatformGroupMock],
+    M: int,
+) -> list[np.ndarray]:
+    # Same distances and reference values, other platform values per platform
+    distances, ref_values, _ = buildHolds(M)
+    platform_values = [buildHolds(M, seed)[2] for seed in range(1, 3)]
+    for hold in range(M):
+        for sensor, value in zip(calib_mngr.ref_sensor, ref_values[hold]):
+            sensor.value = value
+        for platform_group, values in zip(platform_groups, platform_values):
+            for sensor, value in zip(
+                platform_group.getSensors().values(), values[hold]
+            ):
+                sensor.value = value
+        calib_mngr.startMeasurement(distances[hold].tolist())
+        [calib_mngr.registerValue() for _ in range(3)]
+        calib_mngr.stopMeasurement()
+    return platform_values
+
+
+def setupBundle(calib_mngr: PlatformCalibrationManager, folder_path: str) -> str:
+    calib_mngr.file_mngr = FileManager()
+    calib_mngr.file_mngr.setFilePath(folder_path)
+    bundle_path = os.path.join(folder_path, "calibration_bundle.npz")
+    calib_mngr.bundle_writer = CalibrationBundleWriter(bundle_path)
+    return bundle_path
+
+
+# Tests
+
+
+def test_sensors_converged_sem_threshold() -> None:
+    rng = np.random.default_rng(0)
+    values = rng.normal(1, 0.1, 400).tolist()
+    # SEM of about 0.1 / sqrt(400) = 0.005, in calibrated units
+    assert sensorsConverged([buildStatsSensor(values)], 0.01, 100)
+    assert not sensorsConverged([buildStatsSensor(values)], 0.002, 100)
+    assert not sensorsConverged([buildStatsSensor(values, slope=-4)], 0.01, 100)
+
+
+def test_sensors_converged_min_samples() -> None:
+    # Constant values have no error, but need enough samples
+    assert not sensorsConverged([buildStatsSensor([1.0] * 99)], 0.01, 100)
+    assert sensorsConverged([buildStatsSensor([1.0] * 100)], 0.01, 100)
+    # At least two samples, one has no SEM
+    assert not sensorsConverged([buildStatsSensor([1.0])], 0.01, 0)
+
+
+def test_sensors_converged_every_sensor() -> None:
+    rng = np.random.default_rng(0)
+    sensors = [
+        buildStatsSensor([1.0] * 200),
+        buildStatsSensor(rng.normal(1, 1, 200).tolist()),
+    ]
+    assert not sensorsConverged(sensors, 0.01, 100)
+    sensors[1].setTrackStats(False)
+    assert not sensorsConverged(sensors, 0.01, 100)
+
+
+def test_sensor_calibration_convergence() -> None:
+    sensor = SensorMock("LoadCell")
+    calib_mngr = SensorCalibrationManager()
+    calib_mngr.setup(sensor, None, record_interval_ms=10, record_amount=300)
+    assert calib_mngr.getRecordDuration() == 3000
+    calib_mngr.startMeasurement(ref_value=10)
+    [calib_mngr.registerValue() for _ in range(150)]
+    # Disabled convergence never stops the measurement early
+    assert not calib_mngr.isConverged()
+    # Enabled, measurements last up to the max time if they do not converge
+    calib_mngr.setConvergence(True, 0.05, 8000, 100)
+    assert calib_mngr.getRecordDuration() == 8000
+    assert calib_mngr.isConverged()
+    calib_mngr.stopMeasurement()
+
+
+def test_platform_results_ill_conditioned_sensors() -> None:
+    distances, ref_values, platform_values = buildHolds(50)
+    # Nearly collinear sensors, the normal equations lose half the digits
+    rng = np.random.default_rng(1)
+    platform_values[:, 1] = platform_values[:, 0] + rng.normal(0, 1e-7, 50)
+    ref_sensor = buildRefSensors()
+    platform_group = PlatformGroupMock()
+    calib_mngr = buildPlatformManager(platform_group, ref_sensor)
+    for hold in zip(distances, ref_values, platform_values):
+        recordHold(calib_mngr, ref_sensor, [platform_group], *hold)
+    calibration_matrix, std_dev_matrix = calib_mngr.getResults()
+    sensor_values, forces = calib_mngr.getSolverInputs()
+    expected = np.linalg.lstsq(sensor_values, forces, rcond=None)[0].T
+    np.testing.assert_allclose(calibration_matrix.to_numpy(), expected, rtol=1e-6)
+    assert np.isfinite(std_dev_matrix.to_numpy()).all()
+
+
+def test_platform_bundle_round_trip(tmp_path) -> None:
+    distances, ref_values, platform_values = buildHolds(20)
+    ref_sensor = buildRefSensors()
+    platform_group = PlatformGroupMock()
+    calib_mngr = buildPlatformManager(platform_group, ref_sensor)
+    bundle_path = setupBundle(calib_mngr, str(tmp_path))
+    for hold in zip(distances, ref_values, platform_values):
+        recordHold(calib_mngr, ref_sensor, [platform_group], *hold)
+    calib_mngr.removeMeasurement(4)
+    calibration_matrix, std_dev_matrix = calib_mngr.getResults()
+    sensor_mngr = SensorManagerMock()
+    calib_mngr.saveResults(sensor_mngr)
+    calib_mngr.closeBundle()
+    np.testing.assert_array_equal(
+        sensor_mngr.matrices["Platform"], calibration_matrix.to_numpy()
+    )
+    # Reference slopes may change after saving, loaded holds keep their forces
+    loaded_mngr = buildPlatformManager(platform_group, buildRefSensors())
+    for sensor in loaded_mngr.ref_sensor:
+        sensor.slope = 1
+    loaded_matrix, loaded_std_devs = loaded_mngr.loadBundle(bundle_path)
+    np.testing.assert_array_equal(loaded_matrix, calibration_matrix)
+    np.testing.assert_array_equal(loaded_std_devs, std_dev_matrix)
+    assert loaded_mngr.hold_ids == [hold for hold in range(20) if hold != 4]
+
+
+def test_platform_bundle_holds_after_load(tmp_path) -> None:
+    distances, ref_values, platform_values = buildHolds(15)
+    ref_sensor = buildRefSensors()
+    platform_group = PlatformGroupMock()
+    calib_mngr = buildPlatformManager(platform_group, ref_sensor)
+    bundle_path = setupBundle(calib_mngr, str(tmp_path))
+    for hold in zip(distances[:13], ref_values[:13], platform_values[:13]):
+        recordHold(calib_mngr, ref_sensor, [platform_group], *hold)
+    calib_mngr.closeBundle()
+    # Holds recorded after loading continue the loaded bundle
+    calib_mngr.loadBundle(bundle_path)
+    for hold in zip(distances[13:], ref_values[13:], platform_values[13:]):
+        recordHold(calib_mngr, ref_sensor, [platform_group], *hold)
+    calib_mngr.removeMeasurement(0)
+    calib_mngr.closeBundle()
+    loaded_mngr = buildPlatformManager(platform_group, ref_sensor)
+    loaded_mngr.loadBundle(bundle_path)
+    assert loaded_mngr.hold_ids == list(range(1, 15))
+    # Z sensors are moved after the X and Y ones
+    np.testing.assert_array_equal(
+        loaded_mngr.getSolverInputs()[0], np.roll(platform_values[1:], -4, axis=1)
+    )
+
+
+def test_multi_platform_shared_reference() -> None:
+    ref_sensor = [CountingSensorMock(sensor.getName()) for sensor in buildRefSensors()]
+    platform_groups = [PlatformGroupMock("P1"), PlatformGroupMock("P2")]
+    calib_mngr = buildMultiPlatformManager(platform_groups, ref_sensor)
+    recordMultiPlatformHolds(calib_mngr, platform_groups, 4)
+    # Reference sensors are read once per tick for all platforms
+    assert [sensor.reads for sensor in ref_sensor] == [12, 12, 12]
+    first, second = calib_mngr.calib_mngrs
+    assert first.getLastValues() == second.getLastValues()
+    np.testing.assert_array_equal(
+        first.getSolverInputs()[1], second.getSolverInputs()[1]
+    )
+
+
+def test_multi_platform_remove_measurement() -> None:
+    ref_sensor = buildRefSensors()
+    platform_groups = [PlatformGroupMock("P1"), PlatformGroupMock("P2")]
+    calib_mngr = buildMultiPlatformManager(platform_groups, ref_sensor)
+    platform_values = recordMultiPlatformHolds(calib_mngr, platform_groups, 5)
+    calib_mngr.removeMeasurement(2)
+    for platform_mngr, values in zip(calib_mngr.calib_mngrs, platform_values):
+        assert platform_mngr.hold_ids == [0, 1, 3, 4]
+        assert len(platform_mngr.measurement_distances_df) == 4
+        np.testing.assert_array_equal(
+            platform_mngr.getSolverInputs()[0],
+            np.roll(np.delete(values, 2, axis=0), -4, axis=1),
+        )
+
+
+def test_multi_platform_results() -> None:
+    ref_sensor = buildRefSensors()
+    platform_groups = [PlatformGroupMock("P1"), PlatformGroupMock("P2")]
+    calib_mngr = buildMultiPlatformManager(platform_groups, ref_sensor)
+    recordMultiPlatformHolds(calib_mngr, platform_groups, 20)
+    try:
+        results = calib_mngr.getResults()
+    finally:
+        calib_mngr.shutdownExecutor()
+    assert list(results) == ["P1", "P2"]
+    # Each platform gets the results of its own single platform solve
+    for platform_mngr in calib_mngr.calib_mngrs:
+        calibration_matrix, std_dev_matrix = results[platform_mngr.getPlatformName()]
+        expected_matrix, expected_std_devs = platform_mngr.setSolution(
+            *platform_mngr.solver.solve()
+        )
+        np.testing.assert_array_equal(calibration_matrix, expected_matrix)
+        np.testing.assert_array_equal(std_dev_matrix, expected_std_devs)
+    assert not results["P1"][0].equals(results["P2"][0])
+
+
+def test_multi_platform_results_in_process() -> None:
+    ref_sensor = buildRefSensors()
+    platform_groups = [PlatformGroupMock("P1"), PlatformGroupMock("P2")]
+    calib_mngr = buildMultiPlatformManager(platform_groups, ref_sensor)
+    recordMultiPlatformHolds(calib_mngr, platform_groups, 20)
+    executor = BrokenExecutorMock()
+    calib_mngr.executor = executor
+    results = calib_mngr.getResults()
+    # Broken pools are shut down, and platforms are solved in this process
+    assert executor.shutdowns == 1
+    assert calib_mngr.executor is None
+    for platform_mngr in calib_mngr.calib_mngrs:
+        np.testing.assert_array_equal(
+            results[platform_mngr.getPlatformName()][0],
+            platform_mngr.solver.getCoefficients().T,
+        )
+
+
+def test_multi_platform_clear_shuts_down_pool() -> None:
+    platform_groups = [PlatformGroupMock("P1"), PlatformGroupMock("P2")]
+    calib_mngr = buildMultiPlatformManager(platform_groups, buildRefSensors())
+    executor = BrokenExecutorMock()
+    calib_mngr.executor = executor
+    calib_mngr.clearValues()
+    assert executor.shutdowns == 1
+    assert calib_mngr.executor is None
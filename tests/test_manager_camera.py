@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("cv2")
+
+from src.managers.cameraManager import CameraManager
+from src.enums.configPaths import ConfigPaths as CfgPaths
+from src.enums.cameraParams import CParams
+import copy
+
+
+# General mocks, builders and fixtures
+
+
+class ConfigManagerMock:
+    def __init__(self, values: dict) -> None:
+        self.values = values
+
+    def setConfigValue(self, config_path: str, value) -> None:
+        self.values[config_path] = value
+
+    def getConfigValue(self, config_path: str, default_value=None):
+        return self.values.get(config_path, default_value)
+
+
+def buildCameraContent(name: str, serial: str) -> dict:
+    return {
+        CParams.NAME.value: name,
+        CParams.READ.value: True,
+        CParams.CONNECTION_SECTION.value: {CParams.SERIAL.value: serial},
+    }
+
+
+@pytest.fixture
+def cameras() -> dict:
+    return {
+        "camera_1": buildCameraContent("Camera 1", "/dev/video0"),
+        "camera_2": buildCameraContent("Camera 2", "/dev/video1"),
+    }
+
+
+@pytest.fixture
+def camera_manager(cameras: dict) -> CameraManager:
+    camera_manager = CameraManager()
+    camera_manager.setup(
+        ConfigManagerMock({CfgPaths.CAMERA_SECTION.value: copy.deepcopy(cameras)})
+    )
+    return camera_manager
+
+
+def getThreads(camera_manager: CameraManager) -> dict:
+    return {
+        thread.getCamera().getID(): thread
+        for thread in camera_manager.getCameraThreads()
+    }
+
+
+# Tests
+
+
+def test_camera_reload_keeps_unchanged(
+    camera_manager: CameraManager, cameras: dict
+) -> None:
+    threads = getThreads(camera_manager)
+    camera_manager.reload(
+        ConfigManagerMock({CfgPaths.CAMERA_SECTION.value: copy.deepcopy(cameras)})
+    )
+    assert getThreads(camera_manager) == threads
+
+
+def test_camera_reload_changes(camera_manager: CameraManager, cameras: dict) -> None:
+    threads = getThreads(camera_manager)
+    cameras["camera_2"] = buildCameraContent("Camera 2", "/dev/video2")
+    cameras["camera_3"] = buildCameraContent("Camera 3", "/dev/video3")
+    del cameras["camera_1"]
+    camera_manager.reload(
+        ConfigManagerMock({CfgPaths.CAMERA_SECTION.value: copy.deepcopy(cameras)})
+    )
+    new_threads = getThreads(camera_manager)
+    assert list(new_threads) == ["camera_2", "camera_3"]
+    assert new_threads["camera_2"] is not threads["camera_2"]
+    assert new_threads["camera_2"].getCamera().params == cameras["camera_2"]
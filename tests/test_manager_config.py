@@ -2,7 +2,10 @@
 
 import pytest
 import os
-from src.managers.configManager import ConfigManager
+import stat
+import yaml
+import shutil
+from src.managers.configManager import ConfigManager, diffConfigSections
 from src.enums.configPaths import ConfigPaths as CfgPaths
 
 
@@ -87,3 +90,146 @@ def test_load_default_config_from_custom(config_manager: ConfigManager) -> None:
     config_manager.loadConfigFile(DEFAULT_CONFIG_PATH)
     saved_path = config_manager.getConfigValue(CfgPaths.CUSTOM_CONFIG_PATH.value, None)
     assert saved_path == None
+
+
+@pytest.fixture
+def temp_config_manager(config_manager: ConfigManager, tmp_path) -> ConfigManager:
+    # Work on a copy, so saved values do not modify the test files
+    config_manager.selected_config_path = str(tmp_path / "config.yaml")
+    return config_manager
+
+
+def countSaves(config_manager: ConfigManager) -> list:
+    saves = []
+    save_config = config_manager.saveConfig
+
+    def saveConfigCounter():
+        saves.append(1)
+        save_config()
+
+    config_manager.saveConfig = saveConfigCounter
+    return saves
+
+
+def test_batch_single_write(temp_config_manager: ConfigManager) -> None:
+    saves = countSaves(temp_config_manager)
+    with temp_config_manager.batch():
+        for i in range(12):
+            temp_config_manager.setConfigValue(CfgPaths.TEST_NAME.value, f"Test{i}")
+        assert len(saves) == 0
+        assert temp_config_manager.isDirty()
+    assert len(saves) == 1
+    assert not temp_config_manager.isDirty()
+    temp_config_manager.loadConfig(temp_config_manager.getCurrentFilePath())
+    assert temp_config_manager.getConfigValue(CfgPaths.TEST_NAME.value) == "Test11"
+
+
+def test_nested_batch_single_write(temp_config_manager: ConfigManager) -> None:
+    saves = countSaves(temp_config_manager)
+    with temp_config_manager.batch():
+        temp_config_manager.setConfigValue(CfgPaths.TEST_NAME.value, "Outer")
+        with temp_config_manager.batch():
+            temp_config_manager.setConfigValue(CfgPaths.TEST_NAME.value, "Inner")
+        assert len(saves) == 0
+    assert len(saves) == 1
+
+
+def test_clean_batch_no_write(temp_config_manager: ConfigManager) -> None:
+    saves = countSaves(temp_config_manager)
+    with temp_config_manager.batch():
+        pass
+    assert len(saves) == 0
+
+
+def test_debounced_write(temp_config_manager: ConfigManager) -> None:
+    saves = countSaves(temp_config_manager)
+    temp_config_manager.setSaveDelay(10000)
+    temp_config_manager.setConfigValue(CfgPaths.TEST_NAME.value, "First")
+    temp_config_manager.setConfigValue(CfgPaths.TEST_NAME.value, "Second")
+    assert len(saves) == 0
+    temp_config_manager.flush()
+    assert len(saves) == 1
+    assert not temp_config_manager.isDirty()
+
+
+def test_atomic_write_keeps_config_on_error(
+    temp_config_manager: ConfigManager, monkeypatch
+) -> None:
+    temp_config_manager.setConfigValue(CfgPaths.TEST_NAME.value, "Saved")
+    config_path = temp_config_manager.getCurrentFilePath()
+    with open(config_path, "r") as file:
+        saved_content = file.read()
+
+    # Simulate a write that fails midway
+    def failingDump(data, file, **kwargs):
+        file.write("settings:\n")
+        raise IOError("Disk full")
+
+    monkeypatch.setattr(yaml, "dump", failingDump)
+    with pytest.raises(IOError):
+        temp_config_manager.saveConfig()
+    with open(config_path, "r") as file:
+        assert file.read() == saved_content
+    assert os.listdir(os.path.dirname(config_path)) == ["config.yaml"]
+
+
+def test_atomic_write_keeps_file_mode(temp_config_manager: ConfigManager) -> None:
+    config_path = temp_config_manager.getCurrentFilePath()
+    temp_config_manager.setConfigValue(CfgPaths.TEST_NAME.value, "First")
+    os.chmod(config_path, 0o644)
+    temp_config_manager.setConfigValue(CfgPaths.TEST_NAME.value, "Second")
+    assert stat.S_IMODE(os.stat(config_path).st_mode) == 0o644
+
+
+def test_delayed_save_on_custom_config_load(tmp_path) -> None:
+    default_path = str(tmp_path / "config.yaml")
+    custom_path = str(tmp_path / "custom_config.yaml")
+    shutil.copy(DEFAULT_CONFIG_PATH, default_path)
+    shutil.copy(CUSTOM_CONFIG_PATH, custom_path)
+    cfg_mngr = ConfigManager()
+    cfg_mngr.default_config_path = default_path
+    cfg_mngr.selected_config_path = default_path
+    cfg_mngr.loadConfigFile(default_path)
+    cfg_mngr.setSaveDelay(500)
+    cfg_mngr.loadConfigFile(custom_path)
+    # Custom config path is saved in the default config before the delay ends
+    with open(default_path, "r") as file:
+        saved_config = yaml.safe_load(file)
+    assert saved_config["settings"]["custom_config_path"] == custom_path
+    assert os.path.samefile(cfg_mngr.getCurrentFilePath(), custom_path)
+    assert not cfg_mngr.isDirty()
+
+
+def test_config_version_on_change(temp_config_manager: ConfigManager) -> None:
+    version = temp_config_manager.getVersion()
+    assert temp_config_manager.getConfigValue(CfgPaths.TEST_NAME.value) is not None
+    temp_config_manager.setConfigValue(CfgPaths.TEST_NAME.value, "Changed")
+    assert temp_config_manager.getVersion() > version
+    assert temp_config_manager.getConfigValue(CfgPaths.TEST_NAME.value) == "Changed"
+
+
+def test_config_missing_value_default(temp_config_manager: ConfigManager) -> None:
+    assert temp_config_manager.getConfigValue("settings.missing", 5) == 5
+    assert temp_config_manager.getConfigValue("settings.missing", 7) == 7
+
+
+def test_diff_config_sections() -> None:
+    old_section = {
+        "kept": {"name": "Kept", "connection": {"channel": 0}},
+        "changed": {"name": "Changed", "connection": {"channel": 1}},
+        "removed": {"name": "Removed", "connection": {"channel": 2}},
+    }
+    new_section = {
+        "kept": {"name": "Kept", "connection": {"channel": 0}},
+        "changed": {"name": "Changed", "connection": {"channel": 3}},
+        "added": {"name": "Added", "connection": {"channel": 2}},
+    }
+    added, removed, changed = diffConfigSections(old_section, new_section)
+    assert added == ["added"]
+    assert removed == ["removed"]
+    assert changed == ["changed"]
+
+
+def test_diff_config_sections_empty() -> None:
+    assert diffConfigSections(None, {"added": {}}) == (["added"], [], [])
+    assert diffConfigSections({"removed": {}}, None) == ([], ["removed"], [])
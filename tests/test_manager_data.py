@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("matplotlib")
+
+from src.managers.dataManager import DataManager
+from src.managers.sessionLoader import openSession, writeSession
+from src.managers.calibrationSolver import PLATFORM_SENSOR_KEYS
+from src.handlers.sensorGroup import SensorGroup
+from src.handlers.sensor import Sensor
+from src.enums.sensorStatus import SStatus
+from src.enums.sensorParams import SParams
+from src.enums.sensorTypes import SGTypes
+import numpy as np
+import pandas as pd
+
+
+# General mocks, builders and fixtures
+
+
+class DriverMock:
+    def __init__(self, serial: int, channel: int) -> None:
+        pass
+
+
+def buildPlatformGroup(slope: float = 2, intercept: float = 0.5) -> SensorGroup:
+    group = SensorGroup("platform", "Platform", SGTypes.GROUP_PLATFORM)
+    group.setRead(True)
+    for channel, key in enumerate(PLATFORM_SENSOR_KEYS):
+        sensor = Sensor()
+        sensor.setup(
+            f"p1_{key}",
+            {
+                SParams.NAME.value: f"P1_{key}",
+                SParams.TYPE.value: "SENSOR_LOADCELL",
+                SParams.READ.value: True,
+                SParams.CONNECTION_SECTION.value: {
+                    SParams.SERIAL.value: 0,
+                    SParams.CHANNEL.value: channel,
+                },
+                SParams.CALIBRATION_SECTION.value: {
+                    SParams.SLOPE.value: slope,
+                    SParams.INTERCEPT.value: intercept,
+                },
+            },
+            DriverMock,
+        )
+        sensor.setStatus(SStatus.AVAILABLE)
+        group.addSensor(sensor)
+    return group
+
+
+def buildFrames(group: SensorGroup) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # Raw values and the values calibrated with the sensor config
+    rng = np.random.default_rng(0)
+    sensors = list(group.getSensors().values())
+    df_raw = pd.DataFrame(
+        {sensor.getName(): rng.normal(0, 1, 20) for sensor in sensors}
+    )
+    df_calibrated = pd.DataFrame(
+        {
+            sensor.getName(): df_raw[sensor.getName()] * sensor.getSlope()
+            + sensor.getIntercept()
+            for sensor in sensors
+        }
+    )
+    return df_raw, df_calibrated
+
+
+def getPlatformForces(data_manager: DataManager) -> np.ndarray:
+    return (
+        data_manager.platform_raw["platform"]
+        @ data_manager.platform_matrix["platform"].T
+    )
+
+
+# Tests
+
+
+def test_load_session_with_raw(tmp_path) -> None:
+    group = buildPlatformGroup()
+    df_raw, df_calibrated = buildFrames(group)
+    path = str(tmp_path / "Raw.session")
+    writeSession(path, range(1000, 1200, 10), df_calibrated, df_raw)
+    data_manager = DataManager()
+    data_manager.loadSession(openSession(path), [group])
+    assert data_manager.hasRaw()
+    assert data_manager.getRawFrame().equals(df_raw)
+    assert np.allclose(data_manager.getCalibratedFrame(), df_calibrated)
+
+
+def test_load_calibrated_only_session(tmp_path) -> None:
+    group = buildPlatformGroup()
+    df_raw, df_calibrated = buildFrames(group)
+    timestamps = range(1000, 1200, 10)
+    raw_path = str(tmp_path / "Raw.session")
+    writeSession(raw_path, timestamps, df_calibrated, df_raw)
+    calibrated_path = str(tmp_path / "Calibrated.session")
+    writeSession(calibrated_path, timestamps, df_calibrated)
+    data_manager = DataManager()
+    data_manager.loadSession(openSession(raw_path), [group])
+    expected_forces = getPlatformForces(data_manager)
+    data_manager.loadSession(openSession(calibrated_path), [group])
+    # Calibrated values are not calibrated again, nor labelled as raw
+    assert not data_manager.hasRaw()
+    assert data_manager.getRawFrame() is None
+    assert data_manager.getRawDataframe() is None
+    assert np.allclose(data_manager.getCalibratedFrame(), df_calibrated)
+    assert np.allclose(getPlatformForces(data_manager), expected_forces)
+
+
+def test_load_calibrated_only_session_skips_matrix(tmp_path) -> None:
+    group = buildPlatformGroup()
+    group.setCalibrationMatrix(np.full((6, 12), 10.0))
+    _, df_calibrated = buildFrames(group)
+    path = str(tmp_path / "Calibrated.session")
+    writeSession(path, range(1000, 1200, 10), df_calibrated)
+    data_manager = DataManager()
+    data_manager.loadSession(openSession(path), [group])
+    assert np.array_equal(
+        data_manager.platform_matrix["platform"],
+        data_manager.getDefaultPlatformMatrix(np.ones(12)),
+    )
+    assert np.allclose(data_manager.platform_raw["platform"], df_calibrated)
@@ -2,10 +2,8 @@
 
 import pytest
 import os
-import glob
 import pandas as pd
 from src.managers.fileManager import FileManager
-from pytest import MonkeyPatch
 
 
 # General mocks, builders and fixtures
@@ -42,48 +40,47 @@ def dataframe() -> pd.DataFrame:
 # Tests
 
 
-def test_check_file_suffix(monkeypatch: MonkeyPatch, file_manager: FileManager) -> None:
-    glob_patterns = {
-        os.path.join(file_manager.file_path, "Test.*"): [
+def createFiles(folder_path: str, file_names: list[str]) -> None:
+    for file_name in file_names:
+        open(os.path.join(folder_path, file_name), "w").close()
+
+
+def test_check_file_suffix(tmp_path, file_manager: FileManager) -> None:
+    createFiles(
+        tmp_path,
+        [
             "Test.csv",
             "Test_RAW.csv",
-        ],
-        os.path.join(file_manager.file_path, "Test_1.*"): [
             "Test_1.csv",
             "Test_RAW_1.csv",
-        ],
-        os.path.join(file_manager.file_path, "Test_2.*"): [
             "Test_2.csv",
             "Test_RAW_2.csv",
         ],
-        os.path.join(file_manager.file_path, "Test_3.*"): [],
-    }
-
-    def mock_glob(pattern):
-        return glob_patterns.get(pattern, [])
-
-    monkeypatch.setattr(glob, "glob", mock_glob)
+    )
+    file_manager.setFilePath(str(tmp_path))
     file_manager.checkFileName("Test")
     assert file_manager.getFileName() == "Test_3"
 
 
-def test_check_file_suffix_different_forms(
-    monkeypatch: MonkeyPatch, file_manager: FileManager
-) -> None:
-    glob_patterns = {
-        os.path.join(file_manager.file_path, "Test.*"): ["Test.csv", "Test_RAW.csv"],
-        os.path.join(file_manager.file_path, "Test_1.*"): ["Test_RAW_1.csv"],
-        os.path.join(file_manager.file_path, "Test_2.*"): ["Test_2.pk1"],
-        os.path.join(file_manager.file_path, "Test_3.*"): ["Test_3.txt"],
-        os.path.join(file_manager.file_path, "Test_4.*"): [],
-    }
+def test_check_file_suffix_different_forms(tmp_path, file_manager: FileManager) -> None:
+    createFiles(
+        tmp_path,
+        ["Test.csv", "Test_RAW.csv", "Test_RAW_1.csv", "Test_2.pk1", "Test_3.txt"],
+    )
+    file_manager.setFilePath(str(tmp_path))
+    file_manager.checkFileName("Test")
+    assert file_manager.getFileName() == "Test_4"
 
-    def mock_glob(pattern):
-        return glob_patterns.get(pattern, [])
 
-    monkeypatch.setattr(glob, "glob", mock_glob)
+def test_check_file_suffix_of_saved_files(
+    tmp_path, file_manager: FileManager, dataframe: pd.DataFrame
+) -> None:
+    file_manager.setFilePath(str(tmp_path))
     file_manager.checkFileName("Test")
-    assert file_manager.getFileName() == "Test_4"
+    file_manager.saveDataToCSV(df=dataframe)
+    file_manager.saveDataToCSV(df=dataframe, name_suffix="_RAW")
+    file_manager.checkFileName("Test")
+    assert file_manager.getFileName() == "Test_1"
 
 
 def test_file_name_setter(file_manager: FileManager) -> None:
@@ -174,3 +171,30 @@ def test_file_save_failure_binary_dataframe(
     )
     file_exists = os.path.exists(total_path)
     assert not file_exists
+
+
+def test_file_save_archive_dataframe(
+    tmp_path, file_manager: FileManager, dataframe: pd.DataFrame
+) -> None:
+    file_manager.setFilePath(str(tmp_path))
+    df_raw = dataframe.drop(columns="timestamp")
+    file_manager.saveDataToArchive(dataframe["timestamp"].astype(int), df_raw)
+    total_path = os.path.join(
+        file_manager.getFilePath(), file_manager.getFileName() + "_RAW.fpz"
+    )
+    archive = file_manager.loadArchive(total_path)
+    assert archive.read()["LoadCell_1"].tolist() == df_raw["LoadCell_1"].tolist()
+    assert file_manager.saved_files == [os.path.basename(total_path)]
+
+
+def test_file_save_failure_archive_level(
+    tmp_path, file_manager: FileManager, dataframe: pd.DataFrame
+) -> None:
+    file_manager.setFilePath(str(tmp_path))
+    file_manager.cfg_mngr.getConfigValue = lambda config_path, default_value: (
+        10 if config_path.endswith("level") else default_value
+    )
+    df_raw = dataframe.drop(columns="timestamp")
+    file_manager.saveDataToArchive(dataframe["timestamp"].astype(int), df_raw)
+    assert os.listdir(tmp_path) == []
+    assert file_manager.saved_files == []
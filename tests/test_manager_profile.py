@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from src.managers.profileManager import ProfileManager
+
+
+# General mocks, builders and fixtures
+
+
+@pytest.fixture
+def profile_manager() -> ProfileManager:
+    profile_manager = ProfileManager()
+    profile_manager.enable()
+    return profile_manager
+
+
+# Tests
+
+
+def test_disabled_profile_no_spans() -> None:
+    profile_manager = ProfileManager()
+    with profile_manager.span("stage"):
+        pass
+    assert profile_manager.getReport() == []
+
+
+def test_profile_span_report(profile_manager: ProfileManager) -> None:
+    with profile_manager.span("stage"):
+        pass
+    with profile_manager.span("stage"):
+        pass
+    report = profile_manager.getReport()
+    assert len(report) == 1
+    assert report[0]["stage"] == "stage"
+    assert report[0]["calls"] == 2
+
+
+def test_profile_track_decorator(profile_manager: ProfileManager) -> None:
+    @profile_manager.track("tracked")
+    def tracked_fn(value: int) -> int:
+        return value * 2
+
+    assert tracked_fn(2) == 4
+    assert profile_manager.getReport()[0]["stage"] == "tracked"
+
+
+def test_profile_disable(profile_manager: ProfileManager) -> None:
+    profile_manager.disable()
+    with profile_manager.span("stage"):
+        pass
+    assert not profile_manager.isEnabled()
+    assert profile_manager.getReport() == []
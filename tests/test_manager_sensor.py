@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+from src.managers.sensorManager import SensorManager
+from src.handlers import drivers
+from src.enums.configPaths import ConfigPaths as CfgPaths
+from src.enums.sensorParams import SParams, SGParams
+import copy
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+class DriverMock:
+    def __init__(self, serial: int, channel: int) -> None:
+        self.serial = serial
+        self.channel = channel
+        self.disconnections = 0
+
+    def connect(self, check: bool = False) -> bool:
+        return True
+
+    def disconnect(self) -> None:
+        self.disconnections += 1
+
+    def getValue(self) -> float:
+        return 1
+
+
+class ConfigManagerMock:
+    def __init__(self, values: dict) -> None:
+        self.values = values
+        self.version = 0
+
+    def setConfigValue(self, config_path: str, value) -> None:
+        keys = config_path.split(".")
+        config = self.values
+        for key in keys[:-1]:
+            config = config.setdefault(key, {})
+        config[keys[-1]] = value
+        self.version += 1
+
+    def getConfigValue(self, config_path: str, default_value=None):
+        return self.values.get(config_path, default_value)
+
+    def getVersion(self) -> int:
+        return self.version
+
+
+def buildSensorContent(name: str, serial: int, channel: int, slope: float = 1) -> dict:
+    return {
+        SParams.NAME.value: name,
+        SParams.TYPE.value: "SENSOR_LOADCELL",
+        SParams.READ.value: True,
+        SParams.CONNECTION_SECTION.value: {
+            SParams.SERIAL.value: serial,
+            SParams.CHANNEL.value: channel,
+        },
+        SParams.CALIBRATION_SECTION.value: {
+            SParams.SLOPE.value: slope,
+            SParams.INTERCEPT.value: 0,
+        },
+    }
+
+
+def buildGroupContent(name: str, sensor_ids: list[str]) -> dict:
+    return {
+        SGParams.NAME.value: name,
+        SGParams.TYPE.value: "GROUP_DEFAULT",
+        SGParams.READ.value: True,
+        SGParams.SENSOR_LIST.value: sensor_ids,
+    }
+
+
+def getGroupSensors(sensor_manager: SensorManager) -> dict:
+    sensors = {}
+    for group in sensor_manager.getGroups():
+        sensors.update(group.getSensors())
+    return sensors
+
+
+@pytest.fixture
+def config(tmp_path) -> dict:
+    return {
+        CfgPaths.SENSORS_SECTION.value: {
+            f"ls_{index}": buildSensorContent(f"LoadCell_{index}", 100, index)
+            for index in range(1, 5)
+        },
+        CfgPaths.SENSOR_GROUPS_SECTION.value: {
+            "group_1": buildGroupContent("Group 1", ["ls_1", "ls_2"]),
+            "group_2": buildGroupContent("Group 2", ["ls_3"]),
+        },
+        CfgPaths.CALIBRATION_LOADCELL_SENSOR.value: "ls_4",
+        CfgPaths.CALIBRATION_HISTORY_PATH.value: str(tmp_path / "history.db"),
+    }
+
+
+@pytest.fixture
+def sensor_manager(monkeypatch, config: dict) -> SensorManager:
+    monkeypatch.setattr(drivers, "PhidgetLoadCell", DriverMock)
+    sensor_manager = SensorManager()
+    sensor_manager.setup(ConfigManagerMock(copy.deepcopy(config)))
+    # Warm connections, so released drivers count a disconnection
+    [sensor.checkConnection() for sensor in getGroupSensors(sensor_manager).values()]
+    sensor_manager.getSensorCalibRef().checkConnection()
+    return sensor_manager
+
+
+# Tests
+
+
+def test_reload_keeps_unchanged_sensors(
+    sensor_manager: SensorManager, config: dict
+) -> None:
+    sensors = getGroupSensors(sensor_manager)
+    groups = sensor_manager.getGroups()
+    calib_ref = sensor_manager.getSensorCalibRef()
+    sensor_manager.reload(ConfigManagerMock(copy.deepcopy(config)))
+    assert sensor_manager.getGroups() == groups
+    assert sensor_manager.getSensorCalibRef() is calib_ref
+    for sensor_id, sensor in getGroupSensors(sensor_manager).items():
+        assert sensor is sensors[sensor_id]
+        assert sensor.driver.disconnections == 0
+
+
+def test_reload_changed_sensors(sensor_manager: SensorManager, config: dict) -> None:
+    sensors = getGroupSensors(sensor_manager)
+    config[CfgPaths.SENSORS_SECTION.value]["ls_1"] = buildSensorContent(
+        "LoadCell_1", 100, 1, slope=2
+    )
+    config[CfgPaths.SENSORS_SECTION.value]["ls_3"] = buildSensorContent(
+        "LoadCell_3", 200, 3
+    )
+    sensor_manager.reload(ConfigManagerMock(copy.deepcopy(config)))
+    new_sensors = getGroupSensors(sensor_manager)
+    # Other params are updated in the same sensor and driver
+    assert new_sensors["ls_1"] is sensors["ls_1"]
+    assert new_sensors["ls_1"].getSlope() == 2
+    assert new_sensors["ls_2"] is sensors["ls_2"]
+    # Other connections need a new driver, the old one is released
+    assert new_sensors["ls_3"] is not sensors["ls_3"]
+    assert new_sensors["ls_3"].driver.serial == 200
+    assert sensors["ls_3"].driver.disconnections == 1
+
+
+def test_reload_added_and_removed(sensor_manager: SensorManager, config: dict) -> None:
+    sensors = getGroupSensors(sensor_manager)
+    group_1 = sensor_manager.getGroup("group_1")
+    config[CfgPaths.SENSORS_SECTION.value]["ls_5"] = buildSensorContent(
+        "LoadCell_5", 100, 5
+    )
+    del config[CfgPaths.SENSORS_SECTION.value]["ls_3"]
+    groups = config[CfgPaths.SENSOR_GROUPS_SECTION.value]
+    del groups["group_2"]
+    groups["group_3"] = buildGroupContent("Group 3", ["ls_5"])
+    sensor_manager.reload(ConfigManagerMock(copy.deepcopy(config)))
+    assert [group.getID() for group in sensor_manager.getGroups()] == [
+        "group_1",
+        "group_3",
+    ]
+    assert sensor_manager.getGroup("group_1") is group_1
+    assert sorted(getGroupSensors(sensor_manager)) == ["ls_1", "ls_2", "ls_5"]
+    assert sensors["ls_3"].driver.disconnections == 1
+
+
+def test_reload_changed_group(sensor_manager: SensorManager, config: dict) -> None:
+    sensors = getGroupSensors(sensor_manager)
+    group_1 = sensor_manager.getGroup("group_1")
+    groups = config[CfgPaths.SENSOR_GROUPS_SECTION.value]
+    groups["group_1"] = buildGroupContent("Group 1", ["ls_1"])
+    sensor_manager.reload(ConfigManagerMock(copy.deepcopy(config)))
+    # Changed groups are built again with the sensors they keep
+    new_group_1 = sensor_manager.getGroup("group_1")
+    assert new_group_1 is not group_1
+    assert new_group_1.getSensors()["ls_1"] is sensors["ls_1"]
+    assert "ls_2" not in getGroupSensors(sensor_manager)
+    assert sensors["ls_1"].driver.disconnections == 0
+    assert sensors["ls_2"].driver.disconnections == 1
+
+
+def test_reload_calibration_reference(
+    sensor_manager: SensorManager, config: dict
+) -> None:
+    calib_ref = sensor_manager.getSensorCalibRef()
+    config[CfgPaths.SENSORS_SECTION.value]["ls_4"] = buildSensorContent(
+        "LoadCell_4", 300, 4
+    )
+    sensor_manager.reload(ConfigManagerMock(copy.deepcopy(config)))
+    assert sensor_manager.getSensorCalibRef() is not calib_ref
+    assert sensor_manager.getSensorCalibRef().driver.serial == 300
+    assert calib_ref.driver.disconnections == 1
+
+
+def test_config_change_updates_spec(sensor_manager: SensorManager) -> None:
+    sensor = getGroupSensors(sensor_manager)["ls_1"]
+    assert sensor.getSlope() == 1
+    # Changed in the config, not through the sensor manager setters
+    sensor_manager.config_mngr.setConfigValue(
+        f"{CfgPaths.SENSORS_SECTION.value}.ls_1.{SParams.CALIBRATION_SECTION.value}"
+        + f".{SParams.SLOPE.value}",
+        2.5,
+    )
+    assert sensor.getSlope() == 2.5
+
+
+def test_reload_kept_sensor_reads_new_config(
+    sensor_manager: SensorManager, config: dict
+) -> None:
+    sensor = getGroupSensors(sensor_manager)["ls_2"]
+    config_manager = ConfigManagerMock(copy.deepcopy(config))
+    sensor_manager.reload(config_manager)
+    assert getGroupSensors(sensor_manager)["ls_2"] is sensor
+    config_manager.setConfigValue(
+        f"{CfgPaths.SENSORS_SECTION.value}.ls_2.{SParams.CALIBRATION_SECTION.value}"
+        + f".{SParams.INTERCEPT.value}",
+        -0.5,
+    )
+    assert sensor.getIntercept() == -0.5
+
+
+@pytest.mark.parametrize(
+    "new_content, same",
+    [
+        (buildSensorContent("Renamed", 100, 1, slope=3), True),
+        (buildSensorContent("LoadCell_1", 100, 2), False),
+        (
+            {
+                **buildSensorContent("LoadCell_1", 100, 1),
+                SParams.TYPE.value: "SENSOR_ENCODER",
+            },
+            False,
+        ),
+        ({SParams.NAME.value: "LoadCell_1"}, False),
+        (None, False),
+    ],
+)
+def test_is_same_device(new_content: dict, same: bool) -> None:
+    old_content = buildSensorContent("LoadCell_1", 100, 1)
+    assert SensorManager().isSameDevice(old_content, new_content) == same
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from src.managers.testManager import TestManager
+from src.handlers.sensorGroup import SensorGroup
+from src.handlers.sensor import Sensor
+from src.enums.sensorStatus import SStatus, SConnState, SGStatus
+from src.enums.sensorParams import SParams
+from src.enums.sensorTypes import SGTypes
+import threading
+import time
+
+
+# General mocks, builders and fixtures
+
+
+class CountingDriverMock:
+    def __init__(self, serial: int, channel: int) -> None:
+        self.connections = 0
+        self.disconnections = 0
+
+    def connect(self, check: bool = False) -> bool:
+        self.connections += 1
+        return True
+
+    def disconnect(self) -> None:
+        self.disconnections += 1
+
+    def getValue(self) -> float:
+        return 1
+
+
+class SlowDriverMock(CountingDriverMock):
+    # Connects once released, after the connection check gave up
+    def __init__(self, serial: int, channel: int) -> None:
+        super().__init__(serial, channel)
+        self.started = threading.Event()
+        self.released = threading.Event()
+
+    def connect(self, check: bool = False) -> bool:
+        self.started.set()
+        self.released.wait(5)
+        return super().connect(check)
+
+
+class AttachDriverMock(CountingDriverMock):
+    # Event driven driver, unplugged channels can't be opened again
+    def __init__(self, serial: int, channel: int) -> None:
+        super().__init__(serial, channel)
+        self.attached = True
+
+    def connect(self, check: bool = False) -> bool:
+        super().connect(check)
+        return self.attached
+
+    def isAttached(self) -> bool:
+        return self.attached
+
+
+def buildSensor(id: str, driver, keep_warm: bool = True) -> Sensor:
+    sensor = Sensor()
+    sensor.setKeepWarm(keep_warm)
+    sensor.setup(
+        id,
+        {
+            SParams.NAME.value: id,
+            SParams.TYPE.value: "SENSOR_LOADCELL",
+            SParams.READ.value: True,
+            SParams.CONNECTION_SECTION.value: {
+                SParams.SERIAL.value: 0,
+                SParams.CHANNEL.value: 0,
+            },
+        },
+        driver,
+    )
+    return sensor
+
+
+def buildTestManager(sensors: list[Sensor]) -> TestManager:
+    group = SensorGroup("group", "Group", SGTypes.GROUP_DEFAULT)
+    group.setRead(True)
+    [group.addSensor(sensor) for sensor in sensors]
+    test_manager = TestManager()
+    test_manager.setSensorGroups([group])
+    return test_manager
+
+
+def countProbes(sensor: Sensor) -> list:
+    # Probes run through checkConnection, cached results skip it
+    probes = []
+    check_connection = sensor.checkConnection
+
+    def countingCheckConnection() -> bool:
+        probes.append(sensor.getID())
+        return check_connection()
+
+    sensor.checkConnection = countingCheckConnection
+    return probes
+
+
+def waitFor(condition, timeout_s: float = 5) -> bool:
+    deadline = time.monotonic() + timeout_s
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+# Tests
+
+
+def test_connection_check_timeout() -> None:
+    sensor = buildSensor("slow", SlowDriverMock)
+    test_manager = buildTestManager([sensor])
+    assert not test_manager.checkConnection(timeout_s=0.2)
+    assert sensor.getStatus() == SStatus.NOT_FOUND
+    # The late probe connects, but it is undone
+    sensor.driver.released.set()
+    assert waitFor(lambda: sensor.driver.disconnections == 1)
+    assert sensor.driver.connections == 1
+    assert sensor.getStatus() == SStatus.NOT_FOUND
+    assert sensor.getConnectionState() == SConnState.COLD
+    assert test_manager.sensor_groups[0].getStatus() == SGStatus.ERROR
+    assert "slow" not in test_manager.probe_cache
+
+
+def test_connection_check_cancel() -> None:
+    fast_sensor = buildSensor("fast", CountingDriverMock)
+    slow_sensor = buildSensor("slow", SlowDriverMock)
+    test_manager = buildTestManager([fast_sensor, slow_sensor])
+    cancel_event = threading.Event()
+    reports = []
+
+    def progress(name: str, connected: bool, checked: int, total: int) -> None:
+        reports.append((name, connected, checked, total))
+        # Cancelled while the slow probe is running
+        slow_sensor.driver.started.wait(5)
+        cancel_event.set()
+
+    assert test_manager.checkConnection(progress, cancel_event)
+    assert reports == [("fast", True, 1, 2)]
+    assert test_manager.sensor_groups[0].getStatus() == SGStatus.WARNING
+    slow_sensor.driver.released.set()
+    assert waitFor(lambda: slow_sensor.driver.disconnections == 1)
+    assert fast_sensor.getStatus() == SStatus.AVAILABLE
+    assert slow_sensor.getStatus() == SStatus.NOT_FOUND
+
+
+def test_connection_check_cache_ttl() -> None:
+    sensor = buildSensor("sensor", CountingDriverMock)
+    probes = countProbes(sensor)
+    test_manager = buildTestManager([sensor])
+    assert test_manager.checkConnection()
+    assert test_manager.checkConnection()
+    assert len(probes) == 1
+    test_manager.probe_cache_ttl_s = 0
+    time.sleep(0.01)
+    assert test_manager.checkConnection()
+    assert len(probes) == 2
+    # Changed connection params are probed again
+    test_manager.probe_cache_ttl_s = 60
+    sensor.getConnectionParams()[SParams.SERIAL.value] = 1
+    assert test_manager.checkConnection()
+    assert len(probes) == 3
+
+
+def test_connection_check_cache_cold_sensor() -> None:
+    # Released channels are probed again, the cached probe may be outdated
+    sensor = buildSensor("sensor", CountingDriverMock, keep_warm=False)
+    probes = countProbes(sensor)
+    test_manager = buildTestManager([sensor])
+    assert test_manager.checkConnection()
+    assert sensor.getConnectionState() == SConnState.COLD
+    assert test_manager.checkConnection()
+    assert len(probes) == 2
+    assert sensor.driver.connections == 2
+
+
+def test_connection_check_cache_detached_sensor() -> None:
+    sensor = buildSensor("sensor", AttachDriverMock)
+    probes = countProbes(sensor)
+    test_manager = buildTestManager([sensor])
+    assert test_manager.checkConnection()
+    assert test_manager.checkConnection()
+    assert len(probes) == 1
+    # Unplugged warm channel, the cached probe is not used
+    sensor.driver.attached = False
+    assert not test_manager.checkConnection()
+    assert len(probes) == 2
+    assert sensor.getStatus() == SStatus.NOT_FOUND
+    assert "sensor" not in test_manager.probe_cache
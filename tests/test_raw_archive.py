@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+from src.managers.rawArchive import CODECS, RawArchive, openArchive, writeArchive
+import os
+import zlib
+import numpy as np
+import pandas as pd
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+@pytest.fixture
+def csv_path() -> str:
+    return os.path.join(os.path.dirname(__file__), "files", "full_dataset_RAW.csv")
+
+
+@pytest.fixture
+def archive_path(tmp_path) -> str:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "LoadCell": np.cumsum(rng.normal(0, 1e-6, 1000)),
+            "Encoder": np.arange(1000.0),
+        }
+    )
+    df.loc[[10, 500], "LoadCell"] = np.nan
+    df.loc[20, "Encoder"] = np.nan
+    path = str(tmp_path / "Test_RAW.fpz")
+    timestamps = 1000 + 10 * np.arange(1000)
+    writeArchive(path, timestamps, df, {"Encoder": np.int64}, chunk_rows=100)
+    return path
+
+
+# Tests
+
+
+def test_archive_keeps_csv_values(tmp_path, csv_path: str) -> None:
+    df = pd.read_csv(csv_path)
+    timestamps = df.pop("timestamp").astype(np.int64)
+    path = str(tmp_path / "full_dataset_RAW.fpz")
+    writeArchive(path, timestamps, df, chunk_rows=500)
+    archive = RawArchive(path)
+    read = archive.read()
+    assert read["timestamp"].tolist() == timestamps.tolist()
+    assert read.columns.tolist()[1:] == df.columns.tolist()
+    assert np.array_equal(read.iloc[:, 1:].to_numpy(), df.to_numpy())
+    assert os.path.getsize(path) < os.path.getsize(csv_path)
+
+
+def test_archive_time_ranges(archive_path: str) -> None:
+    archive = RawArchive(archive_path)
+    assert archive.getTimeRange() == (1000, 10990)
+    read = archive.read(["Encoder"], start_ms=1250, end_ms=1400)
+    assert read.columns.tolist() == ["timestamp", "Encoder"]
+    assert read["timestamp"].tolist() == list(range(1250, 1401, 10))
+    assert read["Encoder"].tolist() == list(np.arange(25.0, 41.0))
+    assert archive.read(start_ms=20000).empty
+
+
+def test_archive_gaps(archive_path: str) -> None:
+    read = RawArchive(archive_path).read()
+    assert np.isnan(read["LoadCell"][[10, 500]]).all()
+    assert read["LoadCell"].isna().sum() == 2
+    # Integer columns are upcast with NaN gaps
+    assert read["Encoder"].dtype == np.float64
+    assert np.isnan(read["Encoder"][20])
+    assert read["Encoder"][21] == 21
+
+
+def test_archive_errors(tmp_path, archive_path: str) -> None:
+    df = pd.DataFrame({"LoadCell": [1.0]})
+    with pytest.raises(ValueError):
+        writeArchive(str(tmp_path / "a.fpz"), [1], df, codec="unknown")
+    with pytest.raises(KeyError):
+        RawArchive(archive_path).read(["Unknown"])
+    # Unfinished archives, without index, are not opened
+    with open(archive_path, "rb") as file:
+        content = file.read()
+    with open(archive_path, "wb") as file:
+        file.write(content[:100])
+    assert openArchive(archive_path) is None
+
+
+@pytest.mark.parametrize("codec, level", [("zlib", 10), ("lzma", -1), ("bz2", 0)])
+def test_archive_invalid_level(tmp_path, codec: str, level: int) -> None:
+    df = pd.DataFrame({"LoadCell": [1.0]})
+    with pytest.raises(ValueError):
+        writeArchive(str(tmp_path / "a.fpz"), [1], df, codec=codec, level=level)
+    assert os.listdir(tmp_path) == []
+
+
+def test_archive_failed_write(tmp_path, monkeypatch) -> None:
+    # Unfinished temp files are removed
+    def compress(data: bytes, level: int) -> bytes:
+        raise zlib.error("Compression failed")
+
+    monkeypatch.setitem(CODECS, "zlib", (compress,) + CODECS["zlib"][1:])
+    df = pd.DataFrame({"LoadCell": [1.0]})
+    with pytest.raises(zlib.error):
+        writeArchive(str(tmp_path / "a.fpz"), [1], df)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+from src.handlers.runningStats import RunningStats
+import numpy as np
+import math
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+@pytest.fixture
+def values() -> list[float]:
+    rng = np.random.default_rng(0)
+    return (rng.normal(0.5, 1e-4, 5000) + 1e3).tolist()
+
+
+# Tests
+
+
+def test_running_stats_empty() -> None:
+    stats = RunningStats()
+    assert stats.getCount() == 0
+    assert math.isnan(stats.getMean())
+    assert math.isnan(stats.getStd())
+
+
+def test_running_stats_mean_std(values: list[float]) -> None:
+    stats = RunningStats()
+    [stats.add(value) for value in values]
+    assert stats.getCount() == len(values)
+    assert stats.getMean() == pytest.approx(np.mean(values), rel=1e-12)
+    assert stats.getStd() == pytest.approx(np.std(values), rel=1e-6)
+
+
+def test_running_stats_sem(values: list[float]) -> None:
+    stats = RunningStats()
+    [stats.add(value) for value in values]
+    expected = np.std(values, ddof=1) / math.sqrt(len(values))
+    assert stats.getSem() == pytest.approx(expected, rel=1e-6)
+
+
+def test_running_stats_ignores_missing() -> None:
+    stats = RunningStats()
+    [stats.add(value) for value in [1, None, 3, float("nan")]]
+    assert stats.getCount() == 2
+    assert stats.getMean() == 2
+    assert stats.getVariance() == 1
+
+
+def test_running_stats_clear() -> None:
+    stats = RunningStats()
+    stats.add(5)
+    stats.clear()
+    assert stats.getCount() == 0
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+from src.managers.sampleStore import SampleStore, RAW, CALIBRATED, FILTERED
+import numpy as np
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+@pytest.fixture
+def store() -> SampleStore:
+    store = SampleStore()
+    raw_block = np.column_stack([np.arange(100.0), np.linspace(0, 1, 100)])
+    raw_block[10, 0] = np.nan
+    store.setData(["LoadCell", "IMU_qx"], raw_block, [2.0, 1.0], [1.0, 0.0])
+    return store
+
+
+# Tests
+
+
+def test_calibrated_values_are_computed_from_raw(store: SampleStore) -> None:
+    assert store.getCalibrated("LoadCell")[3] == 7.0
+    assert np.isnan(store.getCalibrated("LoadCell")[10])
+    # Columns without calibration are the raw columns
+    assert store.getCalibrated("IMU_qx") is store.getRaw("IMU_qx")
+    assert store.getCacheSize() == 100 * 8
+    with pytest.raises(ValueError):
+        store.getCalibrated("LoadCell")[0] = 0
+
+
+def test_filtered_values_follow_filter(store: SampleStore) -> None:
+    butter = pytest.importorskip("scipy.signal").butter
+    assert store.getFiltered("LoadCell") is store.getCalibrated("LoadCell")
+    store.setFilter(*butter(2, 0.2))
+    filtered = store.getFiltered("LoadCell")
+    assert not np.isnan(filtered).any()
+    assert filtered is store.getFiltered("LoadCell")
+    store.setFilter(*butter(2, 0.4))
+    assert filtered is not store.getFiltered("LoadCell")
+
+
+def test_cache_keeps_budget(store: SampleStore) -> None:
+    butter = pytest.importorskip("scipy.signal").butter
+    store.setCacheBudget(1000 / (1024 * 1024))
+    store.setFilter(*butter(2, 0.2))
+    store.getCalibrated("LoadCell")
+    store.getFiltered("IMU_qx")
+    assert store.getCacheSize() <= 1000
+    assert list(store.cache) == [(FILTERED, "IMU_qx")]
+
+
+def test_frames_of_ranges(store: SampleStore) -> None:
+    raw = store.getFrame(RAW, idx1=20, idx2=30)
+    assert raw.columns.tolist() == ["LoadCell", "IMU_qx"]
+    assert raw["LoadCell"].tolist() == list(np.arange(20.0, 30.0))
+    calibrated = store.getFrame(CALIBRATED, ["LoadCell"], 20, 30)
+    assert calibrated["LoadCell"].tolist() == list(np.arange(41.0, 61.0, 2))
+    with pytest.raises(ValueError):
+        store.setData(["LoadCell"], np.zeros((5, 2)))
@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 
 from src.handlers.sensor import Sensor, Driver
-from src.enums.sensorStatus import SStatus
+from src.enums.sensorStatus import SStatus, SConnState
 from src.enums.sensorParams import SParams
 from src.enums.sensorTypes import STypes
+import math
 import pytest
 
 
@@ -24,6 +25,43 @@ class AvailableDriverMock:
         return 10
 
 
+class CountingDriverMock(AvailableDriverMock):
+    def __init__(self, serial: int, channel: int) -> None:
+        self.connections = 0
+        self.disconnections = 0
+
+    def connect(self, check: bool = False):
+        self.connections += 1
+        return True
+
+    def disconnect(self):
+        self.disconnections += 1
+
+
+class HotPlugDriverMock(AvailableDriverMock):
+    def __init__(self, serial: int, channel: int) -> None:
+        self.attached = True
+
+    def isAttached(self) -> bool:
+        return self.attached
+
+
+class UnpluggableDriverMock(HotPlugDriverMock):
+    def __init__(self, serial: int, channel: int) -> None:
+        super().__init__(serial, channel)
+        self.available = True
+        self.connections = 0
+
+    def connect(self, check: bool = False):
+        if not self.available:
+            return False
+        self.connections += 1
+        return True
+
+    def disconnect(self):
+        pass
+
+
 class UnavailableDriverMock:
     def __init__(self, serial: int, channel: int) -> None:
         pass
@@ -144,7 +182,29 @@ def test_available_sensor_register_values(sensor_av: Sensor) -> None:
     sensor_av.connect()
     sensor_av.registerValue()
     sensor_av.registerValue()
-    assert sensor_av.getValues() == [10, 10]
+    assert sensor_av.getValues().tolist() == [10, 10]
+
+
+def test_available_sensor_register_stats(sensor_av: Sensor) -> None:
+    sensor_av.checkConnection()
+    sensor_av.connect()
+    sensor_av.registerValue()
+    sensor_av.registerValue()
+    sensor_av.registerValue()
+    stats = sensor_av.getStats()
+    assert stats.getReads() == 3
+    # Mock driver always returns the same value
+    assert stats.getStaleReads() == 2
+    assert sum(stats.getLatencyHistogram().values()) == 3
+
+
+def test_clear_registered_stats(sensor_av: Sensor) -> None:
+    sensor_av.checkConnection()
+    sensor_av.connect()
+    sensor_av.registerValue()
+    sensor_av.clearValues()
+    assert sensor_av.getStats().getReads() == 0
+    assert sensor_av.getStats().getSummary()["stale_ratio"] == 0
 
 
 def test_unavailable_sensor_register_values(sensor_unav: Sensor) -> None:
@@ -152,7 +212,7 @@ def test_unavailable_sensor_register_values(sensor_unav: Sensor) -> None:
     sensor_unav.connect()
     sensor_unav.registerValue()
     sensor_unav.registerValue()
-    assert sensor_unav.getValues() == []
+    assert len(sensor_unav.getValues()) == 0
 
 
 def test_clear_registered_values(sensor_av: Sensor) -> None:
@@ -161,7 +221,7 @@ def test_clear_registered_values(sensor_av: Sensor) -> None:
     sensor_av.registerValue()
     sensor_av.registerValue()
     sensor_av.clearValues()
-    assert sensor_av.getValues() == []
+    assert len(sensor_av.getValues()) == 0
 
 
 def test_sensor_modify_read_status(sensor_av: Sensor) -> None:
@@ -177,3 +237,104 @@ def test_sensor_modify_slope_param(sensor_av: Sensor) -> None:
 def test_sensor_modify_intercept_param(sensor_av: Sensor) -> None:
     sensor_av.setIntercept(intercept=-2.5)
     assert sensor_av.getIntercept() == -2.5
+
+
+def test_sensor_cold_connection_cycle() -> None:
+    sensor = Sensor()
+    setupSensor(sensor, "test_id", True, CountingDriverMock)
+    sensor.checkConnection()
+    sensor.connect()
+    sensor.disconnect()
+    assert sensor.getConnectionState() == SConnState.COLD
+    assert sensor.driver.connections == 2
+    assert sensor.driver.disconnections == 2
+
+
+def test_sensor_warm_connection_cycle() -> None:
+    sensor = Sensor()
+    setupSensor(sensor, "test_id", True, CountingDriverMock)
+    sensor.setKeepWarm(True)
+    sensor.checkConnection()
+    for _ in range(3):
+        sensor.connect()
+        sensor.registerValue()
+        sensor.disconnect()
+    assert sensor.isWarm()
+    assert sensor.getStatus() == SStatus.AVAILABLE
+    assert sensor.driver.connections == 1
+    assert sensor.driver.disconnections == 0
+
+
+def test_sensor_warm_release() -> None:
+    sensor = Sensor()
+    setupSensor(sensor, "test_id", True, CountingDriverMock)
+    sensor.setKeepWarm(True)
+    sensor.checkConnection()
+    sensor.release()
+    assert sensor.getConnectionState() == SConnState.COLD
+    assert sensor.driver.disconnections == 1
+
+
+def test_sensor_warm_check_unplugged() -> None:
+    sensor = Sensor()
+    setupSensor(sensor, "test_id", True, UnpluggableDriverMock)
+    sensor.setKeepWarm(True)
+    assert sensor.checkConnection()
+    assert sensor.isWarm()
+    # Unplugged between tests, the driver can not open it again
+    sensor.driver.attached = False
+    sensor.driver.available = False
+    assert not sensor.connect(check=True)
+    assert sensor.getStatus() == SStatus.NOT_FOUND
+    assert sensor.getConnectionState() == SConnState.COLD
+    sensor.driver.attached = True
+    sensor.driver.available = True
+    assert sensor.connect(check=True)
+    assert sensor.driver.connections == 2
+
+
+def test_sensor_detached_gap() -> None:
+    sensor = Sensor()
+    setupSensor(sensor, "test_id", True, HotPlugDriverMock)
+    sensor.setKeepWarm(True)
+    sensor.checkConnection()
+    sensor.connect()
+    sensor.registerValue()
+    sensor.driver.attached = False
+    sensor.registerValue()
+    sensor.registerValue()
+    assert sensor.getLiveStatus() == SStatus.DETACHED
+    sensor.driver.attached = True
+    sensor.registerValue()
+    values = sensor.getValues()
+    assert len(values) == 4
+    assert values[0] == 10 and values[3] == 10
+    assert math.isnan(values[1]) and math.isnan(values[2])
+    assert len(sensor.getGaps()) == 1
+    assert sensor.getGaps()[0][1] is not None
+    assert sensor.getLiveStatus() == SStatus.AVAILABLE
+
+
+def test_sensor_status_epoch(sensor_av: Sensor) -> None:
+    epoch = Sensor.status_epoch
+    sensor_av.connect(check=True)
+    assert Sensor.status_epoch > epoch
+    epoch = Sensor.status_epoch
+    sensor_av.connect()
+    assert Sensor.status_epoch == epoch
+
+
+def test_sensor_spec_cached_type(sensor_av: Sensor) -> None:
+    assert sensor_av.getType() is STypes.SENSOR_LOADCELL
+    assert sensor_av.getProperties() == " - Y8888888 - 150 kg - "
+
+
+def test_sensor_running_stats_without_values(sensor_av: Sensor) -> None:
+    sensor_av.setTrackStats(True)
+    sensor_av.setRetainValues(False)
+    sensor_av.connect(check=True)
+    for _ in range(3):
+        sensor_av.registerValue()
+    assert len(sensor_av.getValues()) == 0
+    assert sensor_av.getRunningStats().getCount() == 3
+    assert sensor_av.getRunningStats().getMean() == 10
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from src.handlers.sensorGroup import SensorGroup
+from src.handlers.sensor import Sensor
 from src.enums.sensorStatus import SStatus, SGStatus
 from src.enums.sensorTypes import SGTypes, STypes
 import pytest
@@ -45,6 +46,12 @@ class SensorMock:
     def getType(self) -> STypes:
         return STypes.SENSOR_LOADCELL
 
+    def getRead(self) -> bool:
+        return self.readable
+
+    def isWarm(self) -> bool:
+        return False
+
     def clearValues(self) -> None:
         self.values.clear()
 
@@ -175,6 +182,13 @@ def test_group_connections_status_none_available(
     assert sensor_group_filled_unav.getStatus() == SGStatus.ERROR
 
 
+def test_group_update_status(sensor_group_filled: SensorGroup) -> None:
+    assert sensor_group_filled.updateStatus([True, False]) == True
+    assert sensor_group_filled.getStatus() == SGStatus.WARNING
+    assert sensor_group_filled.updateStatus([False, False]) == False
+    assert sensor_group_filled.getStatus() == SGStatus.ERROR
+
+
 def test_group_status_start_unchecked(sensor_group_filled: SensorGroup) -> None:
     sensor_group_filled.start()
     assert sensor_group_filled.isActive() == False
@@ -240,3 +254,20 @@ def test_group_clear_values(sensor_group_filled: SensorGroup) -> None:
 def test_group_modify_read_status(sensor_group_filled: SensorGroup) -> None:
     sensor_group_filled.setRead(False)
     assert sensor_group_filled.getRead() == False
+
+
+def test_group_filtered_sensors_cached(sensor_group_filled: SensorGroup) -> None:
+    sensor_group_filled.checkConnections()
+    available = sensor_group_filled.getSensors(only_available=True)
+    assert sensor_group_filled.getSensors(only_available=True) is available
+
+
+def test_group_filtered_sensors_invalidated(sensor_group_filled: SensorGroup) -> None:
+    sensor_group_filled.checkConnections()
+    assert len(sensor_group_filled.getSensors(only_available=True)) == 2
+    # Real sensors bump the status epoch when their status changes
+    sensor_group_filled.getSensors()["sensor_3"].status = SStatus.AVAILABLE
+    Sensor.status_epoch += 1
+    assert len(sensor_group_filled.getSensors(only_available=True)) == 3
+    sensor_group_filled.addSensor(SensorMock(id="sensor_5"))
+    assert len(sensor_group_filled.getSensors(only_available=True)) == 4
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+from src.managers.sessionIndex import SessionIndex, buildSessionRecord
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+def buildRecord(name: str, start_ms: float, channels: list[str]) -> dict:
+    timestamps = start_ms + np.arange(0, 10_000, 10)
+    df = pd.DataFrame({channel: np.ones(len(timestamps)) for channel in channels})
+    return buildSessionRecord(name, timestamps, df, [name + ".csv"])
+
+
+@pytest.fixture
+def session_index(tmp_path) -> SessionIndex:
+    index = SessionIndex(str(tmp_path))
+    index.addSession(buildRecord("Jump", 1.7e12, ["P1_Z_1", "P2_Z_1"]))
+    index.addSession(buildRecord("Walk", 1.8e12, ["P1_Z_1", "IMU_qx"]))
+    return index
+
+
+# Tests
+
+
+def test_session_record_summary() -> None:
+    record = buildRecord("Jump", 1.7e12, ["P1_Z_1"])
+    assert record["duration_s"] == pytest.approx(9.99)
+    assert record["sample_rate_hz"] == pytest.approx(100)
+    assert record["channels"] == ["P1_Z_1"]
+    assert record["stats"]["P1_Z_1"]["mean"] == 1
+    assert record["stats"]["P1_Z_1"]["missing"] == 0
+
+
+def test_session_index_queries(session_index: SessionIndex) -> None:
+    names = lambda sessions: [session["name"] for session in sessions]
+    assert names(session_index.getSessions()) == ["Jump", "Walk"]
+    assert names(session_index.getSessions(channel="IMU_qx")) == ["Walk"]
+    assert names(session_index.getSessions(name="jum")) == ["Jump"]
+    since = datetime.fromtimestamp(1.75e9)
+    assert names(session_index.getSessions(since=since)) == ["Walk"]
+    assert session_index.getSessions(min_duration_s=60) == []
+
+
+def test_session_index_is_persisted(session_index: SessionIndex) -> None:
+    index = SessionIndex(session_index.getFolderPath())
+    assert index.getSession("Walk") == session_index.getSession("Walk")
+    assert index.isSessionNameUsed("Jump")
+    assert index.getFreeSuffixNum("Jump") == 1
+    assert index.getFreeSuffixNum("Run") == 0
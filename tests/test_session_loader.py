@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+from src.managers.sessionLoader import (
+    BinarySession,
+    CSVSession,
+    Session,
+    openSession,
+    writeSession,
+)
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+@pytest.fixture
+def csv_path() -> str:
+    return os.path.join(os.path.dirname(__file__), "files", "full_dataset.csv")
+
+
+@pytest.fixture
+def session_path(tmp_path) -> str:
+    df = pd.DataFrame({"P1_X_1": [1.0, 2.0, np.nan], "P1_X_2": [4.0, 5.0, 6.0]})
+    path = str(tmp_path / "Test.session")
+    config = {"sensors": {"p1_x1": {"name": "P1_X_1"}}}
+    writeSession(path, [1000, 1010, 1020], df, df / 10, config)
+    return path
+
+
+# Tests
+
+
+def test_csv_session_reads_requested_columns(csv_path: str) -> None:
+    session = openSession(csv_path)
+    assert isinstance(session, CSVSession)
+    assert session.hasRaw()
+    assert "timestamp" not in session.getColumns()
+    column = session.getColumns()[0]
+    calibrated, raw = session.load([column])
+    assert calibrated.columns.tolist() == [column]
+    assert calibrated[column].dtype == np.float64
+    expected = pd.read_csv(csv_path)
+    assert np.allclose(calibrated[column], expected[column], equal_nan=True)
+    assert session.getTimestamps().tolist() == expected["timestamp"].tolist()
+    # Only the requested columns are read
+    assert list(session.calibrated) == [column]
+    assert list(session.raw) == [column]
+
+
+def test_csv_session_opens_from_raw_file(csv_path: str) -> None:
+    session = openSession(csv_path.replace(".csv", "_RAW.csv"))
+    assert session.getPath() == csv_path
+
+
+def test_binary_session_is_memory_mapped(session_path: str) -> None:
+    session = openSession(session_path)
+    assert isinstance(session, BinarySession)
+    assert session.getColumns() == ["P1_X_1", "P1_X_2"]
+    assert session.getSize() == 3
+    assert isinstance(session.getColumn("P1_X_2", raw=True), np.memmap)
+    assert np.allclose(session.getColumn("P1_X_2", raw=True), [0.4, 0.5, 0.6])
+    calibrated, _ = session.load()
+    assert np.isnan(calibrated["P1_X_1"].iloc[2])
+    assert session.getConfig()["sensors"]["p1_x1"]["name"] == "P1_X_1"
+    with pytest.raises(KeyError):
+        session.getColumn("Unknown")
+
+
+def test_binary_session_keeps_storage_dtypes(tmp_path) -> None:
+    df_raw = pd.DataFrame(
+        {
+            "P1_X_1": np.array([0.5, np.nan, 0.25], dtype=np.float32),
+            "Encoder": [10.0, np.nan, 12.0],
+        }
+    )
+    path = str(tmp_path / "Compact.session")
+    dtypes = {"P1_X_1": np.float32, "Encoder": np.int64}
+    writeSession(path, [1000, 1010, 1020], df_raw * 2, df_raw, dtypes=dtypes)
+    raw_file = np.load(os.path.join(path, "raw", "1.npy"))
+    assert raw_file.dtype == np.int64
+    session = openSession(path)
+    raw = session.getColumnsData(raw=True)
+    assert raw["P1_X_1"].dtype == np.float32
+    assert isinstance(raw["P1_X_1"], np.memmap)
+    # Integer gaps are NaN again
+    assert raw["Encoder"].dtype == np.float64
+    assert np.array_equal(raw["Encoder"], [10.0, np.nan, 12.0], equal_nan=True)
+    assert session.getColumn("P1_X_1").dtype == np.float32
+    assert session.getColumn("Encoder").dtype == np.float64
+
+
+def test_binary_session_without_raw(tmp_path) -> None:
+    df = pd.DataFrame({"P1_X_1": [1.0, 2.0, 3.0]})
+    path = str(tmp_path / "Calibrated.session")
+    writeSession(path, [1000, 1010, 1020], df)
+    session = openSession(path)
+    assert not session.hasRaw()
+    calibrated, raw = session.load()
+    assert calibrated.equals(df)
+    # Calibrated values are not returned as raw ones
+    assert raw is None
+    with pytest.raises(KeyError):
+        session.getColumn("P1_X_1", raw=True)
+
+
+def test_session_needs_readers() -> None:
+    with pytest.raises(TypeError):
+        Session("path", [])
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+from src.handlers.valueBuffer import (
+    ValueBuffer,
+    MISSING_INT,
+    buildValueBuffer,
+    asFloatValues,
+    asStorageValues,
+)
+from src.enums.sensorTypes import STypes
+import numpy as np
+
+
+# Tests
+
+
+def test_buffer_grows_in_storage_dtype() -> None:
+    buffer = buildValueBuffer(STypes.SENSOR_LOADCELL)
+    for value in range(3000):
+        buffer.append(value)
+    buffer.appendMissing()
+    values = buffer.getValues()
+    assert len(buffer) == 3001
+    assert values.dtype == np.float32
+    assert values[2999] == 2999 and np.isnan(values[3000])
+    assert values.nbytes == 3001 * 4
+
+
+def test_imu_buffer_keeps_rows() -> None:
+    buffer = buildValueBuffer(STypes.SENSOR_IMU)
+    buffer.append(list(range(10)))
+    # Drivers without observations return empty lists
+    buffer.append([])
+    values = buffer.getValues()
+    assert values.shape == (2, 10)
+    assert values[0].tolist() == list(range(10))
+    assert np.isnan(values[1]).all()
+
+
+def test_encoder_buffer_gaps() -> None:
+    buffer = buildValueBuffer(STypes.SENSOR_ENCODER)
+    buffer.append(5)
+    buffer.appendMissing()
+    buffer.append(float("nan"))
+    assert buffer.getValues().tolist() == [5, MISSING_INT, MISSING_INT]
+    floats = asFloatValues(buffer.getValues())
+    assert floats[0] == 5 and np.isnan(floats[1:]).all()
+    assert asStorageValues(floats, np.int64).tolist() == buffer.getValues().tolist()
+
+
+def test_cleared_buffer_keeps_given_values() -> None:
+    buffer = ValueBuffer(np.float64)
+    buffer.append(1.0)
+    values = buffer.getValues()
+    buffer.clear()
+    buffer.append(2.0)
+    assert values.tolist() == [1.0]
+    assert buffer.getValues().tolist() == [2.0]
+    assert buildValueBuffer(STypes.SENSOR_ENCODER, False).getDType() == np.float64